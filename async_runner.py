@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Coroutine functions run on one event loop thread shared by every call; the futures it returns are
+# ordinary concurrent.futures futures, so the executor treats them like thread pool results
+
+
+class AsyncLoop:
+    """An asyncio loop on a daemon thread, started on first use."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Per-function limits; only touched on the loop thread
+        self._semaphores: Dict[Tuple[Hashable, int], asyncio.Semaphore] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    self._thread = threading.Thread(target=loop.run_forever, name="AsyncLoop", daemon=True)
+                    self._thread.start()
+                    self._loop = loop
+        return self._loop
+
+    def submit(self, factory: Callable[[], Awaitable], key: Hashable = None, limit: Optional[int] = None) -> Future:
+        """Runs factory() on the loop; at most `limit` calls with the same key run at once.
+
+        Cancelling the returned future cancels the task, also while it waits for its turn.
+        """
+        return asyncio.run_coroutine_threadsafe(self._run(factory, key, limit), self.loop)
+
+    def run(self, awaitable: Awaitable):
+        """Waits for an awaitable from a thread other than the loop's."""
+        return asyncio.run_coroutine_threadsafe(_await(awaitable), self.loop).result()
+
+    async def _run(self, factory: Callable[[], Awaitable], key: Hashable, limit: Optional[int]):
+        if not limit:
+            return await factory()
+        semaphore = self._semaphores.get((key, limit))
+        if semaphore is None:
+            semaphore = self._semaphores[(key, limit)] = asyncio.Semaphore(limit)
+        async with semaphore:
+            # Created only once admitted, so a call cancelled while waiting leaves no coroutine behind
+            return await factory()
+
+    def shutdown(self):
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=1)
+
+
+async def _await(awaitable: Awaitable):
+    return await awaitable
+
+
+_async_loop = AsyncLoop()
+
+
+def get_async_loop() -> AsyncLoop:
+    return _async_loop
@@ -0,0 +1,164 @@
+import importlib
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from async_runner import get_async_loop
+from converters import add_function_folder, encode_result
+from entities import DynamicFunction
+from resources import call_with_resources, setup_module
+from settings_store import get_settings_store
+from streaming import is_stream, iter_stream
+from utils import ParameterError, convert_parameters, print
+
+# Batch runs work without PyQt6; the tab action only wraps run_batch in a thread
+
+
+class BatchProgress:
+    __slots__ = ("done", "failed", "elapsed")
+
+    def __init__(self, done: int = 0, failed: int = 0, elapsed: float = 0.0):
+        self.done = done
+        self.failed = failed
+        self.elapsed = elapsed
+
+    @property
+    def rate(self) -> float:
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return f"{self.done} done, {self.failed} failed, {self.rate:.0f} lines/s"
+
+
+Chunk = List[Tuple[int, str]]
+
+
+def _run_lines(func: Callable, sig: inspect.Signature, chunk: Chunk) -> Tuple[List[str], int]:
+    """Runs one chunk of (line number, line); returns the encoded output lines and how many failed."""
+    output = []
+    failed = 0
+    for line_number, line in chunk:
+        try:
+            values = json.loads(line)
+            if not isinstance(values, dict):
+                raise ParameterError("Expected a JSON object of parameter values")
+            result = call_with_resources(func, convert_parameters(sig, values, log=False))
+            if inspect.isawaitable(result):
+                # Coroutine functions of every batch worker share one event loop
+                result = get_async_loop().run(result)
+            if is_stream(result):
+                # A generator function's items become the line's result
+                result = list(iter_stream(result))
+            record = {"line": line_number, "result": result}
+            encoded = encode_result(record, indent=None)
+        except Exception as e:
+            failed += 1
+            encoded = encode_result({"line": line_number, "error": f"{type(e).__name__}: {e}"}, indent=None)
+        output.append(encoded)
+    return output, failed
+
+
+# Worker processes look each function up once
+_process_functions: Dict[Tuple[str, str], Tuple[Callable, inspect.Signature]] = {}
+
+
+def _init_process(folder_path: str):
+    if folder_path not in sys.path:
+        sys.path.append(folder_path)
+    # Results are encoded here, in the worker process
+    add_function_folder(folder_path)
+
+
+def _run_lines_by_name(module_name: str, function_name: str, chunk: Chunk) -> Tuple[List[str], int]:
+    key = (module_name, function_name)
+    if key not in _process_functions:
+        module = importlib.import_module(module_name)
+        # Resources the module registers exist in this process only after its own setup()
+        setup_module(module)
+        func = getattr(module, function_name)
+        _process_functions[key] = (func, inspect.signature(func))
+    func, sig = _process_functions[key]
+    return _run_lines(func, sig, chunk)
+
+
+def _chunks(lines: Iterator[str], chunk_size: int) -> Iterator[Chunk]:
+    # Line numbers are 1-based and count blank lines, so they point into the input file
+    numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(dynamic_function: DynamicFunction, input_path: str, output_path: str,
+              workers: Optional[int] = None, chunk_size: Optional[int] = None, mode: Optional[str] = None,
+              progress: Optional[Callable[[BatchProgress], None]] = None,
+              cancel: Optional[threading.Event] = None) -> BatchProgress:
+    """Runs dynamic_function once per line of a JSON Lines file of parameter values.
+
+    Output lines are {"line": n, "result": ...} or {"line": n, "error": "..."} in completion order.
+    At most two chunks per worker are in flight, so memory does not grow with the input size.
+    """
+    store = get_settings_store()
+    workers = workers or store.get("batch_workers", os.cpu_count() or 1)
+    chunk_size = chunk_size or store.get("batch_chunk_size", 64)
+    mode = mode or dynamic_function.settings.executor or store.get("execution_mode", "thread")
+
+    func = dynamic_function.func
+    sig = dynamic_function.signature
+    if mode == "process":
+        folder_path = os.path.dirname(os.path.abspath(inspect.getfile(func)))
+        executor: Executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                                 initializer=_init_process, initargs=(folder_path,))
+        submit = lambda chunk: executor.submit(_run_lines_by_name, dynamic_function.module_name,
+                                               dynamic_function.name, chunk)
+    else:
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Batch")
+        submit = lambda chunk: executor.submit(_run_lines, func, sig, chunk)
+
+    state = BatchProgress()
+    start = time.perf_counter()
+    print(f"Batch {dynamic_function.name}: {input_path} -> {output_path} ({workers} {mode} workers, "
+          f"chunks of {chunk_size})", severity="INFO")
+
+    pending = set()
+
+    def collect(futures, out):
+        for future in futures:
+            output, failed = future.result()
+            out.write("\n".join(output))
+            out.write("\n")
+            state.done += len(output)
+            state.failed += failed
+        state.elapsed = time.perf_counter() - start
+        if progress is not None:
+            progress(state)
+
+    try:
+        with open(input_path, "r", encoding="utf-8") as source, open(output_path, "w", encoding="utf-8") as out:
+            for chunk in _chunks(source, chunk_size):
+                if cancel is not None and cancel.is_set():
+                    break
+                pending.add(submit(chunk))
+                if len(pending) >= workers * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished, out)
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(finished, out)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    state.elapsed = time.perf_counter() - start
+    cancelled = " (cancelled)" if cancel is not None and cancel.is_set() else ""
+    print(f"Batch {dynamic_function.name} finished{cancelled}: {state} in {state.elapsed:.1f} s", severity="INFO")
+    return state
+
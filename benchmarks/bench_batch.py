@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Peak memory of a separate process per input size shows whether it grows with the input
+CHILD = '''
+import resource, sys
+sys.path.insert(0, {root!r})
+from utils import configure_console, get_all_functions
+from batch import run_batch
+configure_console(enabled=False)
+function = [f for f in get_all_functions({examples!r}) if f.name == "siparis_isle"][0]
+state = run_batch(function, {input!r}, {output!r}, workers=4, mode="thread")
+print(state.done, state.rate, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def write_input(path: str, count: int):
+    with open(os.path.join(ROOT, "input.txt"), encoding="utf-8") as f:
+        order = json.load(f)
+    with open(path, "w", encoding="utf-8") as f:
+        for index in range(count):
+            order["siparis_no"] = index
+            f.write(json.dumps({"siparis": order, "odendi": True}, ensure_ascii=False) + "\n")
+
+
+def main():
+    folder = tempfile.mkdtemp()
+    for count in (10000, 100000):
+        input_path = os.path.join(folder, "orders.jsonl")
+        output_path = os.path.join(folder, "results.jsonl")
+        write_input(input_path, count)
+        source = CHILD.format(root=ROOT, examples=os.path.join(ROOT, "examples"), input=input_path, output=output_path)
+        result = subprocess.run([sys.executable, "-c", source], cwd=ROOT, capture_output=True, text=True, check=True)
+        done, rate, max_rss = result.stdout.split()
+        size_mb = os.path.getsize(input_path) / 1024 / 1024
+        print(f"{int(done):>7} lines ({size_mb:.0f} MB): {float(rate):.0f} lines/s, peak RSS {int(max_rss) / 1024:.0f} MB")
+        os.remove(input_path)
+        os.remove(output_path)
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import timeit
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_backend import caller_location
+
+# Log calls usually come from deep inside Qt slot handlers
+STACK_DEPTH = 30
+CALLS = 20000
+
+
+def extract_stack_location():
+    # Previous utils.print implementation
+    stack = traceback.extract_stack()
+    filename, lineno, _, _ = stack[-2]
+    return os.path.relpath(filename), lineno
+
+
+def nested(depth, func):
+    if depth == 0:
+        return timeit.timeit(func, number=CALLS)
+    return nested(depth - 1, func)
+
+
+if __name__ == "__main__":
+    old = nested(STACK_DEPTH, extract_stack_location)
+    new = nested(STACK_DEPTH, caller_location)
+
+    print(f"Stack depth: ~{STACK_DEPTH} frames, {CALLS} calls")
+    print(f"traceback.extract_stack + relpath: {old * 1e6 / CALLS:8.2f} us/call")
+    print(f"caller_location:                   {new * 1e6 / CALLS:8.2f} us/call")
+    print(f"Speedup: {old / new:.1f}x")
@@ -0,0 +1,85 @@
+import copy
+import gc
+import inspect
+import json
+import os
+import sys
+import time
+from typing import get_args, get_origin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "examples"))
+
+from siparis_isle import Siparis
+from utils import convert_to_class_instance
+
+SIZES = (10_000, 100_000)
+EMPLOYEES_PER_COMPANY = 3
+
+
+def reference_convert(cls, data):
+    # convert_to_class_instance before converters were compiled per class
+    if not hasattr(cls, '__annotations__'):
+        return data
+
+    kwargs = {}
+    for field, field_type in cls.__annotations__.items():
+        origin_type = get_origin(field_type)
+        if origin_type == list:
+            default_value = []
+        elif origin_type == dict:
+            default_value = {}
+        elif origin_type == tuple:
+            default_value = tuple()
+        elif origin_type == set:
+            default_value = set()
+        else:
+            default_value = None
+
+        field_value = data.get(field, default_value)
+        if inspect.isclass(field_type) and isinstance(field_value, dict):
+            kwargs[field] = reference_convert(field_type, field_value)
+        elif origin_type == list:
+            item_type = get_args(field_type)[0]
+            if inspect.isclass(item_type) and isinstance(field_value, list):
+                kwargs[field] = [reference_convert(item_type, item) for item in field_value]
+            else:
+                kwargs[field] = field_value
+        else:
+            kwargs[field] = field_value
+    return cls(**kwargs)
+
+
+def make_payload(products):
+    with open(os.path.join(ROOT, "input.txt"), encoding="utf-8") as file:
+        order = json.load(file)
+
+    template = order["urunler"][0]
+    template["uretici"]["calisanlar"] *= EMPLOYEES_PER_COMPANY
+    order["urunler"] = []
+    for index in range(products):
+        product = copy.deepcopy(template)
+        product["urun_adi"] = f"{template['urun_adi']} {index}"
+        order["urunler"].append(product)
+    return order
+
+
+def measure(convert, payload):
+    gc.collect()
+    start = time.perf_counter()
+    result = convert(Siparis, payload)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    for products in SIZES:
+        payload = make_payload(products)
+        old, old_result = measure(reference_convert, payload)
+        new, new_result = measure(convert_to_class_instance, payload)
+        assert old_result.to_dict() == new_result.to_dict()
+
+        print(f"{products} products x {EMPLOYEES_PER_COMPANY} employees")
+        print(f"  per-call inspection: {old:7.3f} s")
+        print(f"  compiled converter:  {new:7.3f} s")
+        print(f"  speedup:             {old / new:7.2f}x")
@@ -0,0 +1,109 @@
+import contextlib
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import FunctionDiscovery
+
+MODULES = 500
+# Imports are mostly waiting, so use more threads than cores
+WORKERS = max(8, os.cpu_count() or 1)
+
+# Each module stands in for one with slow top-level imports (driver DLLs, network shares...)
+MODULE_TEMPLATE = '''import time
+from typing import List, Optional
+
+time.sleep({import_delay})
+
+
+class Record{index}:
+    name: str
+    values: List[int]
+    parent: Optional[str]
+
+    def __init__(self, name: str, values: List[int], parent: Optional[str] = None):
+        self.name = name
+        self.values = values
+        self.parent = parent
+
+
+def {prefix}_process_{index}(record: Record{index}, scale: float = 1.0, label: str = "x") -> dict:
+    return {{"name": record.name, "total": sum(record.values) * scale, "label": label}}
+
+
+def {prefix}_summary_{index}(count: int, verbose: bool = False) -> str:
+    return str(count)
+'''
+
+
+def make_folder(prefix, import_delay):
+    folder = tempfile.mkdtemp(prefix=f"bench_{prefix}_")
+    for index in range(MODULES):
+        with open(os.path.join(folder, f"{prefix}_module_{index}.py"), "w") as file:
+            file.write(MODULE_TEMPLATE.format(prefix=prefix, index=index, import_delay=import_delay))
+    return folder
+
+
+def measure(prefix, workers, import_delay):
+    folder = make_folder(prefix, import_delay)
+    try:
+        discovery = FunctionDiscovery(folder, workers=workers)
+        # Keep the per-function log lines out of the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            functions = discovery.discover()
+            elapsed = time.perf_counter() - start
+        return elapsed, len(functions)
+    finally:
+        sys.path.remove(folder)
+        shutil.rmtree(folder)
+
+
+# A fresh interpreter discovering the folder the way the GUI does at start, with the default settings
+COLD_START_SCRIPT = '''
+import sys
+from utils import get_all_functions
+get_all_functions(sys.argv[1]{arguments})
+'''
+
+
+def measure_cold_start(prefix, import_delay, arguments="", runs=3):
+    folder = make_folder(prefix, import_delay)
+    try:
+        command = [sys.executable, "-c", COLD_START_SCRIPT.format(arguments=arguments), folder]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # The first run writes the bytecode and, with lazy import, the manifest; later starts reuse them
+        subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    for import_delay in (0, 0.005):
+        default = measure_cold_start(f"cold{int(import_delay * 1000)}", import_delay)
+        eager = measure_cold_start(f"eager{int(import_delay * 1000)}", import_delay, ", lazy=False")
+        print(f"Cold start, {MODULES} modules, {import_delay * 1000:.0f} ms import delay each")
+        print(f"  default (lazy_import): {default:7.2f} s")
+        print(f"  lazy_import false:     {eager:7.2f} s")
+
+    for import_delay in (0, 0.005):
+        serial, serial_count = measure(f"serial{int(import_delay * 1000)}", 0, import_delay)
+        parallel, parallel_count = measure(f"parallel{int(import_delay * 1000)}", WORKERS, import_delay)
+        assert serial_count == parallel_count
+
+        print(f"{MODULES} modules, {import_delay * 1000:.0f} ms import delay each, {serial_count} functions")
+        print(f"  serial:              {serial:7.2f} s")
+        print(f"  parallel ({WORKERS:2d} workers): {parallel:7.2f} s")
+        print(f"  speedup:             {serial / parallel:7.2f}x")
@@ -0,0 +1,59 @@
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_backend import LogRecord
+from log_store import LogStore
+
+# Three days of a million records, then the queries the log viewer's filter panel makes
+
+COUNT = 1_000_000
+BATCH = 500
+
+
+def run(full_text_index: bool):
+    print(f"full text index: {full_text_index}")
+    path = os.path.join(tempfile.mkdtemp(), "logs.sqlite3")
+    store = LogStore(lambda: path, retention_days=None, full_text_index=full_text_index)
+    random.seed(1)
+    severities = ["DEBUG"] * 30 + ["INFO"] * 60 + ["WARNING"] * 8 + ["ERROR"] * 2
+    sources = [f"examples/module_{index}.py" for index in range(40)]
+    start_time = datetime.datetime.now() - datetime.timedelta(days=3)
+    step = datetime.timedelta(days=3) / COUNT
+
+    start = time.perf_counter()
+    for offset in range(0, COUNT, BATCH):
+        store.write_batch([LogRecord(start_time + step * (offset + index), random.choice(severities),
+                                     random.choice(sources), index, f"message {offset + index}")
+                           for index in range(BATCH)])
+    elapsed = time.perf_counter() - start
+    print(f"  write: {COUNT / elapsed:,.0f} records/s, {os.path.getsize(path) / 1024 / 1024:.0f} MB")
+
+    now = datetime.datetime.now()
+    queries = {
+        "newest 5000": {},
+        "errors": {"severities": ["ERROR", "CRITICAL"]},
+        "one hour yesterday": {"since": now - datetime.timedelta(hours=25), "until": now - datetime.timedelta(hours=24)},
+        "source, last day": {"source": sources[7], "since": now - datetime.timedelta(days=1)},
+        "warnings of a source": {"severities": ["WARNING"], "source": sources[3]},
+        "text, last hour": {"text": "message 99", "since": now - datetime.timedelta(hours=1)},
+        "text, everything": {"text": "message 123456"},
+    }
+    for name, filters in queries.items():
+        start = time.perf_counter()
+        records = store.query(**filters)
+        print(f"  {name}: {len(records)} records in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+def main():
+    run(False)
+    run(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_backend import LogRecord, LogTail
+from log_view import LogLines
+
+# Indexing a million-line hourly log the way the log viewer follows it, then reading a screen of rows
+
+COUNT = 1_000_000
+
+
+def write_log(path: str):
+    now = datetime.datetime.now()
+    with open(path, "w", encoding="utf-8") as f:
+        for index in range(COUNT):
+            severity = "ERROR" if index % 50 == 0 else "INFO"
+            f.write(LogRecord(now, severity, "examples/module.py", index, f"message {index}").format() + "\n")
+
+
+def index_file(folder: str) -> LogLines:
+    tail = LogTail(lambda: folder, initial_bytes=None, max_bytes=4 * 1024 * 1024)
+    lines = LogLines()
+    while True:
+        _, start, new_lines = tail.poll_bytes()
+        lines.append_file_lines(tail.path, start, new_lines)
+        if not tail.behind:
+            return lines
+
+
+def main():
+    folder = tempfile.mkdtemp()
+    tail = LogTail(lambda: folder)
+    tail.poll_bytes()
+    write_log(tail.path)
+    print(f"log file: {os.path.getsize(tail.path) / 1024 / 1024:.0f} MB")
+
+    start = time.perf_counter()
+    lines = index_file(folder)
+    print(f"index: {len(lines)} lines in {time.perf_counter() - start:.2f} s")
+
+    tracemalloc.start()
+    lines = index_file(folder)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"memory: {current / 1024 / 1024:.0f} MB held, {peak / 1024 / 1024:.0f} MB peak")
+
+    start = time.perf_counter()
+    for row in range(COUNT // 2, COUNT // 2 + 50):
+        lines.text(row)
+    print(f"one screen (50 rows): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
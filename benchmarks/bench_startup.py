@@ -0,0 +1,48 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+CLI_COMMAND = [sys.executable, "cli.py", "--quiet", "run", "siparis_isle",
+               "-a", "siparis=@input.txt", "-a", "odendi=true"]
+
+# The GUI path up to the point where a function can be run: QApplication plus a MainWindow with its tabs
+GUI_SCRIPT = '''
+import sys
+from PyQt6.QtWidgets import QApplication
+from ui import MainWindow
+app = QApplication(sys.argv)
+window = MainWindow()
+'''
+
+
+def measure(command, env=None) -> float:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    cli = measure(CLI_COMMAND)
+    print(f"CLI, process start to printed result: {cli * 1000:.0f} ms (median of {RUNS})")
+
+    try:
+        import PyQt6  # noqa: F401
+    except ImportError:
+        print("PyQt6 is not installed, GUI path skipped")
+        return
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    gui = measure([sys.executable, "-c", GUI_SCRIPT], env)
+    print(f"GUI, process start to a ready MainWindow: {gui * 1000:.0f} ms (median of {RUNS}, {gui / cli:.1f}x the CLI)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "examples"))
+
+from json_stream import iter_file, load_file
+from siparis_isle import Siparis
+from utils import configure_console, convert_to_class_instance
+
+PRODUCTS = 50000
+ORDERS = 2000
+
+
+def measure(label: str, work):
+    # Timed without tracemalloc, which slows allocation-heavy code unevenly
+    gc.collect()
+    start = time.perf_counter()
+    work()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    work()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {elapsed:6.2f} s, peak {peak / 1024 / 1024:6.1f} MB")
+
+
+def main():
+    configure_console(enabled=False)
+    with open(os.path.join(ROOT, "input.txt"), encoding="utf-8") as f:
+        order = json.load(f)
+
+    folder = tempfile.mkdtemp()
+    big_order_path = os.path.join(folder, "big_order.json")
+    orders_path = os.path.join(folder, "orders.json")
+    # One order with many products, like a large export shaped as input.txt
+    with open(big_order_path, "w", encoding="utf-8") as f:
+        json.dump({**order, "urunler": order["urunler"] * PRODUCTS}, f, ensure_ascii=False)
+    with open(orders_path, "w", encoding="utf-8") as f:
+        json.dump([order] * ORDERS, f, ensure_ascii=False)
+    print(f"Order with {PRODUCTS} products: {os.path.getsize(big_order_path) / 1024 / 1024:.0f} MB")
+
+    def loads_then_convert():
+        with open(big_order_path, encoding="utf-8") as f:
+            return convert_to_class_instance(Siparis, json.loads(f.read()))
+
+    measure("json.loads + convert_to_class_instance", loads_then_convert)
+    measure("json_stream.load_file", lambda: load_file(big_order_path, Siparis))
+
+    def consume_eagerly():
+        with open(orders_path, encoding="utf-8") as f:
+            return sum(convert_to_class_instance(Siparis, item).siparis_no for item in json.loads(f.read()))
+
+    print(f"{ORDERS} orders as Iterable[Siparis]: {os.path.getsize(orders_path) / 1024 / 1024:.0f} MB")
+    measure("json.loads, then convert each", consume_eagerly)
+    measure("json_stream.iter_file", lambda: sum(item.siparis_no for item in iter_file(orders_path, Siparis)))
+
+    for path in (big_order_path, orders_path):
+        os.remove(path)
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    main()
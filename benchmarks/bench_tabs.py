@@ -0,0 +1,61 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from entities import DynamicFunction, DynamicSettings
+
+FUNCTION_COUNTS = (300, 3000)
+
+
+def make_function(index: int, extra_parameter: bool = False) -> DynamicFunction:
+    # Distinct code objects with the same shape as a typical function module
+    namespace = {}
+    parameters = "count: int, label: str, verbose: bool = False" + (", scale: float = 1.0" if extra_parameter else "")
+    exec(f"def function_{index}({parameters}):\n    return count", namespace)
+    func = namespace[f"function_{index}"]
+    func.__module__ = f"module_{index}"
+    return DynamicFunction(func, DynamicSettings(name=f"Function {index}"))
+
+
+def main():
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        print("PyQt6 is not installed, skipped")
+        return
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv)
+    from ui import DynamicFunctionUI
+
+    for count in FUNCTION_COUNTS:
+        functions = [make_function(index) for index in range(count)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function_ui = DynamicFunctionUI(functions)
+            build = time.perf_counter() - start
+
+            # Open a few forms, then reload with one changed signature; the rest keep their DynamicFunction objects
+            for dynamic_function in functions[:5]:
+                function_ui.open_form(dynamic_function)
+            reloaded = list(functions)
+            reloaded[0] = make_function(0, extra_parameter=True)
+            start = time.perf_counter()
+            function_ui.update_functions(reloaded)
+            update = time.perf_counter() - start
+
+            start = time.perf_counter()
+            function_ui.model.set_query("fn 12")
+            search = time.perf_counter() - start
+            function_ui.executor.shutdown()
+
+        print(f"{count} functions: listed in {build * 1000:.0f} ms, reload with 1 changed in {update * 1000:.1f} ms, "
+              f"fuzzy search in {search * 1000:.1f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worker_pool import WorkerPool
+
+CALLS = 50
+PROCESSES = max(2, os.cpu_count() or 1)
+
+# A module with slow top-level imports and a CPU-bound function
+MODULE_SOURCE = '''import time
+
+time.sleep(0.2)
+
+
+def crunch(n: int) -> int:
+    return sum(i * i for i in range(n))
+'''
+
+
+def call_cold(folder_path, n):
+    # What a fresh process per call pays: interpreter start, module import, then the call
+    sys.path.append(folder_path)
+    import heavy_module
+    return heavy_module.crunch(n)
+
+
+def main():
+    folder_path = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(folder_path, "heavy_module.py"), "w") as f:
+            f.write(MODULE_SOURCE)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(CALLS):
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    pool.submit(call_cold, folder_path, 20000).result()
+            cold = time.perf_counter() - start
+
+            pool = WorkerPool(folder_path, ["heavy_module"], PROCESSES)
+            # Wait until the workers finished their imports, as they would have after a reload
+            for future in [pool.submit("heavy_module", "crunch", {"n": 1}).future for _ in range(PROCESSES)]:
+                future.result()
+            start = time.perf_counter()
+            futures = [pool.submit("heavy_module", "crunch", {"n": 20000}).future for _ in range(CALLS)]
+            for future in futures:
+                future.result()
+            warm = time.perf_counter() - start
+            pool.shutdown()
+    finally:
+        shutil.rmtree(folder_path, ignore_errors=True)
+
+    print(f"{CALLS} calls, process per call: {cold * 1000 / CALLS:.2f} ms/call")
+    print(f"{CALLS} calls, {PROCESSES} warm workers: {warm * 1000 / CALLS:.2f} ms/call ({cold / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable
+
+from utils import print
+
+
+class CallThreads:
+    """Runs calls on daemon threads, at most max_threads at a time; the rest wait in order.
+
+    A thread cannot be stopped, so a call given up on (cancelled or timed out while running) is
+    abandoned: its slot goes to the next call right away and the thread is counted in `abandoned`
+    until the call returns on its own.
+    """
+
+    def __init__(self, max_threads: int, name: str = "FunctionRun"):
+        self.max_threads = max_threads
+        self.name = name
+        self.abandoned = 0
+        self._pending = deque()
+        # Futures whose thread holds a slot
+        self._active = set()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args) -> Future:
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new calls after shutdown")
+            self._pending.append((future, func, args))
+        self._start_pending()
+        return future
+
+    def abandon(self, future: Future):
+        """Frees the slot of a running call; a queued or finished one is left alone."""
+        with self._lock:
+            if future not in self._active:
+                return
+            self._active.discard(future)
+            self.abandoned += 1
+            abandoned = self.abandoned
+        print(f"Abandoned a running call; {abandoned} abandoned thread(s) still running.", severity="WARNING")
+        self._start_pending()
+
+    def shutdown(self):
+        # Running calls cannot be stopped; queued ones are dropped
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, deque()
+        for future, _, _ in pending:
+            future.cancel()
+
+    def _start_pending(self):
+        starting = []
+        with self._lock:
+            while self._pending and len(self._active) < self.max_threads:
+                future, func, args = self._pending.popleft()
+                # False when the call was cancelled while it waited
+                if future.set_running_or_notify_cancel():
+                    self._active.add(future)
+                    starting.append((future, func, args))
+        for future, func, args in starting:
+            threading.Thread(target=self._run, args=(future, func, args), name=self.name, daemon=True).start()
+
+    def _run(self, future: Future, func: Callable, args: tuple):
+        try:
+            result, error = func(*args), None
+        except BaseException as e:
+            result, error = None, e
+        # Counted before the outcome is visible, so whoever waits on the future sees the slot free
+        with self._lock:
+            if future in self._active:
+                self._active.discard(future)
+                abandoned = None
+            else:
+                self.abandoned -= 1
+                abandoned = self.abandoned
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        if abandoned is not None:
+            print(f"An abandoned call returned; {abandoned} abandoned thread(s) still running.", severity="DEBUG")
+        self._start_pending()
@@ -0,0 +1,249 @@
+import argparse
+import inspect
+import json
+import sys
+import time
+import traceback
+from typing import Callable, List, Optional
+
+from async_runner import get_async_loop
+from batch import BatchProgress, run_batch
+from converters import encode_result, encode_to
+from entities import DynamicFunction
+from json_stream import is_lazy_annotation
+from resources import call_with_resources, is_resource_annotation
+from result_cache import cache_for
+from settings_store import get_settings_store
+from streaming import is_stream, iter_stream
+from utils import (ParameterError, configure_console, convert_parameters, flush_logs, get_all_functions,
+                   is_complex_annotation, print)
+
+# Headless entry point; nothing here may import PyQt6
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+# What --quiet still echoes
+QUIET_SEVERITIES = {"WARNING", "ERROR", "CRITICAL"}
+
+# Seconds between stdout flushes while a generator function's items are written
+STREAM_FLUSH_INTERVAL = 0.05
+
+
+def find_function(functions: List[DynamicFunction], name: str) -> Optional[DynamicFunction]:
+    # Either the Python name or the tab name from the module settings
+    for dynamic_function in functions:
+        if dynamic_function.name == name:
+            return dynamic_function
+    for dynamic_function in functions:
+        if dynamic_function.settings.name == name:
+            return dynamic_function
+    return None
+
+
+def read_text(path: str) -> str:
+    if path == "-":
+        return sys.stdin.read()
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def collect_values(args_path: Optional[str], assignments: List[str], sig: Optional[inspect.Signature] = None) -> dict:
+    """Raw parameter values: a JSON object from --args, then name=value / name=@file overrides.
+
+    JSON parameters keep their @file reference, so convert_parameters streams the file into the class.
+    """
+    values = {}
+    if args_path:
+        loaded = json.loads(read_text(args_path))
+        if not isinstance(loaded, dict):
+            raise ParameterError("--args must contain a JSON object of parameter values")
+        values.update(loaded)
+
+    for assignment in assignments:
+        name, separator, value = assignment.partition("=")
+        if not separator:
+            raise ParameterError(f"Expected name=value, got '{assignment}'")
+        if value.startswith("@") and value != "@-" and _streams_from_file(sig, name):
+            values[name] = value
+        else:
+            # Same text the tab's input field would hold
+            values[name] = read_text(value[1:]) if value.startswith("@") else value
+    return values
+
+
+def _streams_from_file(sig: Optional[inspect.Signature], name: str) -> bool:
+    parameter = sig.parameters.get(name) if sig is not None else None
+    return parameter is not None and (is_complex_annotation(parameter.annotation)
+                                      or is_lazy_annotation(parameter.annotation))
+
+
+def load_functions(functions_path: Optional[str]) -> List[DynamicFunction]:
+    # Lazy discovery imports only the module of the function that is run
+    return get_all_functions(functions_path or get_settings_store().functions_path, lazy=True)
+
+
+def load_function(dynamic_function: DynamicFunction) -> Optional[Callable]:
+    # Lazy discovery imports the module here; a syntax error, a missing dependency or a failing setup() ends up here
+    try:
+        return dynamic_function.func
+    except Exception as e:
+        print(f"Could not load {dynamic_function.name}: {e}", severity="ERROR")
+        return None
+
+
+def describe_parameter(parameter) -> str:
+    if parameter.annotation is parameter.empty:
+        return parameter.name
+    annotation = getattr(parameter.annotation, "__name__", str(parameter.annotation))
+    return f"{parameter.name}: {annotation}"
+
+
+def command_list(options) -> int:
+    for dynamic_function in load_functions(options.functions):
+        settings = dynamic_function.settings
+        # Resource parameters are filled from their pools, not from arguments
+        parameters = ", ".join(describe_parameter(parameter) for parameter in dynamic_function.signature.parameters.values()
+                               if not is_resource_annotation(parameter.annotation))
+        state = "" if settings.enabled else " (disabled)"
+        sys.stdout.write(f"{dynamic_function.name}({parameters}){state}\n")
+        if settings.description:
+            sys.stdout.write(f"    {settings.description}\n")
+    return EXIT_OK
+
+
+def command_run(options) -> int:
+    dynamic_function = find_function(load_functions(options.functions), options.name)
+    if dynamic_function is None:
+        print(f"Function {options.name} not found.", severity="ERROR")
+        return EXIT_USAGE
+
+    func = load_function(dynamic_function)
+    if func is None:
+        return EXIT_FAILED
+
+    try:
+        params = convert_parameters(dynamic_function.signature, collect_values(options.args, options.assign, dynamic_function.signature))
+    except (ParameterError, json.JSONDecodeError, OSError) as e:
+        print(f"Error: {e}", severity="ERROR")
+        return EXIT_USAGE
+
+    # Generator functions are streamed, never cached
+    cache = cache_for(dynamic_function) if not dynamic_function.streaming else None
+    cache_key = cache.key(params) if cache is not None else None
+    hit, result = cache.get(cache_key) if cache_key is not None else (False, None)
+    if not hit:
+        try:
+            result = call_with_resources(func, params)
+            if inspect.isawaitable(result):
+                result = get_async_loop().run(result)
+        except Exception as e:
+            print("".join(traceback.format_exception(None, e, e.__traceback__)), severity="ERROR")
+            return EXIT_FAILED
+        if cache_key is not None:
+            cache.put(cache_key, result)
+    if cache is not None:
+        print(cache.stats(), severity="DEBUG")
+
+    if is_stream(result):
+        return write_stream(result)
+
+    # Sonuç kopya oluşturmadan doğrudan stdout'a kodlanır
+    try:
+        encode_to(result, sys.stdout, indent=options.indent)
+    except TypeError as e:
+        print(f"Result is not JSON serializable: {e}", severity="ERROR")
+        return EXIT_FAILED
+    sys.stdout.write("\n")
+    return EXIT_OK
+
+
+def write_stream(stream) -> int:
+    """Items of a generator function as JSON Lines, each written as soon as it is produced."""
+    items = iter_stream(stream)
+    flushed_at = time.monotonic()
+    try:
+        for item in items:
+            sys.stdout.write(encode_result(item, indent=None))
+            sys.stdout.write("\n")
+            # A reader of the pipe sees items within a frame, without a flush per item
+            if time.monotonic() - flushed_at >= STREAM_FLUSH_INTERVAL:
+                sys.stdout.flush()
+                flushed_at = time.monotonic()
+        sys.stdout.flush()
+    except Exception as e:
+        print("".join(traceback.format_exception(None, e, e.__traceback__)), severity="ERROR")
+        return EXIT_FAILED
+    finally:
+        items.close()
+    return EXIT_OK
+
+
+def command_batch(options) -> int:
+    dynamic_function = find_function(load_functions(options.functions), options.name)
+    if dynamic_function is None:
+        print(f"Function {options.name} not found.", severity="ERROR")
+        return EXIT_USAGE
+    if load_function(dynamic_function) is None:
+        return EXIT_FAILED
+
+    last_report = [0.0]
+
+    def report(progress: BatchProgress):
+        # At most one progress line per second
+        if progress.elapsed - last_report[0] >= 1.0:
+            last_report[0] = progress.elapsed
+            print(f"Batch progress: {progress}", severity="INFO")
+
+    try:
+        state = run_batch(dynamic_function, options.input, options.output, workers=options.workers,
+                          chunk_size=options.chunk_size, mode=options.mode, progress=report)
+    except Exception as e:
+        print("".join(traceback.format_exception(None, e, e.__traceback__)), severity="ERROR")
+        return EXIT_FAILED
+    return EXIT_FAILED if state.failed else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Run functions without the GUI.")
+    parser.add_argument("--functions", help="Functions folder (default: functions_path from settings.json)")
+    parser.add_argument("--quiet", action="store_true", help="Echo only warnings and errors (the log file still gets everything)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="List the discovered functions")
+    list_parser.set_defaults(handler=command_list)
+
+    run_parser = commands.add_parser("run", help="Run a function and print its result as JSON")
+    run_parser.add_argument("name", help="Function name or its settings name")
+    run_parser.add_argument("--args", help="JSON object of parameter values, or - for stdin")
+    run_parser.add_argument("-a", "--assign", action="append", default=[], metavar="NAME=VALUE",
+                            help="Parameter value as typed in the tab; NAME=@path reads it from a file")
+    run_parser.add_argument("--indent", type=int, default=4, help="JSON indent, negative for compact output")
+    run_parser.set_defaults(handler=command_run)
+
+    batch_parser = commands.add_parser("batch", help="Run a function once per line of a JSON Lines file")
+    batch_parser.add_argument("name", help="Function name or its settings name")
+    batch_parser.add_argument("input", help="JSON Lines file, one object of parameter values per line")
+    batch_parser.add_argument("output", help="JSON Lines file for the results, written as they finish")
+    batch_parser.add_argument("--workers", type=int, help="Worker count (default: batch_workers setting)")
+    batch_parser.add_argument("--chunk-size", type=int, help="Lines per task (default: batch_chunk_size setting)")
+    batch_parser.add_argument("--mode", choices=("thread", "process"), help="Default: the function's executor")
+    batch_parser.set_defaults(handler=command_batch)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = build_parser().parse_args(argv)
+    if getattr(options, "indent", None) is not None and options.indent < 0:
+        options.indent = None
+    # stdout carries the result; log lines go to stderr
+    configure_console(sys.stderr, colors=sys.stderr.isatty(), severities=QUIET_SEVERITIES if options.quiet else None)
+    try:
+        return options.handler(options)
+    finally:
+        flush_logs()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+import dataclasses
+import datetime
+import inspect
+import json
+import os
+import sys
+import threading
+from enum import Enum
+from typing import Callable, Dict, Iterator, Optional, TextIO, Tuple
+
+from schema import FieldSchema, schema_registry
+
+_MISSING = object()
+
+# Classes whose converter the current thread is compiling
+_compiling = threading.local()
+
+_DEFAULT_SOURCES = {list: "[]", dict: "{}", tuple: "()", set: "set()"}
+
+
+def _identity(data):
+    return data
+
+
+def needs_conversion(cls) -> bool:
+    # Same test convert_to_class_instance applies before building an instance
+    return inspect.isclass(cls) and hasattr(cls, '__annotations__')
+
+
+def get_converter(cls) -> Callable[[object], object]:
+    """Returns a function that builds cls from parsed JSON, compiled once per class."""
+    if not hasattr(cls, '__annotations__'):
+        return _identity
+
+    schema = schema_registry.get(cls)
+    converter = schema.converter
+    if converter is not None:
+        return converter
+    # Other threads wait here for the compiled converter
+    with schema_registry.lock:
+        converter = schema.converter
+        if converter is not None:
+            return converter
+        compiling = _compiling.__dict__.setdefault("classes", set())
+        if cls in compiling:
+            # A class referring back to cls while this thread compiles it; only called once that is done
+            return lambda data: schema.converter(data)
+        compiling.add(cls)
+        try:
+            converter = schema.converter = _compile(cls, schema.fields)
+        finally:
+            compiling.discard(cls)
+    return converter
+
+
+def _compile(cls, fields) -> Callable[[dict], object]:
+    # Generates a function specialised for cls; each field becomes straight-line code
+    namespace = {"cls": cls, "_MISSING": _MISSING}
+    lines = ["def convert(data):", "    get = data.get"]
+    arguments = []
+    for index, field in enumerate(fields):
+        value = f"v{index}"
+        default = _DEFAULT_SOURCES.get(field.origin)
+        if default is None:
+            lines.append(f"    {value} = get({field.name!r})")
+        else:
+            # UI’den değer gelmezse varsayılanı kullan
+            lines.append(f"    {value} = get({field.name!r}, _MISSING)")
+            lines.append(f"    if {value} is _MISSING:")
+            lines.append(f"        {value} = {default}")
+
+        template, converter = _field_plan(field)
+        if template is not None:
+            namespace[f"c{index}"] = converter
+            lines.append(f"    {value} = " + template.format(v=value, c=f"c{index}"))
+        arguments.append(f"{field.name}={value}")
+    lines.append(f"    return cls({', '.join(arguments)})")
+
+    exec(compile("\n".join(lines), f"<converter {cls.__module__}.{cls.__qualname__}>", "exec"), namespace)
+    return namespace["convert"]
+
+
+def _field_plan(field: FieldSchema) -> Tuple[Optional[str], object]:
+    """Source template converting {v} with converter {c}; no template when the value is used as is."""
+    # İç içe geçmiş sınıf
+    if inspect.isclass(field.annotation):
+        if not needs_conversion(field.annotation):
+            return None, None
+        return "{c}({v}) if isinstance({v}, dict) else {v}", get_converter(field.annotation)
+
+    # List[T]
+    if field.origin == list and field.args:
+        if not needs_conversion(field.args[0]):
+            return None, None
+        return "[{c}(item) for item in {v}] if isinstance({v}, list) else {v}", get_converter(field.args[0])
+
+    # Tuple[T1, T2, ...]
+    if field.origin == tuple and field.args:
+        if not all(inspect.isclass(item_type) for item_type in field.args):
+            return None, None
+        return "tuple(converter(item) for converter, item in zip({c}, {v})) if isinstance({v}, tuple) else {v}", \
+            [get_converter(item_type) for item_type in field.args]
+
+    # Dict[K, V]
+    if field.origin == dict and len(field.args) == 2:
+        if not needs_conversion(field.args[1]):
+            return None, None
+        return "{{key: {c}(item) for key, item in {v}.items()}} if isinstance({v}, dict) else {v}", \
+            get_converter(field.args[1])
+
+    return None, None
+
+
+# Serialization: one handler per type, looked up once and reused for every instance
+_serializers: Dict[type, Optional[Callable[[object], object]]] = {}
+
+SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# Folders of the user's function modules; only classes defined there are dumped attribute by attribute
+_function_folders = set()
+
+
+def add_function_folder(path: str):
+    folder = os.path.normcase(os.path.abspath(path))
+    if folder not in _function_folders:
+        _function_folders.add(folder)
+        # Classes seen before may have been given str()
+        _serializers.clear()
+
+
+def _is_user_class(cls) -> bool:
+    path = getattr(sys.modules.get(cls.__module__), "__file__", None)
+    if not path:
+        return False
+    folder = os.path.normcase(os.path.dirname(os.path.abspath(path)))
+    return any(folder == root or folder.startswith(root + os.sep) for root in _function_folders)
+
+
+def _slot_names(cls) -> Tuple[str, ...]:
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return tuple(name for name in names if name not in ("__dict__", "__weakref__"))
+
+
+def _serializer_for(cls) -> Optional[Callable[[object], object]]:
+    if cls in _serializers:
+        return _serializers[cls]
+
+    if issubclass(cls, Enum):
+        serializer = _enum_value
+    elif callable(getattr(cls, "to_dict", None)):
+        serializer = _call_to_dict
+    elif dataclasses.is_dataclass(cls):
+        # Shallow; nested values are encoded as the encoder reaches them (asdict would deep-copy)
+        names = tuple(field.name for field in dataclasses.fields(cls))
+        serializer = lambda obj: {name: getattr(obj, name) for name in names}
+    elif issubclass(cls, (datetime.datetime, datetime.date, datetime.time)):
+        serializer = _isoformat
+    elif issubclass(cls, (set, frozenset)):
+        serializer = list
+    elif not _is_user_class(cls):
+        # UUID, Path, Decimal and other library types read best as their text, as before
+        serializer = str
+    else:
+        names = _slot_names(cls)
+        has_dict = any("__dict__" in klass.__dict__ for klass in cls.__mro__)
+        if names:
+            serializer = lambda obj: {**{name: getattr(obj, name) for name in names if hasattr(obj, name)},
+                                      **(vars(obj) if has_dict else {})}
+        elif has_dict:
+            serializer = vars
+        else:
+            serializer = str
+    _serializers[cls] = serializer
+    return serializer
+
+
+def _enum_value(obj):
+    return obj.value
+
+
+def _call_to_dict(obj):
+    return obj.to_dict()
+
+
+def _isoformat(obj):
+    return obj.isoformat()
+
+
+class ResultEncoder(json.JSONEncoder):
+    def default(self, o):
+        serializer = _serializer_for(type(o))
+        if serializer is None:
+            return super().default(o)
+        return serializer(o)
+
+
+class KeyEncoder(ResultEncoder):
+    """ResultEncoder for cache keys: a value that is only known by its str() fails instead.
+
+    The text of an iterator, a generator or an open file is its address, which another value can have later.
+    """
+
+    def default(self, o):
+        serializer = _serializer_for(type(o))
+        if serializer is None or serializer is str:
+            raise TypeError(f"Object of type {type(o).__name__} has no stable encoding")
+        return serializer(o)
+
+
+def iter_encode(obj, indent: Optional[int] = 4) -> Iterator[str]:
+    """Encodes obj as JSON chunk by chunk without building an intermediate copy."""
+    return ResultEncoder(indent=indent, ensure_ascii=False).iterencode(obj)
+
+
+def encode_to(obj, file: TextIO, indent: Optional[int] = 4):
+    for chunk in iter_encode(obj, indent):
+        file.write(chunk)
+
+
+def encode_result(obj, indent: Optional[int] = 4) -> str:
+    return "".join(iter_encode(obj, indent))
+
+
+def is_structured(obj) -> bool:
+    """Whether a result is shown as JSON rather than with str()."""
+    if isinstance(obj, SCALAR_TYPES) or isinstance(obj, (Enum, datetime.date, datetime.time)):
+        return False
+    return isinstance(obj, (dict, list, tuple, set, frozenset)) or _serializer_for(type(obj)) not in (None, str)
+
+
+def to_serializable(obj):
+    """Plain JSON-compatible copy of obj, built in one pass."""
+    if isinstance(obj, SCALAR_TYPES):
+        return obj
+    if isinstance(obj, dict):
+        return {key: to_serializable(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_serializable(item) for item in obj]
+    serializer = _serializer_for(type(obj))
+    if serializer is None:
+        return obj
+    return to_serializable(serializer(obj))
@@ -1,18 +1,33 @@
-from typing import Callable, Optional
+from typing import Callable, Optional, get_type_hints
+import inspect
 import json
 
 
 class DynamicSettings:
-    def __init__(self, name: str, enabled: bool = True, description: Optional[str] = None):
+    def __init__(self, name: str, enabled: bool = True, description: Optional[str] = None,
+                 executor: Optional[str] = None, timeout: Optional[float] = None, cache=None,
+                 concurrency: Optional[int] = None):
         self.name = name
         self.enabled = enabled
         self.description = description
+        # "thread" for I/O-bound functions, "process" for CPU-bound ones, None for the execution_mode setting
+        self.executor = executor
+        # Seconds before a run is abandoned, None for no limit
+        self.timeout = timeout
+        # True or a dict of result_cache.CachePolicy fields for pure functions
+        self.cache = cache
+        # Most calls of a coroutine function running at once, None for no limit
+        self.concurrency = concurrency
 
     def to_dict(self):
         return {
             "name": self.name,
             "enabled": self.enabled,
-            "description": self.description
+            "description": self.description,
+            "executor": self.executor,
+            "timeout": self.timeout,
+            "cache": self.cache,
+            "concurrency": self.concurrency
         }
 
     def __repr__(self):
@@ -20,15 +35,76 @@ class DynamicSettings:
 
 
 class DynamicFunction:
-    def __init__(self, func: Callable, settings: DynamicSettings):
-        self.func = func
+    def __init__(self, func: Optional[Callable], settings: DynamicSettings, module_name: Optional[str] = None,
+                 name: Optional[str] = None, loader: Optional[Callable[[], Callable]] = None,
+                 signature: Optional[inspect.Signature] = None, streaming: Optional[bool] = None,
+                 coroutine: Optional[bool] = None):
+        self._func = func
         self.settings = settings
+        self.module_name = module_name or getattr(func, "__module__", None)
+        self.name = name or func.__name__
+        # Lazily discovered functions are imported by the loader on first use
+        self._loader = loader
+        self._signature: Optional[inspect.Signature] = signature
+        self._type_hints: Optional[dict] = None
+        # From the manifest for lazily discovered functions, otherwise looked up on the function
+        self._streaming = streaming
+        self._coroutine = coroutine
+        # Set when a newer source of the module failed to load; this function is then its last good version
+        self.load_error: Optional[str] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._func is not None
+
+    @property
+    def func(self) -> Callable:
+        if self._func is None:
+            self._func = self._loader()
+            # Replace the manifest signature with the real one
+            self._signature = None
+            self._type_hints = None
+        return self._func
+
+    @property
+    def signature(self) -> inspect.Signature:
+        if self._signature is None:
+            self._signature = inspect.signature(self.func)
+        return self._signature
+
+    @property
+    def type_hints(self) -> dict:
+        if self._type_hints is None:
+            try:
+                self._type_hints = get_type_hints(self.func)
+            except Exception:
+                # Unresolvable forward references; callers fall back to the raw annotations
+                self._type_hints = {}
+        return self._type_hints
+
+    @property
+    def streaming(self) -> bool:
+        """Generator and async generator functions, whose items are shown as they are produced."""
+        if self._streaming is None:
+            self._streaming = inspect.isgeneratorfunction(self.func) or inspect.isasyncgenfunction(self.func)
+        return self._streaming
+
+    @property
+    def coroutine(self) -> bool:
+        """async def functions, run on the shared event loop."""
+        if self._coroutine is None:
+            self._coroutine = inspect.iscoroutinefunction(self.func)
+        return self._coroutine
+
+    def resolve(self):
+        self.signature
+        self.type_hints
 
     def to_dict(self):
         return {
-            "func_name": self.func.__name__,
+            "func_name": self.name,
             "settings": self.settings.to_dict()
         }
 
     def __repr__(self):
-        return json.dumps(self.to_dict(), indent=4, ensure_ascii=False)
\ No newline at end of file
+        return json.dumps(self.to_dict(), indent=4, ensure_ascii=False)
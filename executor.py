@@ -0,0 +1,283 @@
+import os
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import CancelledError, Future
+from functools import partial
+from typing import Callable, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from async_runner import get_async_loop
+from batch import BatchProgress, run_batch
+from call_threads import CallThreads
+from entities import DynamicFunction
+from resources import call_with_resources, call_with_resources_async
+from result_cache import ResultCache, cache_for
+from settings_store import get_settings_store
+from streaming import consume_stream, is_stream
+from utils import print
+from worker_pool import WorkerPool
+
+
+class FunctionRun(QObject):
+    """One submitted call. Signals are emitted from worker threads and delivered on the GUI thread."""
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal(str)
+    # Streaming runs: lines produced since the previous frame, and the number of items so far
+    items = pyqtSignal(list, int)
+
+    def __init__(self, dynamic_function: DynamicFunction):
+        super().__init__()
+        self.dynamic_function = dynamic_function
+        self.future: Optional[Future] = None
+        self.cache: Optional[ResultCache] = None
+        self.cache_key: Optional[str] = None
+        self.cached = False
+        # Stops a call that already started, when its executor can
+        self.abort: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+        self._done = False
+        # Lines of a streaming run not shown yet; the oldest are dropped if the GUI falls behind
+        self.stream_lines: Optional[deque] = None
+        self.stream_count = 0
+        self._stream_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._frame_timer: Optional[QTimer] = None
+
+    @property
+    def is_running(self) -> bool:
+        return not self._done
+
+    def cancel(self, reason: str = "Cancelled"):
+        if not self._claim():
+            return
+        if self.future is not None:
+            # A queued run is dropped; a running thread is abandoned, a running worker process is killed
+            self.future.cancel()
+        if self.abort is not None:
+            self.abort()
+        print(f"Run of {self.dynamic_function.name} stopped: {reason}", severity="WARNING")
+        self.cancelled.emit(reason)
+
+    def start_stream(self, max_lines: int, fps: float):
+        # Called on the GUI thread; frames are flushed by a timer of the run itself
+        self.stream_lines = deque(maxlen=max_lines)
+        self.abort = self._stop.set
+        self._frame_timer = QTimer(self)
+        self._frame_timer.timeout.connect(self._flush_frame)
+        self._frame_timer.start(max(1, int(1000 / fps)))
+
+    def call(self, func: Callable, params: dict, output_path: Optional[str] = None):
+        """Runs on a pool thread; a generator's items are consumed here, one frame buffer at a time."""
+        result = call_with_resources(func, params)
+        if not is_stream(result):
+            return result
+        return consume_stream(result, self._push_line, output_path, self._stop)
+
+    def _push_line(self, line: str):
+        with self._stream_lock:
+            self.stream_lines.append(line)
+            self.stream_count += 1
+
+    def _take_lines(self):
+        with self._stream_lock:
+            lines = list(self.stream_lines)
+            self.stream_lines.clear()
+            return lines, self.stream_count
+
+    def _flush_frame(self):
+        lines, count = self._take_lines()
+        if lines:
+            self.items.emit(lines, count)
+        if self._done:
+            self._frame_timer.stop()
+
+    def _claim(self) -> bool:
+        # Whichever of completion, cancellation and timeout comes first reports the outcome
+        with self._lock:
+            if self._done:
+                return False
+            self._done = True
+            return True
+
+    def _on_done(self, future: Future):
+        try:
+            result = future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if self._claim():
+                print("".join(traceback.format_exception(None, e, e.__traceback__)), severity="ERROR")
+                self.failed.emit(str(e))
+            return
+        if self.cache_key is not None and not self.cached:
+            self.cache.put(self.cache_key, result)
+        if self._claim():
+            if self.stream_lines is not None:
+                # The last partial frame, queued before the result
+                lines, count = self._take_lines()
+                if lines:
+                    self.items.emit(lines, count)
+            self.finished.emit(result)
+
+
+class BatchRun(QObject):
+    """A run_batch call on a background thread; progress arrives at most every PROGRESS_INTERVAL seconds."""
+
+    PROGRESS_INTERVAL = 0.2
+
+    progress = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, dynamic_function: DynamicFunction, input_path: str, output_path: str):
+        super().__init__()
+        self.dynamic_function = dynamic_function
+        self.input_path = input_path
+        self.output_path = output_path
+        self._cancel = threading.Event()
+        self._last_report = 0.0
+
+    def start(self):
+        threading.Thread(target=self._run, name="BatchRun", daemon=True).start()
+
+    def cancel(self, reason: str = "Cancelled"):
+        # Lines already handed to workers still finish and are written
+        self._cancel.set()
+
+    def _run(self):
+        try:
+            state = run_batch(self.dynamic_function, self.input_path, self.output_path,
+                              progress=self._report, cancel=self._cancel)
+        except Exception as e:
+            print("".join(traceback.format_exception(None, e, e.__traceback__)), severity="ERROR")
+            self.failed.emit(str(e))
+            return
+        self.finished.emit(state)
+
+    def _report(self, state: BatchProgress):
+        if state.elapsed - self._last_report >= self.PROGRESS_INTERVAL:
+            self._last_report = state.elapsed
+            self.progress.emit(BatchProgress(state.done, state.failed, state.elapsed))
+
+
+class FunctionExecutor:
+    """Runs functions off the GUI thread, in a thread pool or in warm worker processes."""
+
+    def __init__(self, max_threads: Optional[int] = None, max_processes: Optional[int] = None):
+        self.store = get_settings_store()
+        self.max_threads = max_threads or self.store.get("executor_threads", 8)
+        self.max_processes = max_processes or self.store.get("executor_processes", os.cpu_count() or 1)
+        # A timed-out thread keeps running; it stops counting against max_threads
+        self._threads = CallThreads(self.max_threads)
+        self._worker_pools: Dict[str, WorkerPool] = {}
+        self._module_names: List[str] = []
+        # The functions each module had when the workers were last prepared
+        self._functions_by_module: Dict[str, List[DynamicFunction]] = {}
+
+    def mode(self, dynamic_function: DynamicFunction) -> str:
+        mode = dynamic_function.settings.executor or self.store.get("execution_mode", "thread")
+        if mode == "process" and dynamic_function.load_error is not None:
+            # Workers import the module's source as it is on disk; only this process has the last good version
+            return "thread"
+        return mode
+
+    def submit(self, dynamic_function: DynamicFunction, params: dict, stream_path: Optional[str] = None) -> FunctionRun:
+        """stream_path: JSON Lines file that also receives the items of a streaming function."""
+        run = FunctionRun(dynamic_function)
+        settings = dynamic_function.settings
+        mode = self.mode(dynamic_function)
+
+        if not dynamic_function.streaming:
+            run.cache = cache_for(dynamic_function)
+            if run.cache is not None:
+                run.cache_key = run.cache.key(params)
+            if run.cache_key is not None:
+                run.cached, result = run.cache.get(run.cache_key)
+
+        if dynamic_function.streaming:
+            # Items are consumed in this process, whatever the execution mode, and never cached
+            run.start_stream(self.store.get("stream_view_lines", 10000), self.store.get("stream_fps", 20))
+            run.future = self._threads.submit(run.call, dynamic_function.func, params, stream_path)
+            run.abort = partial(self._stop_stream, run)
+            mode = "stream"
+        elif run.cached:
+            run.future = Future()
+            run.future.set_result(result)
+            mode = "result cache"
+        elif dynamic_function.coroutine:
+            # Whatever the execution mode; cancelling the future cancels the task, so timeouts really stop it
+            run.future = get_async_loop().submit(partial(call_with_resources_async, dynamic_function.func, params),
+                                                 (dynamic_function.module_name, dynamic_function.name),
+                                                 settings.concurrency)
+            mode = "async"
+        elif mode == "process":
+            # The worker already imported the module; only names and arguments cross the pipe
+            pool = self._worker_pool(os.path.abspath(self.store.functions_path))
+            call = pool.submit(dynamic_function.module_name, dynamic_function.name, params)
+            run.future = call.future
+            run.abort = partial(pool.abort, call)
+        else:
+            run.future = self._threads.submit(call_with_resources, dynamic_function.func, params)
+            run.abort = partial(self._threads.abandon, run.future)
+        # Attached once control is back in the event loop, after the caller connected the run's signals
+        QTimer.singleShot(0, lambda: run.future.add_done_callback(run._on_done))
+
+        if settings.timeout and not run.cached:
+            QTimer.singleShot(int(settings.timeout * 1000), lambda: run.cancel(f"Timed out after {settings.timeout} s"))
+        print(f"Submitted {dynamic_function.name} to the {mode} executor.", severity="DEBUG")
+        return run
+
+    def prepare(self, functions: List[DynamicFunction]):
+        """Replaces the workers of a folder whose modules were reloaded; they start importing right away.
+
+        Replaced workers are not killed: calls already sent to them finish first.
+        """
+        by_module: Dict[str, List[DynamicFunction]] = {}
+        for function in functions:
+            if function.module_name:
+                by_module.setdefault(function.module_name, []).append(function)
+        # Discovery hands back the same objects for a module it did not import again
+        reloaded = sorted(name for name, module_functions in by_module.items()
+                          if not _same_objects(module_functions, self._functions_by_module.get(name)))
+        self._functions_by_module = by_module
+        self._module_names = sorted(by_module)
+
+        folder_path = os.path.abspath(self.store.functions_path)
+        for path in list(self._worker_pools):
+            # Another functions folder, or workers that imported a module before it changed
+            if path != folder_path or reloaded:
+                print(f"Reloaded modules: {', '.join(reloaded) or 'none'}.", severity="DEBUG")
+                self._worker_pools.pop(path).drain()
+        if any(self.mode(function) == "process" for function in functions if function.settings.enabled):
+            self._worker_pool(folder_path)
+
+    def reset_process_pools(self):
+        # At exit: busy workers are killed; prepare() lets them finish instead
+        for pool in self._worker_pools.values():
+            pool.shutdown()
+        self._worker_pools.clear()
+
+    def shutdown(self):
+        self.reset_process_pools()
+        self._threads.shutdown()
+        get_async_loop().shutdown()
+
+    def _stop_stream(self, run: FunctionRun):
+        # The generator stops at its next item; one stuck inside an item must not hold the slot
+        run._stop.set()
+        self._threads.abandon(run.future)
+
+    def _worker_pool(self, folder_path: str) -> WorkerPool:
+        pool = self._worker_pools.get(folder_path)
+        if pool is None:
+            pool = self._worker_pools[folder_path] = WorkerPool(folder_path, self._module_names, self.max_processes)
+        return pool
+
+
+def _same_objects(functions: List[DynamicFunction], previous: Optional[List[DynamicFunction]]) -> bool:
+    return previous is not None and len(functions) == len(previous) and all(
+        function is old for function, old in zip(functions, previous))
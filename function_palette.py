@@ -0,0 +1,112 @@
+from typing import List, Optional, Set, Tuple
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from entities import DynamicFunction
+
+
+def fuzzy_score(query: str, text: str) -> Optional[int]:
+    """Scores query as a subsequence of text (both lower case); None when it does not match."""
+    score = 0
+    position = 0
+    previous = -2
+    for character in query:
+        index = text.find(character, position)
+        if index < 0:
+            return None
+        score += 1
+        # Consecutive characters and word starts count more
+        if index == previous + 1:
+            score += 3
+        if index == 0 or not text[index - 1].isalnum():
+            score += 2
+        previous = index
+        position = index + 1
+    return score
+
+
+def function_key(dynamic_function: DynamicFunction) -> Tuple[Optional[str], str]:
+    return dynamic_function.module_name, dynamic_function.name
+
+
+class FunctionListModel(QAbstractListModel):
+    """Enabled functions, filtered by a fuzzy query; the view only asks for the rows it shows."""
+
+    def __init__(self):
+        super().__init__()
+        self.functions: List[DynamicFunction] = []
+        self._names: List[str] = []
+        self._descriptions: List[str] = []
+        self._visible: List[int] = []
+        self._query = ""
+        self.running: Set[Tuple[Optional[str], str]] = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._visible)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        dynamic_function = self.functions[self._visible[index.row()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            name = dynamic_function.settings.name
+            return f"{name} (running)" if function_key(dynamic_function) in self.running else name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return dynamic_function.settings.description or dynamic_function.name
+        if role == Qt.ItemDataRole.UserRole:
+            return dynamic_function
+        return None
+
+    def function_at(self, row: int) -> Optional[DynamicFunction]:
+        if 0 <= row < len(self._visible):
+            return self.functions[self._visible[row]]
+        return None
+
+    def row_of(self, key) -> int:
+        for row, function_index in enumerate(self._visible):
+            if function_key(self.functions[function_index]) == key:
+                return row
+        return -1
+
+    def set_functions(self, functions: List[DynamicFunction]):
+        self.beginResetModel()
+        self.functions = functions
+        # Lower-cased once per reload, not once per keystroke
+        self._names = [f"{function.settings.name} {function.name}".lower() for function in functions]
+        self._descriptions = [(function.settings.description or "").lower() for function in functions]
+        self._visible = self._match(self._query)
+        self.endResetModel()
+
+    def set_query(self, query: str):
+        query = query.strip().lower()
+        if query == self._query:
+            return
+        self.beginResetModel()
+        self._query = query
+        self._visible = self._match(query)
+        self.endResetModel()
+
+    def _match(self, query: str) -> List[int]:
+        if not query:
+            return list(range(len(self.functions)))
+        scored = []
+        for index in range(len(self.functions)):
+            # A match in the name outweighs one in the description
+            name_score = fuzzy_score(query, self._names[index])
+            description_score = fuzzy_score(query, self._descriptions[index])
+            if name_score is None and description_score is None:
+                continue
+            score = max(name_score * 2 if name_score is not None else 0, description_score or 0)
+            scored.append((-score, index))
+        scored.sort()
+        return [index for _, index in scored]
+
+    def set_running(self, key, running: bool):
+        if running:
+            self.running.add(key)
+        else:
+            self.running.discard(key)
+        row = self.row_of(key)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
@@ -0,0 +1,248 @@
+import collections.abc
+import json
+import re
+from json.decoder import scanstring
+from json.scanner import make_scanner
+from typing import Dict, Iterator, TextIO, Tuple, get_args, get_origin
+
+from converters import get_converter, needs_conversion
+from schema import schema_registry
+
+# Incremental JSON reader that builds class instances as it goes, with the same result as
+# json.loads followed by convert_to_class_instance, without holding the text or a dict tree.
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+WHITESPACE_CHARACTERS = " \t\n\r"
+# A key without escapes, with its colon; anything else takes the scanstring path
+SIMPLE_KEY = re.compile(r'"([^"\\]*)"[ \t\n\r]*:')
+
+LAZY_ORIGINS = (collections.abc.Iterable, collections.abc.Iterator)
+
+_EMPTY_DEFAULTS = {list: list, dict: dict, tuple: tuple, set: set}
+
+# json's own (C) scanner reads every value that has no class inside
+_scan_once = make_scanner(json.JSONDecoder())
+
+# Read plans, one per annotation: ("class", cls), ("small", converter), ("list", item), ("dict", value)
+# or ("raw", None)
+_plans: Dict[object, Tuple[str, object]] = {}
+_class_fields: Dict[type, Dict[str, object]] = {}
+
+
+def clear_plans():
+    # Plans hold classes and converters; a reloaded module brings new ones
+    _plans.clear()
+    _class_fields.clear()
+
+
+def _plan(annotation) -> Tuple[str, object]:
+    plan = _plans.get(annotation)
+    if plan is None:
+        origin = get_origin(annotation)
+        args = get_args(annotation)
+        # Same cases get_converter compiles for a field
+        if needs_conversion(annotation):
+            # Without lists inside, an object cannot be much bigger than the instance built from it
+            plan = ("small", get_converter(annotation)) if _is_small(annotation, set()) else ("class", annotation)
+        elif origin == list and args and needs_conversion(args[0]):
+            plan = ("list", args[0])
+        elif origin == dict and len(args) == 2 and needs_conversion(args[1]):
+            plan = ("dict", args[1])
+        else:
+            plan = ("raw", None)
+        _plans[annotation] = plan
+    return plan
+
+
+def _is_small(cls, seen: set) -> bool:
+    seen.add(cls)
+    for field in schema_registry.get(cls).fields:
+        if field.origin in (list, dict, set, tuple) or get_origin(field.annotation) in LAZY_ORIGINS:
+            return False
+        if needs_conversion(field.annotation) and field.annotation not in seen \
+                and not _is_small(field.annotation, seen):
+            return False
+    return True
+
+
+def _field_types(cls, fields) -> Dict[str, object]:
+    field_types = _class_fields.get(cls)
+    if field_types is None:
+        field_types = _class_fields[cls] = {field.name: field.annotation for field in fields}
+    return field_types
+
+
+def is_lazy_annotation(annotation) -> bool:
+    """Iterable[T] / Iterator[T] parameters receive the items one at a time."""
+    return get_origin(annotation) in LAZY_ORIGINS
+
+
+class JsonStreamReader:
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, file: TextIO):
+        self.file = file
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _fill(self, grow: bool = False) -> bool:
+        if self.eof:
+            return False
+        # A value that did not fit doubles the read, so long values are not rescanned chunk by chunk
+        size = max(self.CHUNK_SIZE, len(self.buffer) - self.position) if grow else self.CHUNK_SIZE
+        chunk = self.file.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Consumed text is dropped, so the buffer never holds more than a chunk plus one value
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def _error(self, message: str):
+        return json.JSONDecodeError(message, self.buffer, self.position)
+
+    def _peek(self) -> str:
+        if self.position < len(self.buffer):
+            character = self.buffer[self.position]
+            if character not in WHITESPACE_CHARACTERS:
+                return character
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ""
+
+    def _expect(self, character: str):
+        if self._peek() != character:
+            raise self._error(f"Expecting '{character}'")
+        self.position += 1
+
+    def read(self, annotation=None):
+        """Reads the next value, built as annotation the way convert_to_class_instance would."""
+        kind, target = _plan(annotation) if annotation is not None else ("raw", None)
+        character = self._peek()
+        if kind == "small" and character == "{":
+            return target(self._read_raw())
+        if kind == "class" and character == "{":
+            return self._read_instance(target)
+        if kind == "list" and character == "[":
+            return list(self.iter_items(target))
+        if kind == "dict" and character == "{":
+            return self._read_object(target)
+        return self._read_raw()
+
+    def read_document(self, annotation=None):
+        value = self.read(annotation)
+        if self._peek() != "":
+            raise self._error("Extra data")
+        return value
+
+    def iter_items(self, item_annotation=None) -> Iterator:
+        """Yields the items of the array at the current position one at a time."""
+        self._expect("[")
+        if self._peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self.read(item_annotation)
+            character = self._peek()
+            self.position += 1
+            if character == "]":
+                return
+            if character != ",":
+                self.position -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def _iter_members(self) -> Iterator[str]:
+        # Yields each key; the caller reads its value before asking for the next one
+        self._expect("{")
+        if self._peek() == "}":
+            self.position += 1
+            return
+        while True:
+            if self._peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            match = SIMPLE_KEY.match(self.buffer, self.position)
+            if match is not None:
+                key = match.group(1)
+                self.position = match.end()
+            else:
+                key = self._read_string()
+                self._expect(":")
+            yield key
+            character = self._peek()
+            self.position += 1
+            if character == "}":
+                return
+            if character != ",":
+                self.position -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def _read_object(self, value_annotation) -> dict:
+        return {key: self.read(value_annotation) for key in self._iter_members()}
+
+    def _read_instance(self, cls):
+        fields = schema_registry.get(cls).fields
+        field_types = _field_types(cls, fields)
+        values = {}
+        for key in self._iter_members():
+            if key in field_types:
+                values[key] = self.read(field_types[key])
+            else:
+                # Keys the class does not annotate are ignored, as in the compiled converter
+                self.read()
+
+        arguments = {}
+        for field in fields:
+            if field.name in values:
+                arguments[field.name] = values[field.name]
+            else:
+                # UI’den değer gelmezse varsayılanı kullan
+                default = _EMPTY_DEFAULTS.get(field.origin)
+                arguments[field.name] = default() if default is not None else None
+        return cls(**arguments)
+
+    def _read_string(self) -> str:
+        while True:
+            try:
+                value, end = scanstring(self.buffer, self.position + 1)
+            except json.JSONDecodeError:
+                # The closing quote is in a chunk that has not been read yet
+                if self._fill():
+                    continue
+                raise
+            self.position = end
+            return value
+
+    def _read_raw(self):
+        while True:
+            try:
+                value, end = _scan_once(self.buffer, self.position)
+            except (StopIteration, json.JSONDecodeError):
+                # The value goes on in a chunk that has not been read yet
+                if self._fill(grow=True):
+                    continue
+                raise self._error("Expecting value") from None
+            # A number near the end of the buffer may go on in the next chunk ("3000." + "0", "1e" + "+5")
+            if end + 2 >= len(self.buffer) and isinstance(value, (int, float)) and self._fill(grow=True):
+                continue
+            self.position = end
+            return value
+
+
+def load_file(path: str, annotation=None):
+    """Parses a whole JSON file straight into annotation."""
+    with open(path, "r", encoding="utf-8") as f:
+        return JsonStreamReader(f).read_document(annotation)
+
+
+def iter_file(path: str, item_annotation=None) -> Iterator:
+    """Lazily yields the items of the top-level array in a JSON file; the file stays open until exhausted."""
+    with open(path, "r", encoding="utf-8") as f:
+        reader = JsonStreamReader(f)
+        yield from reader.iter_items(item_annotation)
+        if reader._peek() != "":
+            raise reader._error("Extra data")
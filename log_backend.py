@@ -0,0 +1,266 @@
+import atexit
+import datetime
+import os
+import queue
+import sys
+import threading
+from types import CodeType
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+
+def log_file_path(folder: str, timestamp: datetime.datetime) -> str:
+    # One file per hour
+    return os.path.join(folder, f"logs_{timestamp.strftime('%d-%m-%Y_%H')}.txt")
+
+
+class LogRecord:
+    __slots__ = ("timestamp", "severity", "filename", "lineno", "text", "_message")
+
+    def __init__(self, timestamp, severity: str, filename: Optional[str], lineno: int, text: str):
+        self.timestamp = timestamp
+        self.severity = severity
+        self.filename = filename
+        self.lineno = lineno
+        self.text = text
+        self._message = None
+
+    def format(self) -> str:
+        # The same line goes to the console and to the log file, build it once
+        if self._message is None:
+            prefix = f"[{self.severity}] [{self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}] "
+            if self.filename is None:
+                # Caller capture disabled
+                self._message = prefix + self.text
+            else:
+                self._message = prefix + f"{self.filename} -> line {self.lineno}: {self.text}"
+        return self._message
+
+
+_relative_filenames: Dict[CodeType, str] = {}
+
+
+def caller_location(depth: int = 1) -> Tuple[str, int]:
+    # depth=1 is the caller of the function that calls caller_location
+    frame = sys._getframe(depth + 1)
+    code = frame.f_code
+    filename = _relative_filenames.get(code)
+    if filename is None:
+        filename = _relative_filenames[code] = os.path.relpath(code.co_filename)
+    return filename, frame.f_lineno
+
+
+class _FlushRequest:
+    __slots__ = ("callback",)
+
+    def __init__(self, callback: Callable[[], None]):
+        self.callback = callback
+
+
+class LogWriter:
+    """Queues log records and writes them to hourly files on a background thread."""
+
+    _STOP = object()
+
+    def __init__(self, folder_provider: Callable[[], str], max_queue_size: int = 10000, batch_size: int = 500,
+                 sinks: Sequence = ()):
+        self.folder_provider = folder_provider
+        # Extra destinations with write_batch(records) and close(), called on the writer thread
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self._file: Optional[TextIO] = None
+        self._file_path: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def write(self, record: LogRecord):
+        self._ensure_started()
+        if threading.current_thread() is self._thread:
+            # The writer itself may log (e.g. while loading settings); never block on its own queue
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                pass
+            return
+        # Bounded queue: producers wait for the writer instead of growing memory
+        self.queue.put(record)
+
+    def flush(self):
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.join()
+
+    def flush_async(self, callback: Callable[[], None]):
+        """Returns at once; the writer thread calls callback once the records queued so far are written."""
+        if self._thread is None or not self._thread.is_alive():
+            callback()
+            return
+        self.queue.put(_FlushRequest(callback))
+
+    def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.put(self._STOP)
+            self._thread.join()
+        self._thread = None
+        self._close_file()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            records = []
+            flushes = []
+            for item in batch:
+                if item is self._STOP:
+                    stop = True
+                elif isinstance(item, _FlushRequest):
+                    flushes.append(item)
+                else:
+                    records.append(item)
+
+            try:
+                if records:
+                    self._write_batch(records)
+            except Exception as e:
+                sys.stderr.write(f"Log writer error: {e}\n")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+            for flush in flushes:
+                try:
+                    flush.callback()
+                except Exception as e:
+                    sys.stderr.write(f"Log flush callback error: {e}\n")
+
+            if stop:
+                self._close_file()
+                for sink in self.sinks:
+                    sink.close()
+                return
+
+    def _write_batch(self, records: List[LogRecord]):
+        folder = self.folder_provider()
+        lines = []
+        for record in records:
+            # Records are routed by their own timestamp so an hour boundary inside a batch rotates correctly
+            path = log_file_path(folder, record.timestamp)
+            if path != self._file_path:
+                if lines:
+                    self._file.write("".join(lines))
+                    lines = []
+                self._open_file(folder, path)
+            lines.append(record.format() + "\n")
+
+        if lines:
+            self._file.write("".join(lines))
+        self._file.flush()
+
+        for sink in self.sinks:
+            # The text file is already written; a failing sink only loses its own copy
+            try:
+                sink.write_batch(records)
+            except Exception as e:
+                sys.stderr.write(f"Log sink error: {e}\n")
+
+    def _open_file(self, folder: str, path: str):
+        self._close_file()
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        self._file = open(path, "a", encoding="utf-8")
+        self._file_path = path
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._file_path = None
+
+
+def create_log_writer(folder_provider: Callable[[], str], sinks: Sequence = ()) -> LogWriter:
+    writer = LogWriter(folder_provider, sinks=sinks)
+    # Drain whatever is still queued when the interpreter exits normally
+    atexit.register(writer.close)
+    return writer
+
+
+class LogTail:
+    """Follows the current hour's log file and returns only the lines appended since the last poll."""
+
+    def __init__(self, folder_provider: Callable[[], str], initial_bytes: Optional[int] = 256 * 1024,
+                 max_bytes: Optional[int] = None):
+        self.folder_provider = folder_provider
+        # How much of an already large file is shown when following starts, None for all of it
+        self.initial_bytes = initial_bytes
+        # Read limit of one poll, so a large file is taken in over several polls
+        self.max_bytes = max_bytes
+        self.path: Optional[str] = None
+        self.offset = 0
+        self._partial = b""
+        self._skip_first = False
+        # Whether the last poll stopped at max_bytes
+        self.behind = False
+
+    def poll_bytes(self) -> Tuple[bool, int, List[bytes]]:
+        """Returns (restarted, file offset of the first line, new complete lines, undecoded and without newlines).
+
+        restarted is True when the hour rotated or the file was truncated.
+        """
+        path = log_file_path(self.folder_provider(), datetime.datetime.now())
+        restarted = path != self.path
+        self.behind = False
+        if restarted:
+            self.path = path
+            self.offset = -1
+            self._partial = b""
+            self._skip_first = False
+
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            return restarted, 0, []
+        if self.offset > size:
+            # Truncated or replaced; start over
+            restarted = True
+            self.offset = 0
+            self._partial = b""
+            self._skip_first = False
+        if size == self.offset:
+            return restarted, self.offset, []
+
+        with open(path, "rb") as f:
+            if self.offset < 0:
+                self.offset = max(0, size - self.initial_bytes) if self.initial_bytes is not None else 0
+                if self.offset > 0:
+                    # Starting inside a line, drop that line once it is complete
+                    f.seek(self.offset - 1)
+                    self._skip_first = f.read(1) != b"\n"
+            length = size - self.offset
+            if self.max_bytes is not None and length > self.max_bytes:
+                length = self.max_bytes
+                self.behind = True
+            f.seek(self.offset)
+            data = f.read(length)
+        start = self.offset - len(self._partial)
+        self.offset += len(data)
+
+        lines = (self._partial + data).split(b"\n")
+        # The last piece has no newline yet; it is completed by a later poll
+        self._partial = lines.pop()
+        if self._skip_first and lines:
+            start += len(lines.pop(0)) + 1
+            self._skip_first = False
+        return restarted, start, lines
@@ -0,0 +1,217 @@
+import datetime
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Callable, Dict, Iterable, List, Optional
+
+from log_backend import LogRecord
+
+# Structured copy of the log lines, written by the log writer thread next to the hourly text files
+
+SEVERITIES = ("DEBUG", "DEV", "INFO", "WARNING", "ERROR", "CRITICAL")
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITIES)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    severity INTEGER NOT NULL,
+    source INTEGER,
+    lineno INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS records_ts ON records (ts);
+CREATE INDEX IF NOT EXISTS records_severity_ts ON records (severity, ts);
+CREATE INDEX IF NOT EXISTS records_source_ts ON records (source, ts);
+"""
+
+# Substring search over the text, opt-in since it makes writes several times slower;
+# left out where SQLite is built without FTS5 or its trigram tokenizer
+FULL_TEXT_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS records_fts USING fts5(
+    text, content='records', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS records_fts_insert AFTER INSERT ON records BEGIN
+    INSERT INTO records_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS records_fts_delete AFTER DELETE ON records BEGIN
+    INSERT INTO records_fts (records_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+DROP_FULL_TEXT = """
+DROP TRIGGER IF EXISTS records_fts_insert;
+DROP TRIGGER IF EXISTS records_fts_delete;
+DROP TABLE IF EXISTS records_fts;
+"""
+
+
+def _to_millis(timestamp: datetime.datetime) -> int:
+    return int(timestamp.timestamp() * 1000)
+
+
+class LogStore:
+    """SQLite log sink. Only the writer thread writes; every query opens its own read connection."""
+
+    def __init__(self, path_provider: Callable[[], Optional[str]], retention_days: Optional[float] = 30,
+                 full_text_index: bool = False):
+        # None from the provider disables the store
+        self.path_provider = path_provider
+        self.retention_days = retention_days
+        self.full_text_index = full_text_index
+        self._connection: Optional[sqlite3.Connection] = None
+        self._path: Optional[str] = None
+        # Source file names are stored once and referenced by id
+        self._source_ids: Dict[str, int] = {}
+        self._full_text: Optional[bool] = None
+
+    def _connect(self, path: str) -> sqlite3.Connection:
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        connection = sqlite3.connect(path)
+        # WAL lets the viewer read while the writer appends
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _open(self, path: str):
+        self.close()
+        connection = self._connect(path)
+        connection.executescript(SCHEMA)
+        had_full_text = connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'records_fts'").fetchone()
+        if self.full_text_index:
+            try:
+                connection.executescript(FULL_TEXT_SCHEMA)
+                if not had_full_text:
+                    # Index the records written before the index existed
+                    connection.execute("INSERT INTO records_fts (records_fts) VALUES ('rebuild')")
+            except sqlite3.OperationalError:
+                pass
+        elif had_full_text:
+            connection.executescript(DROP_FULL_TEXT)
+        self._full_text = None
+        if self.retention_days:
+            cutoff = int((time.time() - self.retention_days * 86400) * 1000)
+            connection.execute("DELETE FROM records WHERE ts < ?", (cutoff,))
+        connection.commit()
+        self._source_ids = dict(connection.execute("SELECT name, id FROM sources"))
+        self._connection = connection
+        self._path = path
+
+    @property
+    def full_text(self) -> bool:
+        # Whether the store file has the trigram index, checked once per process
+        if self._full_text is None:
+            connection = self._read_connection()
+            if connection is None:
+                return False
+            with closing(connection):
+                self._full_text = connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'records_fts'").fetchone() is not None
+        return self._full_text
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = None
+        self._path = None
+        self._source_ids = {}
+
+    def _source_id(self, name: Optional[str]) -> Optional[int]:
+        if name is None:
+            return None
+        source_id = self._source_ids.get(name)
+        if source_id is None:
+            source_id = self._connection.execute("INSERT INTO sources (name) VALUES (?)", (name,)).lastrowid
+            self._source_ids[name] = source_id
+        return source_id
+
+    def write_batch(self, records: List[LogRecord]):
+        path = self.path_provider()
+        if path is None:
+            if self._connection is not None:
+                self.close()
+            return
+        if path != self._path:
+            self._open(path)
+
+        rows = [(_to_millis(record.timestamp), SEVERITY_CODES.get(record.severity, SEVERITY_CODES["INFO"]),
+                 self._source_id(record.filename), record.lineno, record.text) for record in records]
+        # One transaction per batch of the writer
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO records (ts, severity, source, lineno, text) VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _read_connection(self) -> Optional[sqlite3.Connection]:
+        path = self.path_provider()
+        if path is None or not os.path.exists(path):
+            return None
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA query_only=ON")
+        return connection
+
+    def query(self, severities: Optional[Iterable[str]] = None, since: Optional[datetime.datetime] = None,
+              until: Optional[datetime.datetime] = None, source: Optional[str] = None, text: Optional[str] = None,
+              limit: int = 5000) -> List[LogRecord]:
+        """The newest `limit` matching records, oldest first. text is a case-insensitive substring."""
+        conditions = []
+        parameters = []
+        if since is not None:
+            conditions.append("ts >= ?")
+            parameters.append(_to_millis(since))
+        if until is not None:
+            conditions.append("ts < ?")
+            parameters.append(_to_millis(until))
+        if source:
+            conditions.append("source = (SELECT id FROM sources WHERE name = ?)")
+            parameters.append(source)
+        if text:
+            if self.full_text and len(text) >= 3:
+                # Trigram index; shorter text cannot use it
+                conditions.append("id IN (SELECT rowid FROM records_fts WHERE records_fts MATCH ?)")
+                parameters.append('"' + text.replace('"', '""') + '"')
+            else:
+                escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                conditions.append("text LIKE ? ESCAPE '\\'")
+                parameters.append(f"%{escaped}%")
+
+        codes = [None]
+        if severities is not None:
+            codes = sorted({SEVERITY_CODES[name] for name in severities if name in SEVERITY_CODES})
+            if not codes:
+                return []
+            if len(codes) == len(SEVERITIES):
+                codes = [None]
+
+        # One newest-first walk of the (severity, ts) index per severity, merged by the outer ORDER BY;
+        # a single walk of the ts index would skip over every record of the other severities
+        selects = []
+        select_parameters = []
+        for code in codes:
+            where = conditions + ["severity = ?"] if code is not None else conditions
+            where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+            selects.append(f"SELECT * FROM (SELECT id, ts, severity, source, lineno, text FROM records {where_sql} "
+                           f"ORDER BY ts DESC, id DESC LIMIT ?)")
+            select_parameters.extend(parameters + ([code] if code is not None else []) + [limit])
+        sql = " UNION ALL ".join(selects) + " ORDER BY ts DESC, id DESC LIMIT ?"
+        select_parameters.append(limit)
+
+        connection = self._read_connection()
+        if connection is None:
+            return []
+        with closing(connection):
+            rows = connection.execute(sql, select_parameters).fetchall()
+            names = dict(connection.execute("SELECT id, name FROM sources")) if rows else {}
+        rows.reverse()
+        return [LogRecord(datetime.datetime.fromtimestamp(ts / 1000), SEVERITIES[severity], names.get(source),
+                          lineno, text)
+                for _, ts, severity, source, lineno, text in rows]
+
+    def sources(self) -> List[str]:
+        connection = self._read_connection()
+        if connection is None:
+            return []
+        with closing(connection):
+            return [name for name, in connection.execute("SELECT name FROM sources ORDER BY name")]
@@ -0,0 +1,208 @@
+import re
+import time
+from array import array
+from typing import List, Optional
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QStyledItemDelegate
+
+from log_backend import LogRecord
+from log_store import SEVERITY_CODES
+
+# Log lines as parallel arrays; the text of a followed file stays in the file and is read for visible rows only
+
+NO_SEVERITY = -1
+SeverityRole = Qt.ItemDataRole.UserRole
+TimestampRole = Qt.ItemDataRole.UserRole + 1
+
+_SEVERITY_BYTES = {name.encode(): code for name, code in SEVERITY_CODES.items()}
+
+
+class LogLines:
+    """Severity (1 byte), timestamp (8 bytes) and file offset (8 bytes) per line, or the text itself for
+    lines that do not come from a file (search results)."""
+
+    TEXT_CACHE_SIZE = 1024
+
+    def __init__(self):
+        self.severities = array("b")
+        self.timestamps = array("q")
+        self.offsets = array("q")
+        self.texts: Optional[List[str]] = None
+        self.path: Optional[str] = None
+        self.end = 0  # Offset after the newline of the last line
+        self._file = None
+        self._cache = {}
+        self._reset_parse_state()
+
+    def _reset_parse_state(self):
+        self._severity = NO_SEVERITY
+        self._timestamp = 0
+        self._timestamp_text = b""
+
+    def __len__(self):
+        return len(self.severities)
+
+    def clear(self):
+        self.close()
+        self.severities = array("b")
+        self.timestamps = array("q")
+        self.offsets = array("q")
+        self.texts = None
+        self.path = None
+        self.end = 0
+        self._cache.clear()
+        self._reset_parse_state()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+
+    def append_file_lines(self, path: str, start: int, lines: List[bytes]):
+        """Indexes lines read from path at offset start, each followed by a newline."""
+        if path != self.path:
+            self.clear()
+            self.path = path
+        severity_codes = _SEVERITY_BYTES
+        severity = self._severity
+        timestamp = self._timestamp
+        timestamp_text = self._timestamp_text
+        severities = []
+        timestamps = []
+        offsets = []
+        offset = start
+        for line in lines:
+            offsets.append(offset)
+            offset += len(line) + 1
+            # "[SEVERITY] [YYYY-mm-dd HH:MM:SS] ...", sliced rather than matched, this runs for every line
+            if line[:1] == b"[":
+                end = line.find(b"]", 1, 10)
+                code = severity_codes.get(line[1:end]) if end > 0 else None
+                if code is not None and line[end + 1:end + 3] == b" [":
+                    severity = code
+                    text = line[end + 3:end + 22]
+                    # Lines written in the same second share the conversion
+                    if text != timestamp_text:
+                        timestamp_text = text
+                        try:
+                            timestamp = int(time.mktime(time.strptime(text.decode(), "%Y-%m-%d %H:%M:%S")))
+                        except ValueError:
+                            pass
+            # Continuation lines take the severity and time of the line they belong to
+            severities.append(severity)
+            timestamps.append(timestamp)
+        self.severities.extend(severities)
+        self.timestamps.extend(timestamps)
+        self.offsets.extend(offsets)
+        self._severity = severity
+        self._timestamp = timestamp
+        self._timestamp_text = timestamp_text
+        self.end = offset
+
+    def set_records(self, records: List[LogRecord]):
+        self.clear()
+        self.texts = []
+        for record in records:
+            # A message with newlines becomes one row per line, as in the file
+            for line in record.format().split("\n"):
+                self.severities.append(SEVERITY_CODES.get(record.severity, NO_SEVERITY))
+                self.timestamps.append(int(record.timestamp.timestamp()))
+                self.texts.append(line)
+
+    def remove_first(self, count: int):
+        del self.severities[:count]
+        del self.timestamps[:count]
+        if self.texts is not None:
+            del self.texts[:count]
+        else:
+            del self.offsets[:count]
+        self._cache.clear()
+
+    def text(self, row: int) -> str:
+        if self.texts is not None:
+            return self.texts[row]
+        text = self._cache.get(row)
+        if text is None:
+            if self._file is None:
+                self._file = open(self.path, "rb")
+            start = self.offsets[row]
+            end = self.offsets[row + 1] if row + 1 < len(self.offsets) else self.end
+            self._file.seek(start)
+            text = self._file.read(end - start - 1).decode("utf-8", "replace").rstrip("\r")
+            if len(self._cache) >= self.TEXT_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[row] = text
+        return text
+
+
+class LogListModel(QAbstractListModel):
+    def __init__(self, max_lines: int):
+        super().__init__()
+        self.lines = LogLines()
+        self.max_lines = max_lines
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.lines.text(row)
+        if role == SeverityRole:
+            return self.lines.severities[row]
+        if role == TimestampRole:
+            return self.lines.timestamps[row]
+        return None
+
+    def clear(self):
+        self.beginResetModel()
+        self.lines.clear()
+        self.endResetModel()
+
+    def set_records(self, records: List[LogRecord]):
+        self.beginResetModel()
+        self.lines.set_records(records)
+        self.endResetModel()
+
+    def append_file_lines(self, path: str, start: int, lines: List[bytes]):
+        if not lines:
+            return
+        if path != self.lines.path or self.lines.texts is not None:
+            self.clear()
+        first = len(self.lines)
+        self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+        self.lines.append_file_lines(path, start, lines)
+        self.endInsertRows()
+
+        excess = len(self.lines) - self.max_lines
+        if excess > 0:
+            # Dropped in steps of a tenth, so the arrays are not shifted on every poll
+            excess = min(len(self.lines), excess + self.max_lines // 10)
+            self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+            self.lines.remove_first(excess)
+            self.endRemoveRows()
+
+
+def _color(value: str) -> QColor:
+    red, green, blue, alpha = re.findall(r"[\d.]+", value)
+    return QColor(int(red), int(green), int(blue), int(float(alpha) * 255))
+
+
+class SeverityDelegate(QStyledItemDelegate):
+    """Colors each row by its severity; only rows being painted are asked for."""
+
+    def __init__(self, severity_colors: dict, parent=None):
+        super().__init__(parent)
+        self.colors = {code: _color(severity_colors[name]) for name, code in SEVERITY_CODES.items()
+                       if name in severity_colors}
+        self.colors[NO_SEVERITY] = _color(severity_colors["RESET"])
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        color = self.colors.get(index.data(SeverityRole))
+        if color is not None:
+            option.palette.setColor(option.palette.ColorRole.Text, color)
@@ -1,8 +1,14 @@
 import os
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QPushButton
-from PyQt6.QtCore import QTimer
-from utils import load_settings, print
-from datetime import datetime
+import time
+from PyQt6.QtWidgets import (QAbstractItemView, QApplication, QCheckBox, QComboBox, QDateTimeEdit, QHBoxLayout,
+                             QLabel, QLineEdit, QListView, QPushButton, QVBoxLayout, QWidget)
+from PyQt6.QtCore import QDateTime, QTimer, pyqtSignal
+from PyQt6.QtGui import QFontDatabase, QKeySequence, QShortcut
+from log_backend import LogTail
+from log_store import SEVERITIES
+from log_view import LogListModel, SeverityDelegate
+from settings_store import get_settings_store
+from utils import flush_logs, log_store, print
 
 severity_colors = {
     'INFO': 'rgba(0, 0, 255, 1)',  # Bright blue with 80% opacity
@@ -17,101 +23,173 @@ severity_colors = {
 
 
 class LogsScreen(QWidget):
+    POLL_INTERVAL_MS = 500
+
+    # Emitted by the log writer thread once the records queued before a search are in the store
+    logs_flushed = pyqtSignal()
+
     def __init__(self):
         super().__init__()
+        self.logs_flushed.connect(self.run_search)
         self.setWindowTitle("Logs")
         self.setGeometry(100, 100, 600, 400)
 
         self.layout = QVBoxLayout()
 
-        self.log_display = QTextEdit(self)
-        self.log_display.setReadOnly(True)
+        self.layout.addLayout(self.build_filters())
+
+        # Only the rows on screen are read and painted; the model keeps the newest log_view_lines lines
+        self.model = LogListModel(get_settings_store().get("log_view_lines", 1000000))
+        self.log_display = QListView(self)
+        self.log_display.setModel(self.model)
+        self.log_display.setItemDelegate(SeverityDelegate(severity_colors, self.log_display))
+        self.log_display.setUniformItemSizes(True)
+        self.log_display.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.log_display.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        QShortcut(QKeySequence.StandardKey.Copy, self.log_display, self.copy_selection)
         self.layout.addWidget(self.log_display)
+
+        self.empty_label = QLabel("No logs found for this hour.")
+        self.layout.addWidget(self.empty_label)
         
         open_logs = QPushButton("Open logs folder")
-        open_logs.clicked.connect(lambda: os.startfile(load_settings(key="logs", default_value="logs")))
+        open_logs.clicked.connect(lambda: os.startfile(get_settings_store().log_folder))
         self.layout.addWidget(open_logs)
 
         self.setLayout(self.layout)
 
+        self.tail = self.create_tail()
+        self.following = True
+
+        # Polling only stats the file; it is read when it grew
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.load_logs)
-        self.timer.start(2000)
+        self.timer.start(self.POLL_INTERVAL_MS)
 
         self.load_logs()
 
+    def build_filters(self):
+        filters = QVBoxLayout()
+
+        first_row = QHBoxLayout()
+        self.severity_boxes = {}
+        for severity in SEVERITIES:
+            box = QCheckBox(severity)
+            box.setChecked(True)
+            self.severity_boxes[severity] = box
+            first_row.addWidget(box)
+        first_row.addStretch()
+        filters.addLayout(first_row)
+
+        second_row = QHBoxLayout()
+        now = QDateTime.currentDateTime()
+        self.since_edit = QDateTimeEdit(now.addDays(-1))
+        self.until_edit = QDateTimeEdit(now)
+        for edit in (self.since_edit, self.until_edit):
+            edit.setCalendarPopup(True)
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm")
+        second_row.addWidget(QLabel("From"))
+        second_row.addWidget(self.since_edit)
+        second_row.addWidget(QLabel("To"))
+        second_row.addWidget(self.until_edit)
+
+        # Empty text means every source file
+        self.source_box = QComboBox()
+        self.source_box.setEditable(True)
+        self.source_box.setMinimumWidth(160)
+        second_row.addWidget(self.source_box)
+
+        self.text_edit = QLineEdit()
+        self.text_edit.setPlaceholderText("Text")
+        self.text_edit.returnPressed.connect(self.search)
+        second_row.addWidget(self.text_edit)
+
+        search_button = QPushButton("Search")
+        search_button.clicked.connect(self.search)
+        second_row.addWidget(search_button)
+
+        follow_button = QPushButton("Follow")
+        follow_button.clicked.connect(self.follow)
+        second_row.addWidget(follow_button)
+        filters.addLayout(second_row)
+
+        self.status_label = QLabel("Following the current log file.")
+        filters.addWidget(self.status_label)
+        self.refresh_sources()
+        return filters
+
+    def refresh_sources(self):
+        current = self.source_box.currentText()
+        self.source_box.clear()
+        self.source_box.addItem("")
+        self.source_box.addItems(log_store.sources())
+        self.source_box.setCurrentText(current)
+
+    def search(self):
+        # Results stay on screen until Follow is pressed
+        self.following = False
+        self.timer.stop()
+        self.status_label.setText("Searching...")
+        # Records still queued for the writer are part of the answer; the writer says when they are stored
+        flush_logs(self.logs_flushed.emit)
+
+    def run_search(self):
+        if self.following:
+            # Follow was pressed while the writer caught up
+            return
+        limit = get_settings_store().get("log_query_limit", 10000)
+        start = time.perf_counter()
+        records = log_store.query(
+            severities=[severity for severity, box in self.severity_boxes.items() if box.isChecked()],
+            since=self.since_edit.dateTime().toPyDateTime(),
+            until=self.until_edit.dateTime().toPyDateTime(),
+            source=self.source_box.currentText().strip() or None,
+            text=self.text_edit.text() or None,
+            limit=limit)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self.model.set_records(records)
+        self.empty_label.setText("No matching logs.")
+        self.empty_label.setVisible(not records)
+        newest = f" (newest {limit})" if len(records) == limit else ""
+        self.status_label.setText(f"{len(records)} records{newest} in {elapsed:.0f} ms.")
+        self.refresh_sources()
+
+    def follow(self):
+        self.until_edit.setDateTime(QDateTime.currentDateTime())
+        self.status_label.setText("Following the current log file.")
+        self.empty_label.setText("No logs found for this hour.")
+        self.tail = self.create_tail()
+        self.following = True
+        self.load_logs()
+        self.timer.start(self.POLL_INTERVAL_MS)
+
+    @staticmethod
+    def create_tail() -> LogTail:
+        # The whole hour is indexed, a few MB per poll so a large file does not freeze the window
+        return LogTail(lambda: get_settings_store().log_folder, initial_bytes=None, max_bytes=4 * 1024 * 1024)
+
     def load_logs(self):
-        # Get current vertical scrollbar position
-        scrollbar_pos = self.log_display.verticalScrollBar().value()
-
-        log_path = load_settings(key="logs", default_value="logs")
-        log_files = sorted([f for f in os.listdir(log_path) if f.startswith(
-            "logs_") and f.endswith(".txt")], reverse=True)
-
-        if log_files:
-            latest_log = log_files[0]
-            latest_log_path = os.path.join(log_path, latest_log)
-
-            # Get the current date and hour
-            current_date = datetime.now().strftime("%Y-%m-%d")
-            current_hour = datetime.now().strftime("%H")
-
-            with open(latest_log_path, "r", encoding="utf-8") as file:
-                log_content = file.readlines()
-
-            # Filter logs by today's date and the current hour
-            filtered_content = []
-            for line in log_content:
-                # Check if the line contains the current date and hour
-                if current_date in line and current_hour in line:
-                    filtered_content.append(line)
-
-            if filtered_content:
-                colored_content = self.apply_colors("".join(filtered_content))
-                self.log_display.setHtml(colored_content)
-            else:
-                self.log_display.setPlainText("No logs found for this hour.")
-
-        else:
-            self.log_display.setPlainText("No logs found.")
-
-        # Restore scrollbar position after the content is updated
-        self.log_display.verticalScrollBar().setValue(scrollbar_pos)
-
-    def apply_colors(self, log_content):
-        lines = log_content.splitlines()
-        colored_lines = []
-        current_severity = None  # Keep track of the last severity
-
-        for line in lines:
-            # Determine the severity of the line
-            if '[INFO]' in line:
-                color = severity_colors['INFO']
-                current_severity = 'INFO'
-            elif '[WARNING]' in line:
-                color = severity_colors['WARNING']
-                current_severity = 'WARNING'
-            elif '[ERROR]' in line:
-                color = severity_colors['ERROR']
-                current_severity = 'ERROR'
-            elif '[DEBUG]' in line:
-                color = severity_colors['DEBUG']
-                current_severity = 'DEBUG'
-            elif '[CRITICAL]' in line:
-                color = severity_colors['CRITICAL']
-                current_severity = 'CRITICAL'
-            elif '[DEV]' in line:
-                color = severity_colors['DEV']
-                current_severity = 'DEV'
-            else:
-                # If no severity is found, use the previous line's severity
-                if current_severity:
-                    color = severity_colors[current_severity]
-                else:
-                    color = severity_colors['RESET']
-
-            # Add the line to the colored output
-            colored_line = f"<span style='color:{color}'>{line}</span>"
-            colored_lines.append(colored_line)
-
-        return "<br>".join(colored_lines)
+        if not self.following:
+            return
+        restarted, start, lines = self.tail.poll_bytes()
+        if restarted:
+            # A new hour starts with an empty view, as the hourly file does
+            self.model.clear()
+        if lines:
+            scrollbar = self.log_display.verticalScrollBar()
+            at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+
+            self.model.append_file_lines(self.tail.path, start, lines)
+
+            # Follow new lines only when the view was already at the end
+            if at_bottom:
+                self.log_display.scrollToBottom()
+        self.empty_label.setVisible(self.model.rowCount() == 0)
+        if self.tail.behind:
+            # The rest of a large file comes in on the next turns of the event loop
+            QTimer.singleShot(0, self.load_logs)
+
+    def copy_selection(self):
+        rows = sorted(index.row() for index in self.log_display.selectedIndexes())
+        QApplication.clipboard().setText("\n".join(self.model.lines.text(row) for row in rows))
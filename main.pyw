@@ -1,8 +1,9 @@
+import multiprocessing
 import sys
 import traceback
-from PyQt6.QtWidgets import QApplication
-from ui import MainWindow
-from utils import print
+
+# Spawned worker processes run this file again as __mp_main__; everything of the GUI is imported
+# below, under __main__, so they never load PyQt6, the UI or the log store
 
 
 def global_exception_handler(exc_type, exc_value, exc_tb):
@@ -11,13 +12,22 @@ def global_exception_handler(exc_type, exc_value, exc_tb):
         error_message += ''.join(traceback.format_tb(exc_tb))
 
         print(error_message, severity="CRITICAL")
+        flush_logs()
         sys.exit(1)
     if exc_type is KeyboardInterrupt:
         print("KeyboardInterrupt received. Exiting...", severity="DEBUG")
+        flush_logs()
         sys.exit(0)
 
 
 if __name__ == "__main__":
+    # Worker processes are spawned from the frozen EXE too
+    multiprocessing.freeze_support()
+
+    from PyQt6.QtWidgets import QApplication
+    from ui import MainWindow
+    from utils import flush_logs, print
+
     # Set the global exception handler
     sys.excepthook = global_exception_handler
     
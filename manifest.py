@@ -0,0 +1,370 @@
+import ast
+import builtins
+import hashlib
+import inspect
+import json
+import os
+from enum import Enum
+from typing import Dict, List, Optional
+
+from resources import HOOK_NAMES
+
+MANIFEST_VERSION = 5
+MANIFEST_FILENAME = "functions_manifest.json"
+
+ENUM_BASES = {"Enum", "IntEnum", "StrEnum", "Flag", "IntFlag"}
+
+_PARAMETER_KINDS = {
+    "POSITIONAL_ONLY": inspect.Parameter.POSITIONAL_ONLY,
+    "POSITIONAL_OR_KEYWORD": inspect.Parameter.POSITIONAL_OR_KEYWORD,
+    "VAR_POSITIONAL": inspect.Parameter.VAR_POSITIONAL,
+    "KEYWORD_ONLY": inspect.Parameter.KEYWORD_ONLY,
+    "VAR_KEYWORD": inspect.Parameter.VAR_KEYWORD,
+}
+
+
+class ParameterManifest:
+    def __init__(self, name: str, annotation: Optional[str] = None, default: Optional[str] = None,
+                 kind: str = "POSITIONAL_OR_KEYWORD"):
+        self.name = name
+        # Source text of the annotation and default, None when missing
+        self.annotation = annotation
+        self.default = default
+        self.kind = kind
+
+    def to_dict(self):
+        return {"name": self.name, "annotation": self.annotation, "default": self.default, "kind": self.kind}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ParameterManifest":
+        return cls(data["name"], data.get("annotation"), data.get("default"), data.get("kind", "POSITIONAL_OR_KEYWORD"))
+
+
+class FunctionManifest:
+    def __init__(self, name: str, parameters: List[ParameterManifest], streaming: bool = False,
+                 coroutine: bool = False):
+        self.name = name
+        self.parameters = parameters
+        # A generator or async generator function
+        self.streaming = streaming
+        # An async def without yield
+        self.coroutine = coroutine
+
+    def to_dict(self):
+        return {"name": self.name, "parameters": [parameter.to_dict() for parameter in self.parameters],
+                "streaming": self.streaming, "coroutine": self.coroutine}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FunctionManifest":
+        return cls(data["name"], [ParameterManifest.from_dict(parameter) for parameter in data["parameters"]],
+                   data.get("streaming", False), data.get("coroutine", False))
+
+
+class ClassManifest:
+    def __init__(self, name: str, is_enum: bool = False, members: Optional[Dict[str, object]] = None,
+                 parameters: Optional[List[ParameterManifest]] = None):
+        self.name = name
+        self.is_enum = is_enum
+        self.members = members or {}
+        # Constructor parameters without self
+        self.parameters = parameters or []
+
+    def to_dict(self):
+        return {"name": self.name, "is_enum": self.is_enum, "members": self.members,
+                "parameters": [parameter.to_dict() for parameter in self.parameters]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ClassManifest":
+        return cls(data["name"], data.get("is_enum", False), data.get("members"),
+                   [ParameterManifest.from_dict(parameter) for parameter in data.get("parameters", [])])
+
+
+class ModuleManifest:
+    """What a module file declares, read from its source without executing it."""
+
+    def __init__(self, module_name: str, mtime_ns: int = 0, size: int = 0, digest: str = "",
+                 functions: Optional[List[FunctionManifest]] = None, classes: Optional[Dict[str, ClassManifest]] = None,
+                 settings: Optional[dict] = None, static: bool = True, imports: Optional[List[str]] = None):
+        self.module_name = module_name
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.functions = functions or []
+        self.classes = classes or {}
+        self.settings = settings
+        # False when the module decides at import time what it exposes; such modules must be imported
+        self.static = static
+        # Top-level names of every module it imports, wherever the import statement is
+        self.imports = imports or []
+
+    def to_dict(self):
+        return {
+            "module_name": self.module_name,
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "digest": self.digest,
+            "functions": [function.to_dict() for function in self.functions],
+            "classes": {name: cls.to_dict() for name, cls in self.classes.items()},
+            "settings": self.settings,
+            "static": self.static,
+            "imports": self.imports,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ModuleManifest":
+        return cls(data["module_name"], data["mtime_ns"], data["size"], data["digest"],
+                   [FunctionManifest.from_dict(function) for function in data["functions"]],
+                   {name: ClassManifest.from_dict(c) for name, c in data["classes"].items()},
+                   data.get("settings"), data.get("static", True), data.get("imports"))
+
+    def signature(self, function: FunctionManifest) -> inspect.Signature:
+        """Builds a signature whose annotations are stand-ins good enough to lay out a form."""
+        placeholders = {}
+        parameters = []
+        for parameter in function.parameters:
+            annotation = inspect.Parameter.empty
+            if parameter.annotation is not None:
+                annotation = self._annotation_type(parameter.annotation, placeholders)
+
+            default = inspect.Parameter.empty
+            if parameter.default is not None:
+                try:
+                    default = ast.literal_eval(parameter.default)
+                except (ValueError, SyntaxError):
+                    default = parameter.default
+
+            parameters.append(inspect.Parameter(parameter.name, _PARAMETER_KINDS[parameter.kind],
+                                                default=default, annotation=annotation))
+        return inspect.Signature(parameters)
+
+    def describe(self, annotation: str, seen: Optional[set] = None) -> str:
+        """Same shape as constructor_parameter_analyzer's output, one class deep per level."""
+        seen = set() if seen is None else seen
+        cls = self.classes.get(_annotation_head(annotation))
+        if cls is None or cls.is_enum:
+            return annotation
+        if cls.name in seen:
+            return cls.name
+        seen = seen | {cls.name}
+
+        parts = []
+        for parameter in cls.parameters:
+            if parameter.annotation is None:
+                parts.append(f"{parameter.name}: Unknown")
+                continue
+            inner = _annotation_inner(parameter.annotation)
+            if inner in self.classes and not self.classes[inner].is_enum:
+                nested = self.describe(inner, seen)
+                if inner != _annotation_head(parameter.annotation):
+                    parts.append(f"{parameter.name}: {_annotation_head(parameter.annotation)}[{nested}]")
+                else:
+                    parts.append(f"{parameter.name}: {inner} ({nested})")
+            else:
+                parts.append(f"{parameter.name}: {parameter.annotation}")
+        return ", ".join(parts) if parts else "None"
+
+    def _annotation_type(self, annotation: str, placeholders: dict):
+        head = _annotation_head(annotation)
+        builtin = getattr(builtins, head, None)
+        if isinstance(builtin, type):
+            return builtin
+        if head in {"List", "Dict", "Tuple", "Set"}:
+            return getattr(builtins, head.lower())
+
+        if annotation not in placeholders:
+            cls = self.classes.get(head)
+            if cls is not None and cls.is_enum:
+                placeholder = Enum(cls.name, cls.members or {"_": None})
+            else:
+                # Stand-in class until the module is imported
+                placeholder = type(head, (), {})
+            placeholder.__manifest_description__ = self.describe(annotation)
+            placeholders[annotation] = placeholder
+        return placeholders[annotation]
+
+
+def _annotation_head(annotation: str) -> str:
+    return annotation.split("[", 1)[0].strip().split(".")[-1]
+
+
+def _annotation_inner(annotation: str) -> str:
+    # list[Kisi] -> Kisi, Kisi -> Kisi
+    if "[" in annotation and annotation.endswith("]"):
+        return _annotation_head(annotation[annotation.index("[") + 1:-1].split(",")[0])
+    return _annotation_head(annotation)
+
+
+def _source(node: Optional[ast.AST]) -> Optional[str]:
+    if node is None:
+        return None
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        # String (forward reference) annotation
+        return node.value
+    return ast.unparse(node)
+
+
+def _parameters(arguments: ast.arguments, skip_self: bool = False) -> List[ParameterManifest]:
+    parameters = []
+    positional = arguments.posonlyargs + arguments.args
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(arguments.defaults)
+    for index, (arg, default) in enumerate(zip(positional, defaults)):
+        if skip_self and index == 0:
+            continue
+        kind = "POSITIONAL_ONLY" if index < len(arguments.posonlyargs) else "POSITIONAL_OR_KEYWORD"
+        parameters.append(ParameterManifest(arg.arg, _source(arg.annotation), _source(default), kind))
+    if arguments.vararg is not None:
+        parameters.append(ParameterManifest(arguments.vararg.arg, _source(arguments.vararg.annotation), None,
+                                            "VAR_POSITIONAL"))
+    for arg, default in zip(arguments.kwonlyargs, arguments.kw_defaults):
+        parameters.append(ParameterManifest(arg.arg, _source(arg.annotation), _source(default), "KEYWORD_ONLY"))
+    if arguments.kwarg is not None:
+        parameters.append(ParameterManifest(arguments.kwarg.arg, _source(arguments.kwarg.annotation), None,
+                                            "VAR_KEYWORD"))
+    return parameters
+
+
+def _scan_class(node: ast.ClassDef) -> Optional[ClassManifest]:
+    base_names = {_annotation_head(ast.unparse(base)) for base in node.bases}
+    if base_names & ENUM_BASES:
+        members = {}
+        for statement in node.body:
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                    and isinstance(statement.targets[0], ast.Name):
+                try:
+                    members[statement.targets[0].id] = ast.literal_eval(statement.value)
+                except ValueError:
+                    return None
+        return ClassManifest(node.name, is_enum=True, members=members)
+
+    parameters = []
+    fields = []
+    for statement in node.body:
+        if isinstance(statement, ast.FunctionDef) and statement.name == "__init__":
+            parameters = _parameters(statement.args, skip_self=True)
+        elif isinstance(statement, ast.AnnAssign) and isinstance(statement.target, ast.Name):
+            fields.append(ParameterManifest(statement.target.id, _source(statement.annotation), _source(statement.value)))
+    # Without an explicit __init__ (e.g. dataclasses) the annotated fields are the constructor
+    return ClassManifest(node.name, parameters=parameters or fields)
+
+
+def _yields(node: ast.AST) -> bool:
+    # A yield in the body itself, not in a nested function or class
+    pending = list(ast.iter_child_nodes(node))
+    while pending:
+        child = pending.pop()
+        if isinstance(child, (ast.Yield, ast.YieldFrom)):
+            return True
+        if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            pending.extend(ast.iter_child_nodes(child))
+    return False
+
+
+def _assigns_settings(node: ast.AST) -> bool:
+    if isinstance(node, ast.Assign):
+        return any(isinstance(target, ast.Name) and target.id == "settings" for target in node.targets)
+    if isinstance(node, ast.AnnAssign):
+        return isinstance(node.target, ast.Name) and node.target.id == "settings"
+    return False
+
+
+def _imports(tree: ast.AST) -> List[str]:
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.partition(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.partition(".")[0])
+    return sorted(names)
+
+
+def scan_imports(source: bytes) -> List[str]:
+    """Modules the source imports; empty when it does not parse, the import reports that."""
+    try:
+        return _imports(ast.parse(source))
+    except (SyntaxError, ValueError):
+        return []
+
+
+def scan_source(module_name: str, source: bytes) -> ModuleManifest:
+    manifest = ModuleManifest(module_name)
+    tree = ast.parse(source)
+    manifest.imports = _imports(tree)
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name in HOOK_NAMES:
+                # setup()/teardown() are lifecycle hooks, not functions to run
+                continue
+            if node.decorator_list:
+                # A decorator may replace the function with anything
+                manifest.static = False
+            streaming = _yields(node)
+            manifest.functions.append(FunctionManifest(node.name, _parameters(node.args), streaming,
+                                                       isinstance(node, ast.AsyncFunctionDef) and not streaming))
+        elif isinstance(node, ast.ClassDef):
+            cls = _scan_class(node)
+            if cls is None:
+                manifest.static = False
+            else:
+                manifest.classes[cls.name] = cls
+        elif _assigns_settings(node):
+            settings = None
+            try:
+                if node.value is not None:
+                    settings = ast.literal_eval(node.value)
+                    # The manifest is persisted as JSON
+                    json.dumps(settings)
+            except (ValueError, TypeError):
+                settings = None
+            if isinstance(settings, dict):
+                manifest.settings = settings
+            else:
+                manifest.static = False
+        elif not isinstance(node, (ast.Import, ast.ImportFrom, ast.Expr, ast.Assign, ast.AnnAssign)):
+            # Functions or settings defined under if/try/for/with depend on runtime state
+            for child in ast.walk(node):
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) or \
+                        (isinstance(child, ast.Name) and child.id == "settings" and isinstance(child.ctx, ast.Store)):
+                    manifest.static = False
+                    break
+
+    # Parameters of resource types are known only once setup() has registered them
+    if any(isinstance(node, ast.Name) and node.id == "register_resource" or
+           isinstance(node, ast.Attribute) and node.attr == "register_resource" for node in ast.walk(tree)):
+        manifest.static = False
+    return manifest
+
+
+def scan_module(path: str) -> ModuleManifest:
+    stat = os.stat(path)
+    with open(path, "rb") as file:
+        source = file.read()
+    manifest = scan_source(os.path.splitext(os.path.basename(path))[0], source)
+    manifest.mtime_ns, manifest.size = stat.st_mtime_ns, stat.st_size
+    manifest.digest = hashlib.sha256(source).hexdigest()
+    return manifest
+
+
+def manifest_path(folder_path: str) -> str:
+    return os.path.join(folder_path, "__pycache__", MANIFEST_FILENAME)
+
+
+def load_manifest(folder_path: str) -> Dict[str, ModuleManifest]:
+    path = manifest_path(folder_path)
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return {filename: ModuleManifest.from_dict(module) for filename, module in data["modules"].items()}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def save_manifest(folder_path: str, manifests: Dict[str, ModuleManifest]):
+    path = manifest_path(folder_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {"version": MANIFEST_VERSION,
+            "modules": {filename: manifest.to_dict() for filename, manifest in manifests.items()}}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False)
@@ -0,0 +1,269 @@
+import asyncio
+import inspect
+import threading
+import typing
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Module lifecycle hooks and pooled resources injected into function parameters; imported by the
+# discovery, the worker processes and the CLI, so it must not import utils or PyQt6
+
+HOOK_NAMES = ("setup", "teardown")
+
+
+class ResourcePool:
+    """Instances of one resource type, created on demand up to size; callers wait when all are in use."""
+
+    def __init__(self, cls: type, factory: Optional[Callable[[], object]] = None, size: int = 4,
+                 close: Optional[Callable[[object], None]] = None, owner: Optional[str] = None):
+        self.cls = cls
+        self.factory = factory or cls
+        self.size = size
+        self.close_resource = close
+        # Module whose setup() registered the pool; it is closed after that module's teardown()
+        self.owner = owner
+        # Most recently released first, so the warmest instance is reused
+        self._idle: List[object] = []
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None):
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError(f"Resource pool of {self.cls.__name__} is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                if not self._condition.wait(timeout):
+                    raise TimeoutError(f"No {self.cls.__name__} available within {timeout} s")
+        # Created outside the lock; a slow connect does not hold up releases
+        try:
+            return self.factory()
+        except BaseException:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, resource):
+        with self._condition:
+            if not self._closed:
+                self._idle.append(resource)
+                self._condition.notify()
+                return
+            self._created -= 1
+        self._dispose(resource)
+
+    def close(self):
+        """Disposes the idle instances now and the leased ones as they come back."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._condition.notify_all()
+        for resource in idle:
+            self._dispose(resource)
+
+    def _dispose(self, resource):
+        if self.close_resource is not None:
+            self.close_resource(resource)
+
+
+_pools: Dict[type, ResourcePool] = {}
+_pools_lock = threading.Lock()
+# The module whose setup() is running on this thread
+_setting_up = threading.local()
+
+
+def register_resource(cls: type, factory: Optional[Callable[[], object]] = None, size: int = 4,
+                      close: Optional[Callable[[object], None]] = None) -> ResourcePool:
+    """Parameters annotated with cls receive a pooled instance instead of a value from the form.
+
+    Call it from a module's setup(); the pool is then closed after the module's teardown().
+    """
+    pool = ResourcePool(cls, factory, size, close, getattr(_setting_up, "module", None))
+    with _pools_lock:
+        previous = _pools.get(cls)
+        _pools[cls] = pool
+    if previous is not None:
+        previous.close()
+    return pool
+
+
+def resource_pool(annotation) -> Optional[ResourcePool]:
+    return _pools.get(annotation) if isinstance(annotation, type) else None
+
+
+def is_resource_annotation(annotation) -> bool:
+    return resource_pool(annotation) is not None
+
+
+# Module name -> the module object whose setup() ran; a reload brings a new object
+_set_up: Dict[str, object] = {}
+_set_up_lock = threading.Lock()
+
+
+def setup_module(module):
+    """Runs module.setup() once per loaded module object; a failing setup leaves the module unusable."""
+    with _set_up_lock:
+        if _set_up.get(module.__name__) is module:
+            return
+        _set_up[module.__name__] = module
+    hook = getattr(module, "setup", None)
+    if not callable(hook):
+        return
+    _setting_up.module = module.__name__
+    try:
+        hook()
+    except BaseException:
+        with _set_up_lock:
+            _set_up.pop(module.__name__, None)
+        _close_pools(module.__name__)
+        raise
+    finally:
+        _setting_up.module = None
+
+
+def teardown_module(module_name: str):
+    """Runs teardown() of a module set up before, then closes the pools it registered."""
+    with _set_up_lock:
+        module = _set_up.pop(module_name, None)
+    if module is None:
+        return
+    try:
+        hook = getattr(module, "teardown", None)
+        if callable(hook):
+            hook()
+    finally:
+        _close_pools(module_name)
+
+
+def teardown_all(on_error: Optional[Callable[[str, BaseException], None]] = None):
+    with _set_up_lock:
+        module_names = list(_set_up)
+    for module_name in module_names:
+        try:
+            teardown_module(module_name)
+        except Exception as e:
+            if on_error is not None:
+                on_error(module_name, e)
+
+
+def _close_pools(module_name: str):
+    with _pools_lock:
+        owned = [cls for cls, pool in _pools.items() if pool.owner == module_name]
+        pools = [_pools.pop(cls) for cls in owned]
+    for pool in pools:
+        pool.close()
+
+
+# Parameters of each function whose annotation is a class, looked up once per function object
+_class_parameters: "weakref.WeakKeyDictionary[Callable, Tuple[Tuple[str, type], ...]]" = weakref.WeakKeyDictionary()
+
+
+def _resource_parameters(func: Callable) -> List[Tuple[str, ResourcePool]]:
+    parameters = _class_parameters.get(func)
+    if parameters is None:
+        try:
+            hints = typing.get_type_hints(func)
+        except Exception:
+            hints = {}
+        parameters = []
+        for name, parameter in inspect.signature(func).parameters.items():
+            annotation = hints.get(name, parameter.annotation)
+            if isinstance(annotation, type):
+                parameters.append((name, annotation))
+        parameters = _class_parameters[func] = tuple(parameters)
+    return [(name, pool) for name, pool in ((name, resource_pool(cls)) for name, cls in parameters)
+            if pool is not None]
+
+
+def _acquire(resources: List[Tuple[str, ResourcePool]]) -> List[Tuple[str, ResourcePool, object]]:
+    leases = []
+    try:
+        for name, pool in resources:
+            leases.append((name, pool, pool.acquire()))
+    except BaseException:
+        _release(leases)
+        raise
+    return leases
+
+
+def _release(leases: List[Tuple[str, ResourcePool, object]]):
+    for _, pool, resource in leases:
+        pool.release(resource)
+
+
+def call_with_resources(func: Callable, params: dict):
+    """func(**params) plus a pooled instance for every resource parameter.
+
+    Instances go back to their pools when the call returns, or, for coroutines and generators, when
+    they finish or are closed.
+    """
+    resources = _resource_parameters(func)
+    if not resources:
+        return func(**params)
+    leases = _acquire(resources)
+    try:
+        result = func(**params, **{name: resource for name, _, resource in leases})
+    except BaseException:
+        _release(leases)
+        raise
+    if inspect.iscoroutine(result):
+        return _released_after_await(result, leases)
+    if inspect.isgenerator(result):
+        return _released_after_iteration(result, leases)
+    if inspect.isasyncgen(result):
+        return _released_after_async_iteration(result, leases)
+    _release(leases)
+    return result
+
+
+async def call_with_resources_async(func: Callable, params: dict):
+    """call_with_resources for a coroutine function, on an event loop: waiting for a pool does not block it."""
+    resources = _resource_parameters(func)
+    if not resources:
+        return await func(**params)
+    acquiring = asyncio.ensure_future(asyncio.to_thread(_acquire, resources))
+    try:
+        leases = await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        # The thread cannot be stopped; whatever it still gets from the pools goes straight back
+        acquiring.add_done_callback(_release_acquired)
+        raise
+    try:
+        return await func(**params, **{name: resource for name, _, resource in leases})
+    finally:
+        _release(leases)
+
+
+def _release_acquired(acquiring: "asyncio.Future"):
+    if not acquiring.cancelled() and acquiring.exception() is None:
+        _release(acquiring.result())
+
+
+async def _released_after_await(coroutine, leases):
+    try:
+        return await coroutine
+    finally:
+        _release(leases)
+
+
+def _released_after_iteration(generator, leases):
+    try:
+        yield from generator
+    finally:
+        _release(leases)
+
+
+async def _released_after_async_iteration(generator, leases):
+    try:
+        async for item in generator:
+            yield item
+    finally:
+        await generator.aclose()
+        _release(leases)
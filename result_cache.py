@@ -0,0 +1,204 @@
+import atexit
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from converters import KeyEncoder
+from entities import DynamicFunction
+from utils import print
+
+# Results of functions whose module settings declare "cache", keyed on their converted arguments
+
+
+class CachePolicy:
+    def __init__(self, max_entries: int = 128, max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 persist: bool = False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Seconds a result stays valid, None for no limit
+        self.ttl = ttl
+        self.persist = persist
+
+    @classmethod
+    def from_settings(cls, value) -> Optional["CachePolicy"]:
+        # "cache": True for the defaults, or a dict with any of the fields above
+        if value is True:
+            return cls()
+        if isinstance(value, dict):
+            return cls(max_entries=value.get("max_entries", 128), max_bytes=value.get("max_bytes"),
+                       ttl=value.get("ttl"), persist=value.get("persist", False))
+        return None
+
+
+class ResultCache:
+    """LRU cache of pickled results; a hit returns a fresh copy, so callers cannot change cached values."""
+
+    def __init__(self, name: str, policy: CachePolicy, module=None, persist_path: Optional[str] = None,
+                 source_digest: Optional[str] = None):
+        self.name = name
+        self.policy = policy
+        # The module object the results were computed with; a reload replaces it in sys.modules
+        self.module = module
+        self.persist_path = persist_path
+        # Persisted entries are only trusted for the module source they were computed with
+        self.source_digest = source_digest
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.dirty = False
+
+    @staticmethod
+    def key(params: dict) -> Optional[str]:
+        """Canonical hash of the converted arguments, None when they cannot be encoded."""
+        try:
+            encoded = KeyEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode(params)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, object]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.time():
+                self._remove(key)
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            blob = entry[1]
+        return True, pickle.loads(blob)
+
+    def put(self, key: str, result):
+        try:
+            blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Result of {self.name} cannot be cached: {e}", severity="DEBUG")
+            return
+        if self.policy.max_bytes is not None and len(blob) > self.policy.max_bytes:
+            return
+
+        expires_at = time.time() + self.policy.ttl if self.policy.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, blob)
+            self._bytes += len(blob)
+            self._evict()
+            self.dirty = True
+
+    def _remove(self, key: str):
+        _, blob = self._entries.pop(key)
+        self._bytes -= len(blob)
+
+    def _evict(self):
+        # Least recently used first
+        while self._entries and (len(self._entries) > self.policy.max_entries or
+                                 (self.policy.max_bytes is not None and self._bytes > self.policy.max_bytes)):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.dirty = True
+
+    def stats(self) -> str:
+        return (f"Cache: {self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+                f"{len(self._entries)} entries ({self._bytes / 1024:.1f} KB)")
+
+    def load(self):
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "rb") as f:
+                data = pickle.load(f)
+        except Exception as e:
+            print(f"Could not read result cache {self.persist_path}: {e}", severity="WARNING")
+            return
+        if data.get("digest") != self.source_digest:
+            print(f"Result cache of {self.name} dropped, the module changed.", severity="DEBUG")
+            return
+        now = time.time()
+        with self._lock:
+            for key, expires_at, blob in data.get("entries", []):
+                if expires_at is None or expires_at > now:
+                    self._entries[key] = (expires_at, blob)
+                    self._bytes += len(blob)
+            self._evict()
+        print(f"Loaded {len(self._entries)} cached results for {self.name}.", severity="DEBUG")
+
+    def save(self):
+        if not self.persist_path or not self.dirty:
+            return
+        with self._lock:
+            entries = [(key, expires_at, blob) for key, (expires_at, blob) in self._entries.items()]
+            self.dirty = False
+        try:
+            os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+            temporary_path = self.persist_path + ".tmp"
+            with open(temporary_path, "wb") as f:
+                pickle.dump({"digest": self.source_digest, "entries": entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.persist_path)
+        except OSError as e:
+            print(f"Could not write result cache {self.persist_path}: {e}", severity="WARNING")
+
+
+_caches: Dict[Tuple[str, str], ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def _source_digest(module) -> Tuple[Optional[str], Optional[str]]:
+    module_file = getattr(module, "__file__", None)
+    if not module_file:
+        return None, None
+    with open(module_file, "rb") as f:
+        return module_file, hashlib.sha256(f.read()).hexdigest()
+
+
+def cache_for(dynamic_function: DynamicFunction) -> Optional[ResultCache]:
+    """The function's cache; a reloaded module starts with an empty one (persisted results are kept only
+    if the module source is unchanged)."""
+    policy = CachePolicy.from_settings(dynamic_function.settings.cache)
+    if policy is None:
+        return None
+    identity = (dynamic_function.module_name, dynamic_function.name)
+    # The function has been loaded before it runs, so its module is imported
+    module = sys.modules.get(dynamic_function.module_name)
+    with _caches_lock:
+        cache = _caches.get(identity)
+        if cache is not None and cache.module is not module:
+            cache.save()
+            cache = None
+        if cache is None:
+            name = f"{dynamic_function.module_name}.{dynamic_function.name}"
+            persist_path = source_digest = None
+            if policy.persist:
+                module_file, source_digest = _source_digest(module)
+                if module_file:
+                    persist_path = os.path.join(os.path.dirname(module_file), "__pycache__", "result_cache",
+                                                f"{name}.pickle")
+            cache = _caches[identity] = ResultCache(name, policy, module, persist_path, source_digest)
+            cache.load()
+    return cache
+
+
+def save_caches():
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.save()
+
+
+atexit.register(save_caches)
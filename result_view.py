@@ -0,0 +1,120 @@
+import threading
+import traceback
+from typing import Iterator
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from converters import encode_to, is_structured, iter_encode
+from utils import print
+
+# A result is kept as the object; its text is produced in pieces off the GUI thread, never as one string
+
+PAGE_CHARS = 64 * 1024
+
+
+def result_chunks(result, indent=4) -> Iterator[str]:
+    """The result's display text in pieces: JSON for structured results, str() otherwise."""
+    if isinstance(result, str):
+        text = result
+    elif is_structured(result):
+        yield from iter_encode(result, indent)
+        return
+    else:
+        text = str(result)
+    for start in range(0, len(text), PAGE_CHARS):
+        yield text[start:start + PAGE_CHARS]
+
+
+def summarize(result, limit: int = 300) -> str:
+    """Type and the first `limit` characters of the compact text, for the log."""
+    pieces = []
+    size = 0
+    for chunk in result_chunks(result, indent=None):
+        pieces.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            break
+    text = " ".join("".join(pieces)[:limit * 2].split())
+    if size > limit or len(text) > limit:
+        text = text[:limit] + "..."
+    return f"{type(result).__name__}: {text}"
+
+
+class ResultRender(QObject):
+    """Encodes a result on a background thread and hands it to the GUI a page at a time, up to max_chars."""
+
+    page = pyqtSignal(str)
+    finished = pyqtSignal(int, bool)  # characters shown, whether the text was cut at max_chars
+    failed = pyqtSignal(str)
+
+    def __init__(self, result, max_chars: int):
+        super().__init__()
+        self.result = result
+        self.max_chars = max_chars
+        self._cancel = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._run, name="ResultRender", daemon=True).start()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _run(self):
+        pieces = []
+        pending = 0
+        shown = 0
+        truncated = False
+        try:
+            for chunk in result_chunks(self.result):
+                if self._cancel.is_set():
+                    return
+                if shown + pending + len(chunk) > self.max_chars:
+                    chunk = chunk[:self.max_chars - shown - pending]
+                    truncated = True
+                pieces.append(chunk)
+                pending += len(chunk)
+                if pending >= PAGE_CHARS or truncated:
+                    self.page.emit("".join(pieces))
+                    shown += pending
+                    pieces = []
+                    pending = 0
+                if truncated:
+                    break
+        except Exception as e:
+            print("".join(traceback.format_exception(None, e, e.__traceback__)), severity="ERROR")
+            self.failed.emit(str(e))
+            return
+        if pieces and not self._cancel.is_set():
+            self.page.emit("".join(pieces))
+            shown += pending
+        if not self._cancel.is_set():
+            self.finished.emit(shown, truncated)
+
+
+class ResultSave(QObject):
+    """Streams the whole result to a file on a background thread."""
+
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, result, path: str):
+        super().__init__()
+        self.result = result
+        self.path = path
+
+    def start(self):
+        threading.Thread(target=self._run, name="ResultSave", daemon=True).start()
+
+    def _run(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                if is_structured(self.result):
+                    encode_to(self.result, f)
+                else:
+                    f.write(self.result if isinstance(self.result, str) else str(self.result))
+        except Exception as e:
+            print(f"Could not save result to {self.path}: {e}", severity="ERROR")
+            self.failed.emit(str(e))
+            return
+        print(f"Result saved to {self.path}", severity="INFO")
+        self.finished.emit(self.path)
@@ -0,0 +1,158 @@
+import inspect
+import threading
+from typing import Dict, List, Optional, get_args, get_origin, get_type_hints
+
+PRIMAL_TYPES = {int, str, float, bool, list, dict, tuple, set}
+COLLECTION_TYPES = (list, tuple, set, dict)
+
+
+class ParameterSchema:
+    """One constructor parameter, classified once."""
+
+    __slots__ = ("name", "annotation", "type_name", "collection", "inner", "inner_name", "default")
+
+    def __init__(self, name: str, annotation, default=inspect.Parameter.empty):
+        self.name = name
+        self.annotation = annotation
+        self.type_name = getattr(annotation, '__name__', annotation)
+        self.default = default
+        self.collection = None
+        self.inner = None
+        self.inner_name = None
+
+        if hasattr(annotation, '__args__') and getattr(annotation, '__origin__', None) in COLLECTION_TYPES:
+            self.collection = annotation.__origin__
+            self.inner = annotation.__args__[0] if self.collection in (list, tuple, set) else annotation.__args__
+            self.inner_name = getattr(self.inner, '__name__', str(self.inner))
+
+    @property
+    def nested_class(self) -> Optional[type]:
+        """The class whose constructor is described inside this parameter, if any."""
+        if self.collection is not None:
+            if isinstance(self.inner, type) and self.inner not in PRIMAL_TYPES:
+                return self.inner
+            return None
+        if hasattr(self.annotation, '__args__'):
+            return None
+        if inspect.isclass(self.annotation) and self.annotation not in PRIMAL_TYPES:
+            return self.annotation
+        return None
+
+
+class FieldSchema:
+    """One class-level annotation as convert_to_class_instance sees it."""
+
+    __slots__ = ("name", "annotation", "origin", "args")
+
+    def __init__(self, name: str, annotation):
+        self.name = name
+        self.annotation = annotation
+        self.origin = get_origin(annotation)
+        self.args = get_args(annotation)
+
+
+class TypeSchema:
+    def __init__(self, cls: type):
+        self.cls = cls
+        self.module_name = getattr(cls, "__module__", None)
+        self.parameters: List[ParameterSchema] = []
+        self.fields: List[FieldSchema] = []
+        self.error: Optional[Exception] = None
+        # Compiled by converters.get_converter, dropped together with the schema
+        self.converter = None
+
+    def analyze(self):
+        annotations = getattr(self.cls, '__annotations__', {})
+        try:
+            # Resolves string forward references such as list["Node"]
+            type_hints = get_type_hints(self.cls)
+        except Exception:
+            type_hints = {}
+        for name, annotation in annotations.items():
+            self.fields.append(FieldSchema(name, type_hints.get(name, annotation)))
+
+        try:
+            ctor_sign = inspect.signature(self.cls.__init__)
+            type_hints = get_type_hints(self.cls.__init__)
+        except Exception as e:
+            self.error = e
+            return
+
+        for param_name, param in ctor_sign.parameters.items():
+            if param_name == "self":
+                continue
+            self.parameters.append(ParameterSchema(param_name, type_hints.get(param_name, "Unknown"), param.default))
+
+
+class SchemaRegistry:
+    """Analyzes each class once; entries are dropped when the class's module is reloaded."""
+
+    def __init__(self):
+        self._schemas: Dict[type, TypeSchema] = {}
+        self._descriptions: Dict[type, str] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Held while a class is analyzed; converters compile under it too."""
+        return self._lock
+
+    def get(self, cls: type) -> TypeSchema:
+        schema = self._schemas.get(cls)
+        if schema is not None:
+            return schema
+        with self._lock:
+            schema = self._schemas.get(cls)
+            if schema is None:
+                schema = TypeSchema(cls)
+                schema.analyze()
+                self._schemas[cls] = schema
+            return schema
+
+    def describe(self, cls: type) -> str:
+        """constructor_parameter_analyzer's text; a class that contains itself is shown as Name (...)."""
+        description = self._descriptions.get(cls)
+        if description is None:
+            description = self._describe(cls, ())
+            self._descriptions[cls] = description
+        return description
+
+    def _describe(self, cls: type, seen: tuple) -> str:
+        if seen and cls in self._descriptions:
+            return self._descriptions[cls]
+
+        schema = self.get(cls)
+        if schema.error is not None:
+            raise schema.error
+
+        seen = seen + (cls,)
+        constructor_parameters = []
+        for parameter in schema.parameters:
+            nested_class = parameter.nested_class
+            if nested_class is not None:
+                nested = "..." if nested_class in seen else self._describe(nested_class, seen)
+
+            if parameter.collection is not None:
+                inner = nested if nested_class is not None else parameter.inner_name
+                constructor_parameters.append(f"{parameter.name}: {parameter.collection.__name__}[{inner}]")
+            elif nested_class is not None:
+                constructor_parameters.append(f"{parameter.name}: {parameter.type_name} ({nested})")
+            else:
+                constructor_parameters.append(f"{parameter.name}: {parameter.type_name}")
+
+        return ", ".join(constructor_parameters) if constructor_parameters else "None"
+
+    def invalidate_module(self, module_name: str):
+        with self._lock:
+            for cls in [cls for cls, schema in self._schemas.items() if schema.module_name == module_name]:
+                del self._schemas[cls]
+            # Descriptions embed nested classes from other modules, rebuild them all
+            self._descriptions.clear()
+
+    def clear(self):
+        with self._lock:
+            self._schemas.clear()
+            self._descriptions.clear()
+
+
+schema_registry = SchemaRegistry()
@@ -1,7 +1,7 @@
-import json
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QFileDialog, QHBoxLayout
 
-from utils import load_settings, print
+from settings_store import get_settings_store
+from utils import print
 
 
 class SettingsWindow(QWidget):
@@ -13,14 +13,14 @@ class SettingsWindow(QWidget):
         self.initUI()
 
     def initUI(self):
+        store = get_settings_store()
         layout = QVBoxLayout()
 
         # Functions Path Section
         func_hbox = QHBoxLayout()
         self.path_label = QLabel("Functions Path:")
         func_hbox.addWidget(self.path_label)
-        self.path_input = QLineEdit(
-            load_settings("functions_path","examples"))
+        self.path_input = QLineEdit(store.functions_path)
         func_hbox.addWidget(self.path_input)
         select_folder_button = QPushButton("Select Folder")
         select_folder_button.clicked.connect(self.select_folder)
@@ -31,7 +31,7 @@ class SettingsWindow(QWidget):
         css_hbox = QHBoxLayout()
         self.css_label = QLabel("CSS File Path:")
         css_hbox.addWidget(self.css_label)
-        self.css_input = QLineEdit(load_settings("css_path", "style.css"))
+        self.css_input = QLineEdit(store.css_path)
         css_hbox.addWidget(self.css_input)
         select_css_button = QPushButton("Select File")
         select_css_button.clicked.connect(self.select_css_file)
@@ -42,8 +42,7 @@ class SettingsWindow(QWidget):
         log_folder_hbox = QHBoxLayout()
         self.log_folder_label = QLabel("Logs Folder Path:")
         log_folder_hbox.addWidget(self.log_folder_label)
-        self.log_folder_input = QLineEdit(
-            load_settings("log_folder", "logs"))
+        self.log_folder_input = QLineEdit(store.log_folder)
         log_folder_hbox.addWidget(self.log_folder_input)
         select_log_folder_button = QPushButton("Select Folder")
         select_log_folder_button.clicked.connect(self.select_log_folder)
@@ -84,14 +83,11 @@ class SettingsWindow(QWidget):
         css_path = self.css_input.text()
         log_folder_path = self.log_folder_input.text()
 
-        with open("settings.json", "w") as file:
-            json.dump({"functions_path": functions_path,
-                      "css_path": css_path,
-                       "log_folder": log_folder_path}, file)
+        # Only the keys edited here are replaced; subscribers react to what actually changed
+        get_settings_store().save({"functions_path": functions_path,
+                                   "css_path": css_path,
+                                   "log_folder": log_folder_path})
 
         print(f"Settings saved: Functions Path: {functions_path}, CSS Path: {css_path}, Log Folder: {log_folder_path}", severity="DEBUG")
 
-        # Refresh the parent window's functions
-        self.parent.reload()
-
         self.close()
@@ -0,0 +1,138 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_SETTINGS = {
+    "functions_path": "examples",
+    "css_path": "style.css",
+    "log_folder": "logs",
+    "log_caller": True
+}
+
+# Subscribers receive {key: (old_value, new_value)} for every key that changed
+SettingsCallback = Callable[[Dict[str, Tuple[object, object]]], None]
+
+
+class SettingsStore:
+    """Process-wide view of settings.json that only re-reads the file when it changes on disk."""
+
+    def __init__(self, path: str = "settings.json", check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._values: Dict[str, object] = {}
+        self._loaded = False
+        self._file_state: Optional[Tuple[int, int]] = None
+        self._checked_at = 0.0
+        self._lock = threading.RLock()
+        self._subscribers: List[Tuple[SettingsCallback, Optional[frozenset]]] = []
+
+    @property
+    def functions_path(self) -> str:
+        return self.get("functions_path", DEFAULT_SETTINGS["functions_path"])
+
+    @property
+    def css_path(self) -> str:
+        return self.get("css_path", DEFAULT_SETTINGS["css_path"])
+
+    @property
+    def log_folder(self) -> str:
+        return self.get("log_folder", DEFAULT_SETTINGS["log_folder"])
+
+    def get(self, key: str, default=None):
+        self._refresh()
+        return self._values.get(key, default)
+
+    def all(self) -> dict:
+        self._refresh()
+        return dict(self._values)
+
+    def save(self, values: dict):
+        """Merges values into the settings file and notifies subscribers right away."""
+        with self._lock:
+            self._refresh(force=True)
+            settings = dict(self._values)
+            settings.update(values)
+            with open(self.path, "w") as file:
+                json.dump(settings, file, indent=4)
+            changes = self._apply(settings)
+        self._notify(changes)
+
+    def reload(self):
+        self._refresh(force=True)
+
+    def subscribe(self, callback: SettingsCallback, keys: Optional[Iterable[str]] = None):
+        with self._lock:
+            self._subscribers.append((callback, frozenset(keys) if keys else None))
+
+    def unsubscribe(self, callback: SettingsCallback):
+        with self._lock:
+            self._subscribers = [(cb, keys) for cb, keys in self._subscribers if cb != callback]
+
+    def _refresh(self, force: bool = False):
+        now = time.monotonic()
+        if not force and self._file_state is not None and now - self._checked_at < self.check_interval:
+            return
+
+        with self._lock:
+            self._checked_at = now
+            created = self._ensure_file()
+            stat = os.stat(self.path)
+            file_state = (stat.st_mtime_ns, stat.st_size)
+            if file_state == self._file_state:
+                return
+
+            with open(self.path, "r") as file:
+                settings = json.load(file)
+            changes = self._apply(settings)
+
+        if created:
+            from utils import print
+            print("Settings file created with default values.")
+        self._notify(changes)
+
+    def _ensure_file(self) -> bool:
+        if os.path.exists(self.path):
+            return False
+        with open(self.path, "w") as file:
+            json.dump(DEFAULT_SETTINGS, file, indent=4)
+        return True
+
+    def _apply(self, settings: dict) -> Dict[str, Tuple[object, object]]:
+        stat = os.stat(self.path)
+        self._file_state = (stat.st_mtime_ns, stat.st_size)
+        old_values, self._values = self._values, settings
+        if not self._loaded:
+            # Nothing to compare against on the first read
+            self._loaded = True
+            return {}
+
+        changes = {}
+        for key in set(old_values) | set(settings):
+            old_value, new_value = old_values.get(key), settings.get(key)
+            if old_value != new_value:
+                changes[key] = (old_value, new_value)
+        return changes
+
+    def _notify(self, changes: Dict[str, Tuple[object, object]]):
+        if not changes:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, keys in subscribers:
+            relevant = changes if keys is None else {k: v for k, v in changes.items() if k in keys}
+            if relevant:
+                callback(relevant)
+
+
+_stores: Dict[str, SettingsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_settings_store(path: str = "settings.json") -> SettingsStore:
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SettingsStore(path)
+        return store
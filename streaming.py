@@ -0,0 +1,79 @@
+import inspect
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+from async_runner import get_async_loop
+from converters import encode_result
+
+# Generator and async generator functions: their items are consumed one at a time, off the GUI thread
+
+
+def is_stream(result) -> bool:
+    return inspect.isgenerator(result) or inspect.isasyncgen(result)
+
+
+def iter_stream(stream) -> Iterator:
+    """Items of a generator or async generator; closing this iterator closes the stream."""
+    if not inspect.isasyncgen(stream):
+        yield from stream
+        return
+    # An async generator steps on the shared loop, so it can await alongside the coroutine functions
+    loop = get_async_loop()
+    try:
+        while True:
+            try:
+                item = loop.run(stream.__anext__())
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        loop.run(stream.aclose())
+
+
+def display_line(item, line: str) -> str:
+    # Text items (progress messages) are shown as they are; the JSONL file always gets JSON
+    return item if isinstance(item, str) else line
+
+
+class StreamResult:
+    """What a streaming run returns once its generator is exhausted or stopped; the items are not kept."""
+
+    __slots__ = ("count", "output_path", "elapsed", "stopped")
+
+    def __init__(self, count: int, output_path: Optional[str], elapsed: float, stopped: bool):
+        self.count = count
+        self.output_path = output_path
+        self.elapsed = elapsed
+        self.stopped = stopped
+
+    def __str__(self):
+        written = f", written to {self.output_path}" if self.output_path else ""
+        stopped = " (stopped)" if self.stopped else ""
+        return f"{self.count} items in {self.elapsed:.1f} s{written}{stopped}"
+
+
+def consume_stream(stream, on_line: Callable[[str], None], output_path: Optional[str] = None,
+                   stop: Optional[threading.Event] = None) -> StreamResult:
+    """Encodes each item once, as a JSON line; on_line gets the text to show, output_path the JSON Lines."""
+    start = time.perf_counter()
+    items = iter_stream(stream)
+    count = 0
+    stopped = False
+    out = open(output_path, "w", encoding="utf-8") if output_path else None
+    try:
+        for item in items:
+            line = encode_result(item, indent=None)
+            if out is not None:
+                out.write(line)
+                out.write("\n")
+            on_line(display_line(item, line))
+            count += 1
+            if stop is not None and stop.is_set():
+                stopped = True
+                break
+    finally:
+        items.close()
+        if out is not None:
+            out.close()
+    return StreamResult(count, output_path, time.perf_counter() - start, stopped)
@@ -0,0 +1,41 @@
+import json
+
+from batch import run_batch
+from entities import DynamicFunction, DynamicSettings
+
+
+def halve(x: int) -> float:
+    if x < 0:
+        raise ValueError("negative")
+    return x / 2
+
+
+LINES = ['{"x": 4}', '', '{"x": -1}', 'not json', '{"x": 10}', '[1]', '{"x": "8"}']
+
+
+def run(tmp_path, workers: int):
+    input_path, output_path = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    input_path.write_text("\n".join(LINES) + "\n")
+    state = run_batch(DynamicFunction(halve, DynamicSettings("halve")), str(input_path), str(output_path),
+                      workers=workers, chunk_size=2, mode="thread")
+    return state, [json.loads(line) for line in output_path.read_text().splitlines()]
+
+
+def test_every_line_gets_a_result_or_an_error(tmp_path):
+    state, records = run(tmp_path, workers=4)
+    assert (state.done, state.failed) == (6, 3)
+    by_line = {record["line"]: record for record in records}
+    # Line numbers count the blank line, so they point into the input file
+    assert sorted(by_line) == [1, 3, 4, 5, 6, 7]
+    assert by_line[1] == {"line": 1, "result": 2.0}
+    assert by_line[3] == {"line": 3, "error": "ValueError: negative"}
+    assert by_line[4]["error"].startswith("JSONDecodeError")
+    assert by_line[5] == {"line": 5, "result": 5.0}
+    assert by_line[6]["error"].startswith("ParameterError")
+    # Values are converted as the tab converts typed text
+    assert by_line[7] == {"line": 7, "result": 4.0}
+
+
+def test_one_worker_keeps_input_order(tmp_path):
+    _, records = run(tmp_path, workers=1)
+    assert [record["line"] for record in records] == [1, 3, 4, 5, 6, 7]
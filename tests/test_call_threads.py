@@ -0,0 +1,34 @@
+import threading
+
+from call_threads import CallThreads
+
+
+def test_abandoned_call_frees_its_slot():
+    threads = CallThreads(1)
+    release = threading.Event()
+    hung = threads.submit(release.wait)
+    queued = threads.submit(lambda: 42)
+    try:
+        assert not queued.done()
+        threads.abandon(hung)
+        assert queued.result(timeout=5) == 42
+        assert threads.abandoned == 1
+    finally:
+        release.set()
+    assert hung.result(timeout=5) is True
+    assert threads.abandoned == 0
+    # The hung thread's return does not give back a slot twice
+    assert threads.submit(lambda: 1).result(timeout=5) == 1
+
+
+def test_cancelled_while_queued_never_runs():
+    threads = CallThreads(1)
+    release = threading.Event()
+    running = threads.submit(release.wait)
+    ran = []
+    queued = threads.submit(ran.append, 1)
+    assert queued.cancel()
+    release.set()
+    running.result(timeout=5)
+    assert threads.submit(lambda: 2).result(timeout=5) == 2
+    assert ran == []
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_cli(*args):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "cli.py"), *args], cwd=ROOT,
+                          capture_output=True, text=True, timeout=60)
+
+
+def test_broken_module_is_a_logged_failure(tmp_path):
+    (tmp_path / "broken.py").write_text("import missing_dependency_xyz\n\n\ndef f(x: int):\n    return x\n")
+    (tmp_path / "bad_setup.py").write_text("def setup():\n    raise RuntimeError('no database')\n\n\n"
+                                           "def g(x: int):\n    return x\n")
+    (tmp_path / "lines.jsonl").write_text('{"x": 1}\n')
+
+    for args in (("run", "f", "-a", "x=3"), ("run", "g", "-a", "x=3"),
+                 ("batch", "f", str(tmp_path / "lines.jsonl"), str(tmp_path / "out.jsonl"))):
+        completed = run_cli("--functions", str(tmp_path), *args)
+        assert completed.returncode == 1, completed.stderr
+        assert "Traceback" not in completed.stderr
+        assert f"Could not load {args[1]}" in completed.stderr
@@ -0,0 +1,51 @@
+import threading
+from typing import List
+
+import converters
+from converters import get_converter
+
+
+class Leaf:
+    name: str
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class Node:
+    leaf: Leaf
+    children: List["Node"]
+
+    def __init__(self, leaf: Leaf, children: List["Node"] = ()):
+        self.leaf = leaf
+        self.children = children
+
+
+def test_first_conversion_from_several_threads(monkeypatch):
+    compile_class = converters._compile
+
+    def slow_compile(cls, fields):
+        # Keeps the first thread compiling while the others arrive
+        threading.Event().wait(0.05)
+        return compile_class(cls, fields)
+
+    monkeypatch.setattr(converters, "_compile", slow_compile)
+    data = {"leaf": {"name": "root"}, "children": [{"leaf": {"name": "child"}}]}
+    barrier = threading.Barrier(4)
+    results, errors = [], []
+
+    def convert():
+        barrier.wait()
+        try:
+            results.append(get_converter(Node)(data))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=convert) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [node.children[0].leaf.name for node in results] == ["child"] * 4
@@ -0,0 +1,91 @@
+import os
+import sys
+
+import pytest
+
+from utils import FunctionDiscovery
+
+MODULE = "hot_reload_sample"
+
+
+def test_same_second_same_size_edit_is_reimported(tmp_path, monkeypatch):
+    # Bytecode is written and read as in a normal run
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    path = tmp_path / f"{MODULE}.py"
+    path.write_text("def value() -> int:\n    return 5\n")
+    stat = os.stat(path)
+    discovery = FunctionDiscovery(str(tmp_path))
+    try:
+        functions = discovery.discover()
+        assert functions[0].func() == 5
+
+        # Saved again within the same second at the same size
+        path.write_text("def value() -> int:\n    return 6\n")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        functions = discovery.discover()
+        assert functions[0].func() == 6
+    finally:
+        sys.modules.pop(MODULE, None)
+        sys.path.remove(str(tmp_path))
+
+
+@pytest.fixture
+def functions_folder(tmp_path):
+    yield tmp_path
+    for path in tmp_path.glob("*.py"):
+        sys.modules.pop(path.stem, None)
+    if str(tmp_path) in sys.path:
+        sys.path.remove(str(tmp_path))
+
+
+def write_module(folder, name: str, source: str):
+    (folder / f"{name}.py").write_text(source)
+
+
+def test_parallel_discovery_reimports_only_the_changed_module(functions_folder):
+    for index in range(4):
+        write_module(functions_folder, f"parallel_{index}", f"def value_{index}() -> int:\n    return {index}\n")
+    discovery = FunctionDiscovery(str(functions_folder), workers=2)
+    first = {function.name: function for function in discovery.discover()}
+    assert {name: function.func() for name, function in first.items()} == {f"value_{i}": i for i in range(4)}
+
+    write_module(functions_folder, "parallel_1", "def value_1() -> int:\n    return 100\n")
+    second = {function.name: function for function in discovery.discover()}
+    assert second["value_1"].func() == 100
+    # Unchanged modules keep their function objects
+    assert all(second[name] is first[name] for name in ("value_0", "value_2", "value_3"))
+
+
+def test_lazy_discovery_imports_on_first_run_and_rescans_edits(functions_folder):
+    write_module(functions_folder, "lazy_sample", "def greet(name: str) -> str:\n    return 'hi ' + name\n")
+    functions = FunctionDiscovery(str(functions_folder), lazy=True).discover()
+    assert "lazy_sample" not in sys.modules
+    assert list(functions[0].signature.parameters) == ["name"]
+    assert functions[0].func("a") == "hi a"
+    assert "lazy_sample" in sys.modules
+
+    # The next start registers the function from the persisted manifest, without importing it
+    sys.modules.pop("lazy_sample")
+    functions = FunctionDiscovery(str(functions_folder), lazy=True).discover()
+    assert "lazy_sample" not in sys.modules
+    assert list(functions[0].signature.parameters) == ["name"]
+
+    # An edited file no longer matches its manifest entry and is scanned again
+    write_module(functions_folder, "lazy_sample", "def greet(name: str, punctuation: str) -> str:\n"
+                                                  "    return 'hi ' + name + punctuation\n")
+    functions = FunctionDiscovery(str(functions_folder), lazy=True).discover()
+    assert "lazy_sample" not in sys.modules
+    assert list(functions[0].signature.parameters) == ["name", "punctuation"]
+    assert functions[0].func("a", "!") == "hi a!"
+
+
+def test_module_importing_a_changed_one_is_reimported_after_it(functions_folder):
+    write_module(functions_folder, "reload_base", "LIMIT = 1\n")
+    write_module(functions_folder, "reload_user", "from reload_base import LIMIT\n\n\n"
+                                                  "def limit() -> int:\n    return LIMIT\n")
+    discovery = FunctionDiscovery(str(functions_folder))
+    assert discovery.discover()[0].func() == 1
+
+    # Only the base module changed; its importer still holds the old value until it is imported again
+    write_module(functions_folder, "reload_base", "LIMIT = 250\n")
+    assert discovery.discover()[0].func() == 250
@@ -0,0 +1,71 @@
+import dataclasses
+import json
+from typing import Dict, List
+
+import pytest
+
+from json_stream import JsonStreamReader, iter_file, load_file
+from utils import convert_to_class_instance
+
+
+@dataclasses.dataclass
+class Item:
+    name: str
+    price: float
+    tags: List[str]
+
+
+@dataclasses.dataclass
+class Order:
+    number: int
+    items: List[Item]
+    totals: Dict[str, Item]
+    note: str
+
+
+ORDERS = [
+    {"number": 3000, "note": "long " * 40 + "\"quoted\" çğ\n\ttext",
+     "items": [{"name": "a\\b", "price": 3000.0, "tags": ["x", "y"]},
+               {"name": "ü", "price": -1e+5, "tags": []}],
+     "totals": {"key with \"escape\"": {"name": "t", "price": 12.5e-3, "tags": ["z"]}},
+     "ignored": {"deep": [1, 2.25, {"e": 1E10}]}},
+    {"number": -7, "note": "", "items": [], "totals": {}, "ignored": 123456789.125},
+]
+
+# Chunk sizes cut numbers, escapes and keys at every position
+CHUNK_SIZES = [1, 2, 3, 5, 7, 16, 1 << 16]
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_load_file_matches_json_loads(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(JsonStreamReader, "CHUNK_SIZE", chunk_size)
+    # Escaped and raw non-ASCII text, compact and indented
+    for indent, ensure_ascii in ((None, True), (2, False)):
+        path = tmp_path / "orders.json"
+        text = json.dumps(ORDERS, indent=indent, ensure_ascii=ensure_ascii)
+        path.write_text(text, encoding="utf-8")
+
+        expected = [convert_to_class_instance(Order, order) for order in json.loads(text)]
+        assert load_file(str(path), List[Order]) == expected
+        assert list(iter_file(str(path), Order)) == expected
+        assert load_file(str(path)) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_numbers_at_the_end_of_a_chunk(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(JsonStreamReader, "CHUNK_SIZE", chunk_size)
+    text = "[3000.0, 1e+5, -0.5, 12345678901234567890, 7]"
+    path = tmp_path / "numbers.json"
+    path.write_text(text)
+    assert load_file(str(path)) == json.loads(text)
+    assert list(iter_file(str(path))) == json.loads(text)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_escaped_keys_of_a_class(tmp_path, monkeypatch, chunk_size):
+    monkeypatch.setattr(JsonStreamReader, "CHUNK_SIZE", chunk_size)
+    # Keys with escapes take the scanstring path instead of SIMPLE_KEY
+    text = '{"n\\u0061me" : "a", "price":1.5 , "t\\u0061gs":["\\"x\\""], "other\\n": null}'
+    path = tmp_path / "item.json"
+    path.write_text(text)
+    assert load_file(str(path), Item) == convert_to_class_instance(Item, json.loads(text))
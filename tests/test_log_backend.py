@@ -0,0 +1,49 @@
+import datetime
+import threading
+import time
+
+from log_backend import LogRecord, LogTail, LogWriter, log_file_path
+
+
+class SlowSink:
+    def __init__(self):
+        self.records = []
+
+    def write_batch(self, records):
+        time.sleep(0.2)
+        self.records.extend(records)
+
+    def close(self):
+        pass
+
+
+def test_flush_async_returns_at_once_and_calls_back_after_the_queued_records(tmp_path):
+    sink = SlowSink()
+    writer = LogWriter(lambda: str(tmp_path), batch_size=1, sinks=[sink])
+    try:
+        for number in range(3):
+            writer.write(LogRecord(datetime.datetime.now(), "INFO", "test.py", number, f"record {number}"))
+        flushed = threading.Event()
+        stored = []
+
+        start = time.perf_counter()
+        writer.flush_async(lambda: (stored.append(len(sink.records)), flushed.set()))
+        assert time.perf_counter() - start < 0.1
+
+        assert flushed.wait(5)
+        assert stored == [3]
+    finally:
+        writer.close()
+
+
+def test_tail_returns_complete_lines_with_their_offset(tmp_path):
+    tail = LogTail(lambda: str(tmp_path), initial_bytes=None)
+    path = log_file_path(str(tmp_path), datetime.datetime.now())
+    with open(path, "wb") as f:
+        f.write(b"first\nsec")
+    assert tail.poll_bytes() == (True, 0, [b"first"])
+    with open(path, "ab") as f:
+        f.write(b"ond\nthird\n")
+    # The line cut at the end of the last poll starts where it did in the file
+    assert tail.poll_bytes() == (False, 6, [b"second", b"third"])
+    assert tail.poll_bytes() == (False, 19, [])
@@ -0,0 +1,51 @@
+import datetime
+
+import pytest
+
+from log_backend import LogRecord
+from log_store import LogStore
+
+NOW = datetime.datetime.now().replace(microsecond=0)
+
+
+def record(minutes_ago: int, severity: str, filename: str, text: str) -> LogRecord:
+    return LogRecord(NOW - datetime.timedelta(minutes=minutes_ago), severity, filename, 1, text)
+
+
+@pytest.fixture(params=[False, True], ids=["like", "full_text"])
+def store(tmp_path, request):
+    store = LogStore(lambda: str(tmp_path / "logs.sqlite3"), full_text_index=request.param)
+    store.write_batch([
+        record(50, "INFO", "ui.py", "Starting the application"),
+        record(40, "ERROR", "executor.py", "Run of siparis_isle failed: 50% done"),
+        record(30, "DEBUG", "utils.py", "Discovery finished"),
+        record(20, "WARNING", "executor.py", "Run of siparis_isle stopped: Timed out"),
+        record(10, "ERROR", "utils.py", "Error importing module broken"),
+    ])
+    yield store
+    store.close()
+
+
+def texts(records):
+    return [record.text for record in records]
+
+
+def test_filters_combine(store):
+    assert texts(store.query(severities=["ERROR", "WARNING"], source="executor.py")) == [
+        "Run of siparis_isle failed: 50% done", "Run of siparis_isle stopped: Timed out"]
+    assert texts(store.query(since=NOW - datetime.timedelta(minutes=35),
+                             until=NOW - datetime.timedelta(minutes=15))) == [
+        "Discovery finished", "Run of siparis_isle stopped: Timed out"]
+    assert store.query(severities=[]) == []
+    assert store.sources() == ["executor.py", "ui.py", "utils.py"]
+
+
+def test_text_search_and_limit(store):
+    # Case-insensitive substring; % is taken literally
+    assert texts(store.query(text="SIPARIS")) == ["Run of siparis_isle failed: 50% done",
+                                                  "Run of siparis_isle stopped: Timed out"]
+    assert texts(store.query(text="50%")) == ["Run of siparis_isle failed: 50% done"]
+    # The newest records, oldest first
+    newest = store.query(limit=2)
+    assert texts(newest) == ["Run of siparis_isle stopped: Timed out", "Error importing module broken"]
+    assert (newest[1].severity, newest[1].filename) == ("ERROR", "utils.py")
@@ -0,0 +1,34 @@
+import asyncio
+
+from resources import _pools, call_with_resources_async, register_resource
+
+
+class Connection:
+    pass
+
+
+async def query(connection: Connection):
+    return connection
+
+
+def test_cancel_while_acquiring_returns_the_instance():
+    pool = register_resource(Connection, size=1)
+    try:
+        async def scenario():
+            held = pool.acquire()
+            waiting = asyncio.ensure_future(call_with_resources_async(query, {}))
+            await asyncio.sleep(0.1)
+            waiting.cancel()
+            await asyncio.sleep(0)
+            # The acquiring thread gets the instance only now, after its caller was cancelled
+            pool.release(held)
+            try:
+                return await asyncio.wait_for(call_with_resources_async(query, {}), timeout=5)
+            finally:
+                # Wakes a thread still waiting on the pool, so a leaked instance fails the test instead of hanging it
+                pool.close()
+
+        assert asyncio.run(scenario()) is not None
+    finally:
+        pool.close()
+        _pools.pop(Connection, None)
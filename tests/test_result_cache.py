@@ -0,0 +1,54 @@
+import time
+import uuid
+
+from result_cache import CachePolicy, ResultCache
+
+
+def test_iterator_arguments_have_no_key():
+    # Iterators only encode as their address, which the next one may reuse
+    first = ResultCache.key({"items": iter([1, 2, 3])})
+    second = ResultCache.key({"items": iter([5])})
+    assert first is None and second is None
+    assert ResultCache.key({"items": (item for item in [1])}) is None
+
+
+def test_plain_arguments_have_a_key():
+    identifier = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    assert ResultCache.key({"a": 1, "b": [1, 2]}) == ResultCache.key({"b": [1, 2], "a": 1})
+    assert ResultCache.key({"a": 1}) != ResultCache.key({"a": 2})
+    # Library types are shown with str(), which is not trusted as a key
+    assert ResultCache.key({"id": identifier}) is None
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ResultCache("lru", CachePolicy(max_entries=2))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1) and cache.get("c") == (True, 3)
+    assert cache.evictions == 1
+
+
+def test_byte_limit_and_expiry(monkeypatch):
+    cache = ResultCache("bytes", CachePolicy(max_bytes=300, ttl=10))
+    cache.put("big", "x" * 1000)
+    # Larger than the whole cache: never stored
+    assert cache.get("big") == (False, None)
+    cache.put("a", "x" * 100)
+    cache.put("b", "y" * 100)
+    cache.put("c", "z" * 100)
+    assert cache.get("a") == (False, None)
+    assert cache.get("c") == (True, "z" * 100)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("c") == (False, None)
+
+
+def test_hit_is_a_copy():
+    cache = ResultCache("copy", CachePolicy())
+    cache.put("key", {"items": [1]})
+    cache.get("key")[1]["items"].append(2)
+    assert cache.get("key") == (True, {"items": [1]})
@@ -0,0 +1,35 @@
+import dataclasses
+import os
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+from converters import add_function_folder, encode_result, is_structured
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Order:
+    def __init__(self, number: int):
+        self.number = number
+
+
+def test_library_types_are_shown_as_text():
+    identifier = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    for value in (identifier, Path("data") / "orders.json", Decimal("12.50")):
+        assert not is_structured(value)
+        assert encode_result({"value": value}, indent=None) == f'{{"value": "{value}"}}'
+
+
+def test_dataclasses_and_function_module_classes_are_structured():
+    assert is_structured(Point(1, 2))
+    assert encode_result(Point(1, 2), indent=None) == '{"x": 1, "y": 2}'
+
+    assert not is_structured(Order(7))
+    add_function_folder(os.path.dirname(os.path.abspath(__file__)))
+    assert is_structured(Order(7))
+    assert encode_result(Order(7), indent=None) == '{"number": 7}'
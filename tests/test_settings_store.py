@@ -0,0 +1,28 @@
+import json
+import os
+
+from settings_store import SettingsStore
+
+
+def test_file_is_read_again_only_when_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps({"functions_path": "examples", "stream_fps": 20}))
+    store = SettingsStore(str(path), check_interval=0)
+    changes = []
+    store.subscribe(changes.append, keys=["stream_fps"])
+    assert store.get("stream_fps") == 20
+
+    reads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda file: reads.append(file.name) or real_load(file))
+    assert store.get("stream_fps") == 20
+    assert reads == []
+
+    stat = os.stat(path)
+    path.write_text(json.dumps({"functions_path": "other", "stream_fps": 30}))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert store.get("stream_fps") == 30
+    assert store.functions_path == "other"
+    assert len(reads) == 1
+    # Subscribers only hear about the keys they asked for
+    assert changes == [{"stream_fps": (20, 30)}]
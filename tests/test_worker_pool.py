@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import time
+
+from worker_pool import WorkerPool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_drain_lets_running_calls_finish(tmp_path):
+    (tmp_path / "slow_module.py").write_text("import time\n\n\ndef slow(seconds: float):\n"
+                                             "    time.sleep(seconds)\n    return 'done'\n")
+    pool = WorkerPool(str(tmp_path), ["slow_module"], 2)
+    workers = [pool._idle.queue[0], pool._idle.queue[1]]
+    try:
+        call = pool.submit("slow_module", "slow", {"seconds": 1.0})
+        # The call is on its worker before the pool is retired
+        deadline = time.monotonic() + 30
+        while call.worker is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pool.drain()
+        assert call.future.result(timeout=30) == "done"
+        for worker in workers:
+            worker.process.join(10)
+            # Stopped, not killed
+            assert worker.process.exitcode == 0
+    finally:
+        pool.shutdown()
+
+
+WORKER_SCRIPT = """
+import os, sys
+sys.path.insert(0, {root!r})
+# Spawned workers run the parent's main file first, as the GUI's workers run main.pyw
+sys.modules["__main__"].__file__ = os.path.join({root!r}, "main.pyw")
+from worker_pool import WorkerPool
+pool = WorkerPool({folder!r}, ["probe_module"], 1)
+try:
+    print(pool.submit("probe_module", "loaded", {{}}).future.result(timeout=60))
+finally:
+    pool.shutdown()
+"""
+
+
+def test_workers_do_not_import_the_gui(tmp_path):
+    (tmp_path / "probe_module.py").write_text(
+        "import sys\n\n\ndef loaded():\n"
+        "    return [name for name in ('PyQt6', 'ui', 'utils', 'log_store') if name in sys.modules]\n")
+    completed = subprocess.run([sys.executable, "-c", WORKER_SCRIPT.format(root=ROOT, folder=str(tmp_path))],
+                               capture_output=True, text=True, timeout=120)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().splitlines()[-1] == "[]"
@@ -1,25 +1,29 @@
+from collections import OrderedDict
 from enum import Enum
+from typing import Dict
 import sys
 from PyQt6.QtWidgets import QComboBox
-import inspect
-import json
 import os
-import traceback
-import re
 
 from entities import DynamicFunction
 from logs import LogsScreen
 from settings import SettingsWindow
-from utils import convert_to_serializable, get_all_functions, load_settings, print
+from settings_store import get_settings_store
+from executor import BatchRun, FunctionExecutor
+from function_palette import FunctionListModel, function_key
+from resources import is_resource_annotation
+from result_view import ResultRender, ResultSave, summarize
+from streaming import StreamResult
+from utils import ParameterError, convert_parameters, get_all_functions, print
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QTabWidget, QFormLayout, QLineEdit, QTextEdit, QPushButton, QLabel, QToolTip, QMainWindow
+    QWidget, QVBoxLayout, QFormLayout, QLineEdit, QTextEdit, QPushButton, QLabel, QToolTip, QMainWindow, QCheckBox
 )
-from utils import constructor_parameter_analyzer, convert_to_class_instance, print
-from PyQt6.QtGui import QFont, QCursor, QIcon
-from PyQt6.QtCore import Qt
+from utils import constructor_parameter_analyzer, print
+from PyQt6.QtGui import QFont, QCursor, QFontDatabase, QIcon, QTextCursor
+from PyQt6.QtCore import QFileSystemWatcher, Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFontMetrics
-from PyQt6.QtWidgets import QFileDialog, QHBoxLayout
+from PyQt6.QtWidgets import QFileDialog, QHBoxLayout, QListView, QPlainTextEdit, QSplitter, QStackedWidget
 from PyQt6.QtGui import QAction
 
 
@@ -58,45 +62,51 @@ class HoverLabel(QLabel):
         return "\n".join(wrapped_lines)
 
 
-class DynamicFunctionUI(QWidget):
-    def __init__(self, functions):
+class FunctionTab(QWidget):
+    running_changed = pyqtSignal(bool)
+
+    def __init__(self, dynamic_function: DynamicFunction, executor: FunctionExecutor):
         super().__init__()
-        self.functions = functions
+        self.dynamic_function = dynamic_function
+        self.executor = executor
+        self.param_inputs = {}
+        self.run = None
+        # The last result as returned, for Save result...; its text is rendered in pages
+        self.result = None
+        self.render = None
+        self.save = None
+        self.form_key = self.form_key_of(dynamic_function)
         self.initUI()
 
-    def initUI(self):
-        layout = QVBoxLayout()
-        self.tabs = QTabWidget()
-        self.refresh_tabs()
-        layout.addWidget(self.tabs)
-        self.setLayout(layout)
-
-    def refresh_tabs(self):
-        # Clear existing tabs
-        while self.tabs.count() > 0:
-            self.tabs.removeTab(0)
-
-        # Add new tabs for each function
-        for func in self.functions:
-            self.add_function_tab(func)
-
-    def update_functions(self, new_functions):
-        print("Updating functions...", severity="DEBUG")
-        self.functions = new_functions
-        self.refresh_tabs()
-
-
-    def add_function_tab(self, dynamic_function: DynamicFunction):
-        if not dynamic_function.settings.enabled:
-            return
+    @staticmethod
+    def form_key_of(dynamic_function: DynamicFunction) -> tuple:
+        """Everything the form is built from; a reloaded function with the same key keeps its tab as is."""
+        parameters = []
+        for param_name, param in dynamic_function.signature.parameters.items():
+            annotation = param.annotation
+            if is_resource_annotation(annotation):
+                continue
+            detail = None
+            if isinstance(annotation, type) and issubclass(annotation, Enum):
+                detail = tuple((member.name, member.value) for member in annotation)
+            elif hasattr(annotation, '__name__') and annotation not in {int, str, float, bool}:
+                try:
+                    detail = constructor_parameter_analyzer(annotation)
+                except Exception as e:
+                    detail = str(e)
+            parameters.append((param_name, getattr(annotation, '__name__', str(annotation)), detail))
+        # A generator function gets the item view and the file control
+        return (dynamic_function.settings.description, tuple(parameters), dynamic_function.streaming,
+                dynamic_function.coroutine)
 
-        tab = QWidget()
+    def initUI(self):
         form_layout = QFormLayout()
 
-        func = dynamic_function.func
+        # Reading the signature does not import a lazily discovered function
+        dynamic_function = self.dynamic_function
         settings = dynamic_function.settings
-        sig = inspect.signature(func)
-        param_inputs = {}
+        sig = dynamic_function.signature
+        param_inputs = self.param_inputs
 
         # Add settings information to the tab header
         if settings.description:
@@ -104,10 +114,21 @@ class DynamicFunctionUI(QWidget):
             tab_header.setStyleSheet("font-weight: bold;")
             form_layout.addRow(tab_header)
 
+        # Why the module's newer source is not the one running
+        self.load_error_label = QLabel()
+        self.load_error_label.setWordWrap(True)
+        self.load_error_label.setStyleSheet("color: #c0392b;")
+        form_layout.addRow(self.load_error_label)
+        self.show_load_error(dynamic_function.load_error)
+
         for param_name, param in sig.parameters.items():
             input_field = None
             param_type = param.annotation
 
+            # Filled from the resource's pool when the function runs
+            if is_resource_annotation(param_type):
+                continue
+
             if param_type == bool:  # Handle boolean type parameter
                 input_field = QComboBox()
                 input_field.addItem("True", True)
@@ -140,7 +161,8 @@ class DynamicFunctionUI(QWidget):
                 form_layout.addRow(label, hbox)
 
             else:
-                if param_type in [dict, list, tuple, set] or (hasattr(param_type, '__name__') and param_type not in {int, str, float, bool}):
+                json_input = param_type in [dict, list, tuple, set] or (hasattr(param_type, '__name__') and param_type not in {int, str, float, bool})
+                if json_input:
                     input_field = QTextEdit()
                     input_field.setFixedHeight(80)
                 elif param_type == str and "multi_line" in param_name.lower():
@@ -150,7 +172,19 @@ class DynamicFunctionUI(QWidget):
                     input_field = QLineEdit()
 
                 label = HoverLabel(f"{param_name} ({param.annotation.__name__ if param.annotation != param.empty else 'Any'})", '')
-                form_layout.addRow(label, input_field)
+                if json_input:
+                    # Büyük JSON girdileri metin kutusuna yüklenmez; "@yol" dosyadan akışla okunur
+                    file_button = QPushButton("Dosya Seç")
+                    file_button.setToolTip("Read this parameter from a JSON file while the function runs")
+                    file_button.clicked.connect(
+                        lambda _, field=input_field: self.select_json_file(field))
+
+                    hbox = QHBoxLayout()
+                    hbox.addWidget(input_field)
+                    hbox.addWidget(file_button)
+                    form_layout.addRow(label, hbox)
+                else:
+                    form_layout.addRow(label, input_field)
 
             # Handle additional types for class instances
             if param_type is not None and hasattr(param_type, '__name__'):
@@ -159,21 +193,50 @@ class DynamicFunctionUI(QWidget):
 
             param_inputs[param_name] = input_field
 
-        # Result field and Run button
-        run_button = QPushButton("Run")
-        result_field = QTextEdit()
-        result_field.setAlignment(Qt.AlignmentFlag.AlignTop)
-        result_field.setMaximumHeight(500)
-        result_field.setReadOnly(True)
-
-        run_button.clicked.connect(lambda: self.run_function(
-            func, param_inputs, result_field))
-
-        form_layout.addRow(run_button)
-        form_layout.addRow(result_field)
-
-        tab.setLayout(form_layout)
-        self.tabs.addTab(tab, dynamic_function.settings.name)
+        # Result field, Run and Cancel buttons
+        button_layout = QHBoxLayout()
+        self.run_button = QPushButton("Run")
+        self.run_button.clicked.connect(self.run_function)
+        button_layout.addWidget(self.run_button)
+        self.batch_button = QPushButton("Batch...")
+        self.batch_button.setToolTip("Run once per line of a JSON Lines file of parameter values")
+        self.batch_button.clicked.connect(self.run_batch)
+        button_layout.addWidget(self.batch_button)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_function)
+        button_layout.addWidget(self.cancel_button)
+        self.save_button = QPushButton("Save result...")
+        self.save_button.setToolTip("Write the whole result to a file")
+        self.save_button.setEnabled(False)
+        self.save_button.clicked.connect(self.save_result)
+        button_layout.addWidget(self.save_button)
+        self.stream_to_file = None
+        if dynamic_function.streaming:
+            # Generator functions: items can also go to a JSON Lines file as they are produced
+            self.stream_to_file = QCheckBox("Write items to file")
+            self.stream_to_file.setToolTip("Ask for a JSON Lines file on Run and write every item to it")
+            button_layout.addWidget(self.stream_to_file)
+
+        self.result_field = QPlainTextEdit()
+        self.result_field.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.result_field.setMaximumHeight(500)
+        self.result_field.setReadOnly(True)
+
+        form_layout.addRow(button_layout)
+        form_layout.addRow(self.result_field)
+
+        # Hit/miss counters of functions whose module settings enable the result cache
+        self.cache_label = QLabel()
+        self.cache_label.setVisible(False)
+        form_layout.addRow(self.cache_label)
+
+        # Item count of a streaming run
+        self.stream_label = QLabel()
+        self.stream_label.setVisible(False)
+        form_layout.addRow(self.stream_label)
+
+        self.setLayout(form_layout)
 
         # Printing the parameter names and the widget values
         param_values = {}
@@ -191,9 +254,7 @@ class DynamicFunctionUI(QWidget):
             }
 
         # Now print the function name with the parameters and their descriptions
-        print(f"Added tab for function: {func.__name__} with parameters: {param_values} and settings: {settings.to_dict()}", severity="DEBUG")
-
-
+        print(f"Added tab for function: {dynamic_function.name} with parameters: {param_values} and settings: {settings.to_dict()}", severity="DEBUG")
 
     def select_file(self, input_field):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -201,102 +262,363 @@ class DynamicFunctionUI(QWidget):
         if file_path:
             input_field.setText(file_path)
 
-            
-
-    def run_function(self, func, param_inputs, result_label):
-        params = {}
-        sig = inspect.signature(func)
+    def select_json_file(self, input_field):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Select JSON File", "", "JSON (*.json *.txt);;All Files (*)")
+        if file_path:
+            input_field.setPlainText(f"@{file_path}")
 
-        for param_name, param in sig.parameters.items():
+    def input_values(self) -> dict:
+        values = {}
+        for param_name, input_field in self.param_inputs.items():
             # Widget değerini al
-            if param_name in param_inputs:
-                if isinstance(param_inputs[param_name], QTextEdit):
-                    value = param_inputs[param_name].toPlainText()
-                elif isinstance(param_inputs[param_name], QComboBox):
-                    value = param_inputs[param_name].currentData()
-                else:
-                    value = param_inputs[param_name].text()
+            if isinstance(input_field, QTextEdit):
+                values[param_name] = input_field.toPlainText()
+            elif isinstance(input_field, QComboBox):
+                values[param_name] = input_field.currentData()
             else:
-                value = None  # Eğer UI'de input yoksa
-
-            # Varsayılan değeri kontrol et
-            if (value is None or (isinstance(value, str) and value.strip() == "")) and param.default is not param.empty:
-                value = param.default  # Kullanıcının girmediği durumda varsayılan değeri kullan
-
-            # Enum kontrolü
-            elif hasattr(param.annotation, '__name__') and isinstance(param.annotation, type) and issubclass(param.annotation, Enum):
-                if value is None or value.strip() == "":
-                    if param.default is not param.empty:
-                        value = param.default  # Varsayılan değeri kullan
-                    else:
-                        result_label.setText(f"Error: Empty input for parameter '{param_name}'")
-                        return
-                try:
-                    enum_value = param.annotation[value]
-                    params[param_name] = enum_value
-                except KeyError:
-                    result_label.setText(f"Error: Invalid value for Enum parameter '{param_name}'")
-                    return
-
-            # Kompleks tipleri işle (class, dict, list vs.)
-            elif hasattr(param.annotation, '__name__') and param.annotation not in {int, str, float, bool}:
-                try:
-                    print(f"Converting parameter '{param_name}' to {param.annotation.__name__}", severity="DEBUG")
-                    if value is None or (isinstance(value, str) and not value.strip()):
-                        result_label.setText(f"Error: Empty input for parameter '{param_name}'")
-                        return
-                    
-                    # JSON formatında parse edilmeli
-                    if isinstance(value, str):
-                        value = json.loads(value)
-
-                    param_value = convert_to_class_instance(param.annotation, value)
-                    params[param_name] = param_value
-                except json.JSONDecodeError as e:
-                    result_label.setText(f"Error: Invalid JSON input for parameter '{param_name}'")
-                    print(f"JSONDecodeError: {e}", severity="ERROR")
-                    return
-                except Exception as e:
-                    result_label.setText(f"Error: Failed to convert parameter '{param_name}' to {param.annotation.__name__}")
-                    error_message = "".join(traceback.format_exception(None, e, e.__traceback__))
-                    print(error_message, severity="ERROR")
-                    return
+                values[param_name] = input_field.text()
+        return values
+
+    def set_input_values(self, values: dict):
+        # Values typed into a previous version of the form
+        for param_name, value in values.items():
+            input_field = self.param_inputs.get(param_name)
+            if input_field is None or value in (None, ""):
+                continue
+            if isinstance(input_field, QTextEdit):
+                input_field.setPlainText(str(value))
+            elif isinstance(input_field, QComboBox):
+                index = input_field.findData(value)
+                if index >= 0:
+                    input_field.setCurrentIndex(index)
             else:
-                # Temel veri tiplerini işle (int, float, str, bool)
-                if param.annotation in [int, float]:
-                    try:
-                        value = param.annotation(value)
-                    except ValueError:
-                        result_label.setText(f"Error: Invalid input type for parameter '{param_name}'")
-                        return
-                params[param_name] = value
+                input_field.setText(str(value))
 
+    def run_function(self):
+        dynamic_function = self.dynamic_function
         try:
-            # Fonksiyonu çalıştır
-            result = func(**params)
-            result = convert_to_serializable(result)
-
-            # Sonucu uygun formatta göster
-            if isinstance(result, (dict, list, tuple, set)):
-                formatted_result = json.dumps(result, indent=4, ensure_ascii=False)
-            elif isinstance(result, str):
-                formatted_result = result
-            else:
-                formatted_result = str(result)
+            # First run of a lazily discovered function imports its module here
+            dynamic_function.func
+        except Exception as e:
+            self.result_field.setPlainText(f"Error: {str(e)}")
+            print(f"Could not load function {dynamic_function.name}: {e}", severity="ERROR")
+            return
 
-            result_label.setText(f"<pre>{formatted_result}</pre>")
+        try:
+            params = convert_parameters(dynamic_function.signature, self.input_values())
+        except ParameterError as e:
+            self.result_field.setPlainText(f"Error: {e}")
+            return
 
-            # Loglama (opsiyonel)
-            cleaned_data = re.sub(r'\s+', ' ', formatted_result).strip()
-            print(f"Result: {cleaned_data}", severity="DEBUG")
+        stream_path = None
+        if self.stream_to_file is not None and self.stream_to_file.isChecked():
+            stream_path, _ = QFileDialog.getSaveFileName(
+                self, "Write Items To", f"{dynamic_function.name}.jsonl", "JSON Lines (*.jsonl);;All Files (*)")
+            if not stream_path:
+                return
+
+        # Fonksiyon GUI thread'ini bloklamadan çalışır; sonuç sinyalle geri gelir
+        self.run = self.executor.submit(dynamic_function, params, stream_path)
+        self.run.items.connect(self.show_items)
+        self.run.finished.connect(self.show_result)
+        self.run.failed.connect(self.show_error)
+        self.run.cancelled.connect(self.show_error)
+        self.set_running(True)
+
+    def run_batch(self):
+        input_path, _ = QFileDialog.getOpenFileName(
+            self, "Select Batch Input", "", "JSON Lines (*.jsonl *.ndjson);;All Files (*)")
+        if not input_path:
+            return
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Batch Results", os.path.splitext(input_path)[0] + ".results.jsonl",
+            "JSON Lines (*.jsonl);;All Files (*)")
+        if not output_path:
+            return
 
-        except Exception as e:
-            result_label.setText(f"Error: {str(e)}")
-            error_message = "".join(traceback.format_exception(None, e, e.__traceback__))
-            print(error_message, severity="ERROR")
+        self.run = BatchRun(self.dynamic_function, input_path, output_path)
+        self.run.progress.connect(lambda progress: self.result_field.setPlainText(f"Batch: {progress}"))
+        self.run.finished.connect(lambda state, path=output_path: self.show_batch_result(state, path))
+        self.run.failed.connect(self.show_error)
+        self.set_running(True)
+        self.run.start()
+
+    def update_cache_stats(self):
+        cache = getattr(self.run, "cache", None)
+        if cache is not None:
+            self.cache_label.setText(cache.stats())
+            self.cache_label.setVisible(True)
+
+    def show_batch_result(self, state, output_path: str):
+        self.set_running(False)
+        self.result_field.setPlainText(f"Batch finished: {state} in {state.elapsed:.1f} s\nResults: {output_path}")
+
+    def cancel_function(self):
+        if self.run is not None:
+            self.run.cancel()
+
+    def show_load_error(self, error):
+        self.load_error_label.setText(f"Module failed to reload, running the last version that loaded: {error}")
+        self.load_error_label.setVisible(error is not None)
+
+    def set_running(self, running: bool):
+        self.run_button.setEnabled(not running)
+        self.batch_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+        if running:
+            self.clear_result()
+            self.result_field.setPlainText("Running...")
+        else:
+            self.run = None
+        self.running_changed.emit(running)
+
+    def show_items(self, lines: list, count: int):
+        if not self.stream_label.isVisible():
+            # First frame replaces "Running..."; only the newest lines are kept on screen
+            self.result_field.clear()
+            self.result_field.setMaximumBlockCount(get_settings_store().get("stream_view_lines", 10000))
+            self.stream_label.setVisible(True)
+        self.result_field.appendPlainText("\n".join(lines))
+        self.stream_label.setText(f"{count} items")
+
+    def show_result(self, result):
+        self.update_cache_stats()
+        self.set_running(False)
+        if isinstance(result, StreamResult):
+            # The items were shown (and written) as they came; nothing is kept to render or save
+            self.stream_label.setText(str(result))
+            self.stream_label.setVisible(True)
+            print(f"Stream of {self.dynamic_function.name} finished: {result}", severity="DEBUG")
+            return
+        self.result = result
+        self.save_button.setEnabled(True)
+        self.result_field.clear()
+
+        # Sonuç arka planda sayfa sayfa kodlanır; çok büyük sonuçların yalnızca başı gösterilir
+        self.render = ResultRender(result, get_settings_store().get("result_view_chars", 2000000))
+        self.render.page.connect(lambda text, render=self.render: self.append_result_page(render, text))
+        self.render.finished.connect(lambda shown, truncated, render=self.render:
+                                     self.finish_result(render, shown, truncated))
+        self.render.failed.connect(self.show_error)
+        self.render.start()
+
+        # Loglama (opsiyonel); only the beginning of the result goes to the log
+        print(f"Result: {summarize(result)}", severity="DEBUG")
+
+    def append_result_page(self, render, text: str):
+        if render is not self.render:
+            return
+        # Appended at the end without moving the view, so reading the top is not interrupted
+        cursor = QTextCursor(self.result_field.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText(text)
+
+    def finish_result(self, render, shown: int, truncated: bool):
+        if render is not self.render:
+            return
+        self.render = None
+        if truncated:
+            self.append_result_page(render, f"\n\n... showing the first {shown:,} characters; "
+                                            f"use Save result... for the whole result")
+
+    def clear_result(self):
+        if self.render is not None:
+            self.render.cancel()
+            self.render = None
+        self.result = None
+        self.save_button.setEnabled(False)
+        self.result_field.setMaximumBlockCount(0)
+        self.stream_label.setVisible(False)
+
+    def save_result(self):
+        if self.result is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Result", f"{self.dynamic_function.name}.json", "JSON (*.json);;Text (*.txt);;All Files (*)")
+        if not path:
+            return
+        self.save_button.setEnabled(False)
+        self.save = ResultSave(self.result, path)
+        self.save.finished.connect(self.result_saved)
+        self.save.failed.connect(lambda message: self.result_saved(None, message))
+        self.save.start()
+
+    def result_saved(self, path, message: str = ""):
+        self.save = None
+        self.save_button.setEnabled(self.result is not None)
+        status = f"Result saved to {path}" if path else f"Could not save result: {message}"
+        QToolTip.showText(QCursor.pos(), status, self.save_button)
+
+    def show_error(self, message: str):
+        self.update_cache_stats()
+        self.set_running(False)
+        if self.stream_label.isVisible():
+            # Items that already arrived stay on screen
+            self.result_field.appendPlainText(f"Error: {message}")
+        else:
+            self.result_field.setPlainText(f"Error: {message}")
+
+
+class DynamicFunctionUI(QWidget):
+    def __init__(self, functions):
+        super().__init__()
+        self.functions = functions
+        self.executor = FunctionExecutor()
+        # Forms are built when a function is first opened; the least recently opened ones are recycled
+        self.max_live_forms = get_settings_store().get("live_forms", 8)
+        self.forms: "OrderedDict[tuple, FunctionTab]" = OrderedDict()
+        # Values typed into forms that were recycled or rebuilt, restored when the form is built again
+        self.saved_values: Dict[tuple, dict] = {}
+        self.initUI()
+
+    def initUI(self):
+        layout = QHBoxLayout()
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        list_panel = QWidget()
+        list_layout = QVBoxLayout()
+        list_layout.setContentsMargins(0, 0, 0, 0)
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Search functions...")
+        self.search_field.setClearButtonEnabled(True)
+        self.search_field.returnPressed.connect(self.open_first_match)
+        list_layout.addWidget(self.search_field)
+
+        # Filtering waits for a pause in typing
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(lambda: self.model.set_query(self.search_field.text()))
+        self.search_field.textChanged.connect(lambda _: self.search_timer.start())
+
+        self.model = FunctionListModel()
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setModel(self.model)
+        self.list_view.selectionModel().currentChanged.connect(self.open_selected)
+        list_layout.addWidget(self.list_view)
+        list_panel.setLayout(list_layout)
+
+        self.stack = QStackedWidget()
+        self.empty_page = QLabel("Select a function")
+        self.empty_page.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.stack.addWidget(self.empty_page)
+
+        splitter.addWidget(list_panel)
+        splitter.addWidget(self.stack)
+        splitter.setStretchFactor(1, 1)
+        splitter.setSizes([220, 580])
+        layout.addWidget(splitter)
+        self.setLayout(layout)
+        self.refresh_forms()
+
+    def refresh_forms(self):
+        # Live forms are matched by module and function name; only changed ones are dropped
+        functions = [dynamic_function for dynamic_function in self.functions if dynamic_function.settings.enabled]
+        by_key = {function_key(dynamic_function): dynamic_function for dynamic_function in functions}
+        current_key = self.current_key()
+
+        kept = dropped = 0
+        for key, form in list(self.forms.items()):
+            dynamic_function = by_key.get(key)
+            if dynamic_function is form.dynamic_function:
+                form.show_load_error(dynamic_function.load_error)
+                kept += 1
+            elif dynamic_function is not None and form.form_key == FunctionTab.form_key_of(dynamic_function):
+                # Same form; runs go to the reloaded function from now on
+                form.dynamic_function = dynamic_function
+                form.show_load_error(dynamic_function.load_error)
+                kept += 1
+            else:
+                self.discard_form(key, "Function was reloaded")
+                dropped += 1
+
+        self.model.set_functions(functions)
+        self.model.running = {key for key, form in self.forms.items() if form.run is not None}
+        if current_key in by_key:
+            self.select(by_key[current_key])
+        else:
+            self.stack.setCurrentWidget(self.empty_page)
+        print(f"Function list updated: {len(functions)} functions, {kept} live forms kept, {dropped} dropped.",
+              severity="DEBUG")
+
+    def update_functions(self, new_functions):
+        if len(new_functions) == len(self.functions) and all(
+                new is old for new, old in zip(new_functions, self.functions)):
+            # Nothing was re-imported; a module that failed to may have changed its error
+            for form in self.forms.values():
+                form.show_load_error(form.dynamic_function.load_error)
+            return
+        print("Updating functions...", severity="DEBUG")
+        self.functions = new_functions
+        # Workers that imported a reloaded module are replaced; the others keep running
+        self.executor.prepare(new_functions)
+        self.refresh_forms()
+
+    def current_key(self):
+        form = self.stack.currentWidget()
+        return function_key(form.dynamic_function) if isinstance(form, FunctionTab) else None
+
+    def select(self, dynamic_function: DynamicFunction):
+        row = self.model.row_of(function_key(dynamic_function))
+        if row >= 0:
+            self.list_view.setCurrentIndex(self.model.index(row))
+        else:
+            # Filtered out of the list, but still the open form
+            self.open_form(dynamic_function)
+
+    def open_first_match(self):
+        self.model.set_query(self.search_field.text())
+        if self.model.rowCount() > 0:
+            self.list_view.setCurrentIndex(self.model.index(0))
+            self.list_view.setFocus()
+
+    def open_selected(self, current, _previous=None):
+        dynamic_function = self.model.function_at(current.row()) if current.isValid() else None
+        if dynamic_function is not None:
+            self.open_form(dynamic_function)
+
+    def open_form(self, dynamic_function: DynamicFunction):
+        key = function_key(dynamic_function)
+        form = self.forms.get(key)
+        if form is None:
+            form = FunctionTab(dynamic_function, self.executor)
+            form.running_changed.connect(lambda running, key=key: self.model.set_running(key, running))
+            if key in self.saved_values:
+                form.set_input_values(self.saved_values.pop(key))
+            self.stack.addWidget(form)
+            self.forms[key] = form
+        else:
+            self.forms.move_to_end(key)
+        self.stack.setCurrentWidget(form)
+        self.recycle_forms()
+
+    def recycle_forms(self):
+        # Running forms and the open one stay alive
+        for key in list(self.forms):
+            if len(self.forms) <= self.max_live_forms:
+                break
+            form = self.forms[key]
+            if form.run is None and form is not self.stack.currentWidget():
+                self.discard_form(key)
+
+    def discard_form(self, key, reason: str = "Form was closed"):
+        form = self.forms.pop(key)
+        values = {name: value for name, value in form.input_values().items() if value not in (None, "")}
+        if values:
+            self.saved_values[key] = values
+        if form.run is not None:
+            form.run.cancel(reason)
+        form.clear_result()
+        self.stack.removeWidget(form)
+        form.deleteLater()
 
 
 class MainWindow(QMainWindow):
+    # Emitted from whichever thread noticed the change, delivered on the GUI thread
+    settings_changed = pyqtSignal(dict)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Dynamic Function Executor")
@@ -335,8 +657,20 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.function_ui)
 
         main_widget.setLayout(layout)
+
+        # Saves in the functions folder reload the touched modules once a burst of writes is over
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.schedule_functions_refresh)
+        self.watcher.fileChanged.connect(self.schedule_functions_refresh)
+        self.watch_timer = QTimer(self)
+        self.watch_timer.setSingleShot(True)
+        self.watch_timer.timeout.connect(lambda: self.refresh_functions(retry_errors=False))
+
         self.reload()
 
+        self.settings_changed.connect(self.on_settings_changed)
+        get_settings_store().subscribe(self.settings_changed.emit, keys=("functions_path", "css_path"))
+
     def resource_path(self, relative_path):
         """PyInstaller'ın EXE dosyasındaki veri dosyasını bulmasını sağlar"""
         try:
@@ -372,7 +706,7 @@ class MainWindow(QMainWindow):
 
 
     def get_log_folder(self):
-        log_folder = load_settings(key="log_folder", default_value="logs")
+        log_folder = get_settings_store().log_folder
         if not os.path.exists(log_folder):
             os.makedirs(log_folder)  # Create log folder if not exists
         return log_folder
@@ -382,15 +716,39 @@ class MainWindow(QMainWindow):
         self.refresh_functions()
         self.reload_css(self)
 
-    def refresh_functions(self):
+    def on_settings_changed(self, changes):
+        print(f"Settings changed: {list(changes)}", severity="DEBUG")
+        # Only redo the work whose input actually changed
+        if "functions_path" in changes:
+            self.refresh_functions()
+        if "css_path" in changes:
+            self.reload_css(self)
+
+    def refresh_functions(self, retry_errors: bool = True):
         print("Refreshing functions...", severity="DEBUG")
-        functions_path = load_settings(key="functions_path")
-        new_functions = get_all_functions(functions_path)
+        functions_path = get_settings_store().functions_path
+        new_functions = get_all_functions(functions_path, retry_errors=retry_errors)
         self.function_ui.update_functions(new_functions)
+        self.watch_functions(functions_path)
+
+    def schedule_functions_refresh(self, _path: str):
+        self.watch_timer.start(get_settings_store().get("reload_debounce_ms", 300))
+
+    def watch_functions(self, functions_path: str):
+        # Watched again after every refresh: files are added and removed, and editors that save by
+        # renaming replace the watched file
+        watched = self.watcher.directories() + self.watcher.files()
+        if watched:
+            self.watcher.removePaths(watched)
+        if not get_settings_store().get("watch_functions", True) or not os.path.isdir(functions_path):
+            return
+        paths = [os.path.join(functions_path, filename) for filename in os.listdir(functions_path)
+                 if filename.endswith('.py')]
+        self.watcher.addPaths([functions_path] + paths)
 
     def reload_css(self, window: QWidget):
         print("Reloading CSS...", severity="DEBUG")
-        css_path = load_settings(key="css_path")
+        css_path = get_settings_store().css_path
         if not css_path:
             print("CSS path not found in settings.json")
             return
@@ -400,3 +758,8 @@ class MainWindow(QMainWindow):
             window.setStyleSheet(css)
         except FileNotFoundError:
             print(f"CSS file not found at: {css_path}")
+
+    def closeEvent(self, event):
+        # Running functions are abandoned; worker processes are not left behind
+        self.function_ui.executor.shutdown()
+        super().closeEvent(event)
@@ -1,50 +1,39 @@
+import atexit
 import builtins
 import datetime
-import inspect
 import json
 import traceback
-from typing import Callable, List, Literal, get_args, get_origin, get_type_hints
-from inspect import signature, isclass, isfunction
+from enum import Enum
+from typing import Callable, Dict, List, Literal, Optional, Tuple, get_args, get_type_hints
+from inspect import Signature, signature, isclass, isfunction
 import os
+import hashlib
 import importlib
+import importlib.util
+import py_compile
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 
+from converters import add_function_folder, get_converter, to_serializable
 from entities import DynamicFunction, DynamicSettings
+from json_stream import clear_plans, is_lazy_annotation, iter_file, load_file
+from log_backend import LogRecord, caller_location, create_log_writer
+from log_store import LogStore
+from manifest import ModuleManifest, load_manifest, save_manifest, scan_imports, scan_module
+from resources import HOOK_NAMES, is_resource_annotation, setup_module, teardown_all, teardown_module
+from schema import PRIMAL_TYPES, schema_registry
+from settings_store import get_settings_store
 
-PRIMAL_TYPES = {int, str, float, bool, list, dict, tuple, set}
 
 def constructor_parameter_analyzer(cls, level=1):
-    ctor_sign = signature(cls.__init__)
-    type_hints = get_type_hints(cls.__init__)
+    # Stand-in types of functions that are not imported yet carry their description from the manifest
+    manifest_description = getattr(cls, "__manifest_description__", None)
+    if manifest_description is not None:
+        return manifest_description
 
-    constructor_parameters = []
-    for param_name, param in ctor_sign.parameters.items():
-        if param_name == "self":
-            continue
-
-        param_type = type_hints.get(param_name, "Unknown")
-        type_name = getattr(param_type, '__name__', param_type)
-
-        if hasattr(param_type, '__args__'):
-            if hasattr(param_type, '__origin__') and param_type.__origin__ in [list, tuple, set, dict]:
-                param_collection_type = param_type.__origin__
-                param_inner_type = param_type.__args__[0] if param_collection_type in [list, tuple, set] else param_type.__args__
-                inner_type_name = getattr(param_inner_type, '__name__', str(param_inner_type))
-
-                if isinstance(param_inner_type, type) and not param_inner_type in PRIMAL_TYPES:
-                    inner_class_details = constructor_parameter_analyzer(param_inner_type, level + 1)
-                    constructor_parameters.append(f"{param_name}: {param_collection_type.__name__}[{inner_class_details}]")
-                else:
-                    constructor_parameters.append(f"{param_name}: {param_collection_type.__name__}[{inner_type_name}]")
-            else:
-                constructor_parameters.append(f"{param_name}: {type_name}")
-        elif isclass(param_type) and param_type not in PRIMAL_TYPES:
-            nested_parameters = constructor_parameter_analyzer(param_type, level + 1)
-            constructor_parameters.append(f"{param_name}: {type_name} ({nested_parameters})")
-        else:
-            constructor_parameters.append(f"{param_name}: {type_name}")
-
-    return ", ".join(constructor_parameters) if constructor_parameters else "None"
+    # Each class is analyzed once and the text is memoized until its module is reloaded
+    return schema_registry.describe(cls)
 
 
 def print_function_parameters(funk: Callable) -> None:
@@ -62,7 +51,400 @@ def print_function_parameters(funk: Callable) -> None:
             print(f"Parameter: {param_name}, Type: {getattr(param_type, '__name__', param_type)}")
 
 
-def get_all_functions(functions_folder='functions') -> List[DynamicFunction]:
+class _ModuleEntry:
+    __slots__ = ("module_name", "mtime_ns", "size", "digest", "functions", "error", "module", "imports")
+
+    def __init__(self, module_name: str, mtime_ns: int, size: int, digest: str):
+        self.module_name = module_name
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.digest = digest
+        self.functions: List[DynamicFunction] = []
+        self.error: Optional[str] = None
+        # The last version that imported; kept while a newer source fails to
+        self.module = None
+        # Names the source imports; the ones that are modules of the folder order the re-imports
+        self.imports: List[str] = []
+
+
+class FunctionDiscovery:
+    """Remembers what each module file looked like so a reload only re-imports what changed."""
+
+    def __init__(self, folder_path: str, workers: int = 0, lazy: bool = False):
+        self.folder_path = folder_path
+        # Results of its classes are shown field by field
+        add_function_folder(folder_path)
+        # More than one worker imports changed modules concurrently
+        self.workers = workers
+        # Lazy discovery builds functions from the AST manifest and imports a module on its first run
+        self.lazy = lazy
+        self.manifests: Optional[Dict[str, ModuleManifest]] = None
+        self.entries: Dict[str, _ModuleEntry] = {}
+
+    def discover(self, retry_errors: bool = True) -> List[DynamicFunction]:
+        """retry_errors=False leaves modules whose import failed alone until their file changes again."""
+        # Append the folder only once; every reload used to add it again
+        if self.folder_path not in sys.path:
+            sys.path.append(self.folder_path)
+
+        filenames = [filename for filename in os.listdir(self.folder_path) if filename.endswith('.py')]
+
+        removed = [filename for filename in self.entries if filename not in filenames]
+        for filename in removed:
+            self._unload(self.entries.pop(filename))
+
+        if any(filename not in self.entries for filename in filenames):
+            # New files must be visible to the import system's directory cache
+            importlib.invalidate_caches()
+
+        if self.lazy and self.manifests is None:
+            self.manifests = load_manifest(self.folder_path)
+
+        refreshed = [(filename, self._refresh_entry(filename, retry_errors)) for filename in filenames]
+        changed = [(filename, entry) for filename, (entry, is_changed) in refreshed if entry is not None and is_changed]
+
+        to_import = []
+        for filename, entry in changed:
+            # A module already imported is imported again right away, so a broken edit can fall back on it
+            if self.lazy and entry.module is None and self._load_from_manifest(filename, entry):
+                # A copy a sibling module imported is of the old source
+                _forget_module(entry.module_name)
+            else:
+                to_import.append(entry)
+
+        # Loaded modules that import a changed one hold its old objects, so they are imported again after it
+        dependents = self._dependents([entry for _, entry in changed])
+        imported = self._load_in_order(to_import + dependents, {entry.module_name for entry in to_import})
+
+        if self.lazy and (changed or removed):
+            for filename in [filename for filename in self.manifests if filename not in filenames]:
+                del self.manifests[filename]
+            try:
+                save_manifest(self.folder_path, self.manifests)
+            except OSError as e:
+                print(f"Could not save function manifest: {e}", severity="WARNING")
+
+        # Merge back in directory order, whichever way the modules were loaded
+        all_functions = []
+        for _, (entry, _) in refreshed:
+            if entry is not None:
+                all_functions.extend(entry.functions)
+
+        print(f"Discovery in {self.folder_path}: {imported} module(s) imported, "
+              f"{len(changed) - len(to_import)} from manifest, {len(refreshed) - len(changed)} unchanged, "
+              f"{len(removed)} removed.", severity="DEBUG")
+        return all_functions
+
+    def _refresh_entry(self, filename: str, retry_errors: bool = True) -> Tuple[Optional[_ModuleEntry], bool]:
+        """Returns the entry for filename and whether its module must be (re)imported."""
+        path = os.path.join(self.folder_path, filename)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            print(f"Error reading module {filename}: {e}", severity="ERROR")
+            return None, False
+
+        entry = self.entries.get(filename)
+        settled = entry is not None and (entry.error is None or not retry_errors)
+        if settled and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+            return entry, False
+
+        manifest = self.manifests.get(filename) if self.lazy and entry is None else None
+        if manifest is not None and (manifest.mtime_ns, manifest.size) == (stat.st_mtime_ns, stat.st_size):
+            # Cold start with a persisted manifest: the file does not even need to be read
+            entry = _ModuleEntry(filename[:-3], stat.st_mtime_ns, stat.st_size, manifest.digest)
+            entry.imports = manifest.imports
+            self.entries[filename] = entry
+            return entry, True
+
+        with open(path, "rb") as file:
+            source = file.read()
+        digest = hashlib.sha256(source).hexdigest()
+
+        if settled and entry.digest == digest:
+            # Touched but not edited
+            entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+            return entry, False
+
+        if entry is None:
+            entry = self.entries[filename] = _ModuleEntry(filename[:-3], stat.st_mtime_ns, stat.st_size, digest)
+        else:
+            # Updated in place: the loaded version stays live until the new source has imported
+            entry.mtime_ns, entry.size, entry.digest = stat.st_mtime_ns, stat.st_size, digest
+            # A .pyc checks only the source's mtime in whole seconds and its size; two saves in the same
+            # second at the same size would import the old bytecode
+            _drop_bytecode(path)
+        entry.imports = scan_imports(source)
+        return entry, True
+
+    def _dependents(self, entries: List[_ModuleEntry]) -> List[_ModuleEntry]:
+        """Modules importing any of entries, directly or through each other, that were imported or failed to."""
+        importers: Dict[str, List[_ModuleEntry]] = {}
+        for entry in self.entries.values():
+            for name in entry.imports:
+                importers.setdefault(name, []).append(entry)
+
+        seen = {entry.module_name for entry in entries}
+        dependents = []
+        pending = list(entries)
+        while pending:
+            for importer in importers.get(pending.pop().module_name, ()):
+                # A lazy module not imported yet holds nothing old
+                if importer.module_name not in seen and (importer.module is not None or importer.error is not None):
+                    seen.add(importer.module_name)
+                    dependents.append(importer)
+                    pending.append(importer)
+        return dependents
+
+    @staticmethod
+    def _import_levels(entries: List[_ModuleEntry]) -> List[List[_ModuleEntry]]:
+        """Groups entries so every module comes after the ones it imports; an import cycle is cut where it closes."""
+        by_name = {entry.module_name: entry for entry in entries}
+        depths: Dict[str, int] = {}
+
+        def depth(name: str, visiting: set) -> int:
+            if name not in depths:
+                visiting.add(name)
+                depths[name] = max((depth(imported, visiting) + 1 for imported in by_name[name].imports
+                                    if imported in by_name and imported not in visiting), default=0)
+                visiting.discard(name)
+            return depths[name]
+
+        levels: List[List[_ModuleEntry]] = []
+        for entry in entries:
+            level = depth(entry.module_name, set())
+            levels.extend([] for _ in range(level + 1 - len(levels)))
+            levels[level].append(entry)
+        return levels
+
+    def _load_in_order(self, entries: List[_ModuleEntry], changed_names: set) -> int:
+        """Imports entries level by level; returns how many were imported."""
+        parallel = self.workers > 1 and len(entries) > 1
+        if parallel:
+            self._precompile(entries)
+
+        imported = 0
+        # Modules that kept their old version; what only imports them does not need a new one
+        kept = set()
+        for level in self._import_levels(entries):
+            skipped = [entry for entry in level if entry.module_name not in changed_names and kept.intersection(entry.imports)]
+            kept.update(entry.module_name for entry in skipped)
+            level = [entry for entry in level if entry not in skipped]
+
+            # Drop stale modules up front so concurrent imports never race with a removal
+            for entry in level:
+                _forget_module(entry.module_name)
+            if parallel and len(level) > 1:
+                self._load_parallel(level)
+            else:
+                for entry in level:
+                    self._load(entry)
+            kept.update(entry.module_name for entry in level if entry.error is not None)
+            imported += len(level)
+        return imported
+
+    def _load(self, entry: _ModuleEntry):
+        module = self._import(entry)
+        if module is not None:
+            self._collect(entry, module)
+        elif entry.module is None:
+            # Nothing loaded to fall back on
+            entry.functions = []
+
+    def _load_from_manifest(self, filename: str, entry: _ModuleEntry) -> bool:
+        manifest = self.manifests.get(filename)
+        if manifest is None or manifest.digest != entry.digest:
+            try:
+                manifest = self.manifests[filename] = scan_module(os.path.join(self.folder_path, filename))
+            except (OSError, SyntaxError, ValueError):
+                # The import reports the error
+                return False
+        if not manifest.static:
+            return False
+
+        entry.functions = []
+        for function_manifest in manifest.functions:
+            settings = _function_settings(function_manifest.name, manifest.settings)
+            entry.functions.append(DynamicFunction(
+                func=None,
+                settings=settings,
+                module_name=entry.module_name,
+                name=function_manifest.name,
+                loader=partial(self._load_lazy, entry, function_manifest.name),
+                signature=manifest.signature(function_manifest),
+                streaming=function_manifest.streaming,
+                coroutine=function_manifest.coroutine
+            ))
+            print(f"Function {function_manifest.name} registered from manifest.", severity="INFO")
+        return True
+
+    def _load_lazy(self, entry: _ModuleEntry, name: str) -> Callable:
+        if entry.module is None:
+            # A sibling module may have imported it already; that copy is the one set up and used
+            entry.module = self._import(entry)
+            if entry.module is None:
+                raise ImportError(f"Error importing module {entry.module_name}: {entry.error}")
+            print(f"Module {entry.module_name} imported on first use.", severity="DEBUG")
+
+        func = getattr(entry.module, name, None)
+        if not isfunction(func):
+            raise ImportError(f"Function {name} not found in module {entry.module_name}")
+        return func
+
+    def _collect(self, entry: _ModuleEntry, module):
+        entry.module = module
+        entry.error = None
+        entry.functions = _module_functions(module)
+        # Signatures and type hints are resolved here instead of when the tabs are built
+        for dynamic_function in entry.functions:
+            dynamic_function.resolve()
+
+    def _import(self, entry: _ModuleEntry):
+        previous = entry.module
+        try:
+            # A single import executes the module once
+            module = importlib.import_module(entry.module_name)
+        except Exception as e:
+            self._import_failed(entry, previous, e)
+            return None
+
+        # The old version is torn down only once the new one imported; its setup() runs right after
+        if previous is not None:
+            self._teardown(entry.module_name)
+        try:
+            setup_module(module)
+        except Exception as e:
+            if previous is not None:
+                # Set up again, so the version that stays live has its resources back
+                try:
+                    setup_module(previous)
+                except Exception as setup_error:
+                    print(f"Error in setup of module {entry.module_name}: {setup_error}", severity="ERROR")
+            self._import_failed(entry, previous, e)
+            return None
+        return module
+
+    def _import_failed(self, entry: _ModuleEntry, previous, error: Exception):
+        entry.error = str(error)
+        if previous is None:
+            sys.modules.pop(entry.module_name, None)
+            print(f"Error importing module {entry.module_name}: {error}", severity="ERROR")
+            return
+        # A broken edit does not take the module away: its last good version stays live
+        sys.modules[entry.module_name] = previous
+        for dynamic_function in entry.functions:
+            dynamic_function.load_error = entry.error
+        print(f"Error importing module {entry.module_name}: {error}. Keeping the last version that loaded.",
+              severity="ERROR")
+
+    def _precompile(self, entries: List[_ModuleEntry]):
+        # Compile to bytecode in separate processes so the imports only unmarshal .pyc files
+        paths = [os.path.join(self.folder_path, entry.module_name + ".py") for entry in entries]
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(_precompile, paths, chunksize=max(1, len(paths) // (self.workers * 4))))
+        except Exception as e:
+            # Imports compile on their own if the cache could not be written
+            print(f"Precompiling modules failed: {e}", severity="WARNING")
+
+    def _load_parallel(self, entries: List[_ModuleEntry]):
+        # Each module imports in its own task; a failing or slow import does not hold up the others.
+        # The import system's per-module locks keep cross-module imports consistent.
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            modules = list(pool.map(self._import, entries))
+            imported = [(entry, module) for entry, module in zip(entries, modules) if module is not None]
+            list(pool.map(lambda item: self._collect(*item), imported))
+        for entry, module in zip(entries, modules):
+            if module is None and entry.module is None:
+                entry.functions = []
+
+    def _unload(self, entry: _ModuleEntry):
+        if entry.module is not None:
+            self._teardown(entry.module_name)
+            entry.module = None
+        _forget_module(entry.module_name)
+
+    @staticmethod
+    def _teardown(module_name: str):
+        try:
+            teardown_module(module_name)
+        except Exception as e:
+            print(f"Error in teardown of module {module_name}: {e}", severity="ERROR")
+
+
+def _forget_module(module_name: str):
+    sys.modules.pop(module_name, None)
+    # Cached class analyses refer to the old module's classes
+    schema_registry.invalidate_module(module_name)
+    clear_plans()
+
+
+def _drop_bytecode(path: str):
+    try:
+        os.remove(importlib.util.cache_from_source(path))
+    except (OSError, NotImplementedError):
+        pass
+
+
+def _precompile(path: str):
+    try:
+        py_compile.compile(path, doraise=True)
+    except py_compile.PyCompileError:
+        # The import reports the syntax error for this module
+        pass
+
+
+def _function_settings(function_name: str, module_settings: Optional[dict]) -> DynamicSettings:
+    # Varsayılan settings oluştur
+    settings = DynamicSettings(
+        name=function_name,
+        enabled=True,
+        description=None
+    )
+
+    # Modülde bir settings dict var mı kontrol et
+    if isinstance(module_settings, dict):
+        settings.name = module_settings.get("name", function_name)
+        settings.enabled = module_settings.get("enabled", True)
+        settings.description = module_settings.get("description", None)
+        settings.executor = module_settings.get("executor")
+        settings.timeout = module_settings.get("timeout", None)
+        settings.cache = module_settings.get("cache", None)
+        # One limit for the module's coroutine functions, or a dict of limits by function name
+        concurrency = module_settings.get("concurrency")
+        settings.concurrency = concurrency.get(function_name) if isinstance(concurrency, dict) else concurrency
+    return settings
+
+
+def _module_functions(module) -> List[DynamicFunction]:
+    functions = []
+    module_settings = getattr(module, "settings", None)
+    for attribute_name in dir(module):
+        attribute = getattr(module, attribute_name)
+        # Only functions defined in the module itself, matching what the AST manifest sees
+        if isfunction(attribute) and attribute.__module__ == module.__name__ and attribute_name not in HOOK_NAMES:
+            settings = _function_settings(attribute.__name__, module_settings)
+
+            # DynamicFunction nesnesi ekle
+            dynamic_function = DynamicFunction(
+                func=attribute,
+                settings=settings
+            )
+            functions.append(dynamic_function)
+            print(f"Function {attribute.__name__} imported successfully.", severity="INFO")
+            print(f"Function {attribute.__name__} settings: {settings}", severity="INFO")
+    return functions
+
+
+_discoveries: Dict[str, FunctionDiscovery] = {}
+
+
+def _log_teardown_error(module_name: str, error: BaseException):
+    print(f"Error in teardown of module {module_name}: {error}", severity="ERROR")
+
+
+def get_all_functions(functions_folder='functions', workers: Optional[int] = None,
+                      lazy: Optional[bool] = None, retry_errors: bool = True) -> List[DynamicFunction]:
     all_functions = []
 
     # Eğer tam bir yol verilmişse, dizini sys.path'a ekle
@@ -77,50 +459,13 @@ def get_all_functions(functions_folder='functions') -> List[DynamicFunction]:
         print(f"{functions_folder} is not a valid directory.", severity="WARNING")
         return all_functions
 
-    sys.path.append(folder_path)
-
-    for filename in os.listdir(folder_path):
-        if filename.endswith('.py'):
-            module_name = filename[:-3]
-
-            # Modülü temizleyip yeniden yükleyelim
-            if module_name in sys.modules:
-                del sys.modules[module_name]
-
-            try:
-                module = importlib.import_module(module_name)
-                importlib.reload(module)
-
-                for attribute_name in dir(module):
-                    attribute = getattr(module, attribute_name)
-                    if isfunction(attribute):
-                        # Varsayılan settings oluştur
-                        settings = DynamicSettings(
-                            name=attribute.__name__,
-                            enabled=True,
-                            description=None
-                        )
-
-                        # Modülde bir settings dict var mı kontrol et
-                        if hasattr(module, "settings") and isinstance(module.settings, dict):
-                            module_settings = module.settings
-                            settings.name = module_settings.get("name", attribute.__name__)
-                            settings.enabled = module_settings.get("enabled", True)
-                            settings.description = module_settings.get("description", None)
-
-                        # DynamicFunction nesnesi ekle
-                        dynamic_function = DynamicFunction(
-                            func=attribute,
-                            settings=settings
-                        )
-                        all_functions.append(dynamic_function)
-                        print(f"Function {attribute.__name__} imported successfully.", severity="INFO")
-                        print(f"Function {attribute.__name__} settings: {settings}", severity="INFO")
-
-            except Exception as e:
-                print(f"Error importing module {module_name}: {e}", severity="ERROR")
-
-    return all_functions
+    if lazy is None:
+        lazy = get_settings_store().get("lazy_import", True)
+    discovery = _discoveries.get(folder_path)
+    if discovery is None or discovery.lazy != lazy:
+        discovery = _discoveries[folder_path] = FunctionDiscovery(folder_path, lazy=lazy)
+    discovery.workers = workers if workers is not None else get_settings_store().get("discovery_workers", 0)
+    return discovery.discover(retry_errors)
 
 
 # Severity seviyeleri için renkler
@@ -135,121 +480,219 @@ severity_colors = {
 }
 
 
-def print(*args, severity: str = "INFO", **kwargs):
-    stack = traceback.extract_stack()
-    filename, lineno, _, _ = stack[-2]
-
+def _log_folder() -> str:
     # Log folder from settings, default is "logs"
-    log_folder = "logs"
-    log_folder = load_settings(key="logs", default_value=log_folder)
+    return get_settings_store().log_folder
+
+
+def _log_store_path() -> Optional[str]:
+    # Settings are read on use: reading them while this module is imported may log, which needs utils
+    store = get_settings_store()
+    # "log_store": false keeps only the text files
+    if not store.get("log_store", True):
+        return None
+    # Both take effect when the store file is (re)opened
+    log_store.retention_days = store.get("log_store_days", 30)
+    log_store.full_text_index = store.get("log_store_full_text", False)
+    return os.path.join(_log_folder(), "logs.sqlite3")
+
+
+log_store = LogStore(_log_store_path)
+log_writer = create_log_writer(_log_folder, sinks=[log_store])
+# Modules still loaded at exit get their teardown(); registered after the writer so it runs first
+atexit.register(teardown_all, _log_teardown_error)
+
+# High-volume severities that skip caller capture when "log_caller" is false
+CALLER_OPTIONAL_SEVERITIES = {"INFO", "DEBUG"}
+
+# Console echo of log lines; the CLI moves it off stdout, which carries the result
+console_enabled = True
+console_stream = None  # None: sys.stdout at the time of the call
+console_colors = True
+console_severities: Optional[set] = None  # None: every severity
+
 
-    # Create the log folder if it doesn't exist
-    if not os.path.exists(log_folder):
-        os.makedirs(log_folder)
+def configure_console(stream=None, enabled: bool = True, colors: bool = True, severities: Optional[set] = None):
+    global console_enabled, console_stream, console_colors, console_severities
+    console_enabled = enabled
+    console_stream = stream
+    console_colors = colors
+    console_severities = severities
 
-    # Prepare the timestamp and log file name
-    timestamp = datetime.datetime.now().strftime("%d-%m-%Y_%H")
-    log_filename = os.path.join(log_folder, f"logs_{timestamp}.txt")
 
-    # Get relative filename
-    relative_filename = os.path.relpath(filename)
+def print(*args, severity: str = "INFO", **kwargs):
+    if severity in CALLER_OPTIONAL_SEVERITIES and not get_settings_store().get("log_caller", True):
+        relative_filename, lineno = None, 0
+    else:
+        relative_filename, lineno = caller_location()
 
-    # Construct the log message
-    message = f"[{severity}] [{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] " \
-        f"{relative_filename} -> line {lineno}: " + " ".join(map(str, args))
+    record = LogRecord(datetime.datetime.now(), severity, relative_filename, lineno, " ".join(map(str, args)))
+    message = record.format()
 
     # Print the message in the console with color based on severity
     # Default to INFO color if not found
-    color = severity_colors.get(severity, severity_colors['INFO'])
-    builtins.print(f"{color}{message}{severity_colors['RESET']}", **kwargs)
-
-    # Write the message to the log file
-    with open(log_filename, "a", encoding="utf-8") as log_file:
-        log_file.write(message + "\n")
-        log_file.flush()
+    if console_enabled and (console_severities is None or severity in console_severities):
+        if console_stream is not None:
+            kwargs.setdefault("file", console_stream)
+        if console_colors:
+            color = severity_colors.get(severity, severity_colors['INFO'])
+            message = f"{color}{message}{severity_colors['RESET']}"
+        builtins.print(message, **kwargs)
+
+    # The background writer appends the message to the hourly log file
+    log_writer.write(record)
+
+
+def flush_logs(callback: Optional[Callable[[], None]] = None):
+    """Waits until queued log records are written; with a callback, returns at once and the writer calls it."""
+    if callback is None:
+        log_writer.flush()
+    else:
+        log_writer.flush_async(callback)
 
 def convert_to_class_instance(cls, data):
-    if not hasattr(cls, '__annotations__'):  
-        return data  # Eğer cls bir sınıf değilse (örneğin dict ise) direkt geri döndür
-    
-    annotations = cls.__annotations__
-    kwargs = {}
-
-    for field, field_type in annotations.items():
-        origin_type = get_origin(field_type)
-        
-        # Varsayılan değer belirleme
-        if origin_type == list:
-            default_value = []
-        elif origin_type == dict:
-            default_value = {}
-        elif origin_type == tuple:
-            default_value = tuple()
-        elif origin_type == set:
-            default_value = set()
-        else:
-            default_value = None  # Diğer türler için
-
-        field_value = data.get(field, default_value)  # UI’den değer gelmezse varsayılanı kullan
-        
-        # Eğer iç içe geçmiş bir sınıf varsa
-        if inspect.isclass(field_type) and isinstance(field_value, dict):
-            kwargs[field] = convert_to_class_instance(field_type, field_value)
-
-        # Eğer liste (List[T]) ise
-        elif origin_type == list:
-            item_type = get_args(field_type)[0]
-            if inspect.isclass(item_type) and isinstance(field_value, list):
-                kwargs[field] = [convert_to_class_instance(item_type, item) for item in field_value]
-            else:
-                kwargs[field] = field_value  # Doğrudan ata
-
-        # Eğer tuple (Tuple[T1, T2, ...]) ise
-        elif origin_type == tuple:
-            item_types = get_args(field_type)
-            if all(inspect.isclass(item_type) for item_type in item_types) and isinstance(field_value, tuple):
-                kwargs[field] = tuple(
-                    convert_to_class_instance(item_type, item) for item_type, item in zip(item_types, field_value)
-                )
-            else:
-                kwargs[field] = field_value  # Doğrudan ata
+    # Eğer cls bir sınıf değilse (örneğin dict ise) data olduğu gibi döner.
+    # Alan tipleri her sınıf için bir kez incelenip derlenmiş bir dönüştürücüde saklanır.
+    return get_converter(cls)(data)
 
-        # Eğer dict (Dict[K, V]) ise
-        elif origin_type == dict:
-            key_type, value_type = get_args(field_type)
-            if inspect.isclass(value_type) and isinstance(field_value, dict):
-                kwargs[field] = {k: convert_to_class_instance(value_type, v) for k, v in field_value.items()}
-            else:
-                kwargs[field] = field_value  # Doğrudan ata
-        
+BOOL_STRINGS = {"true": True, "1": True, "yes": True, "false": False, "0": False, "no": False}
+
+
+class ParameterError(ValueError):
+    """A parameter value could not be turned into what the function expects."""
+
+
+def is_complex_annotation(annotation) -> bool:
+    """Parameters entered as JSON (classes, collections), as opposed to scalars and enums."""
+    if annotation is Signature.empty or not hasattr(annotation, '__name__'):
+        return False
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return False
+    return annotation not in {int, str, float, bool}
+
+
+def file_reference(value) -> Optional[str]:
+    # "@path" points a JSON parameter at a file; JSON text itself never starts with "@"
+    if isinstance(value, str) and value.lstrip().startswith("@"):
+        return value.strip()[1:]
+    return None
+
+
+def _lazy_parameter(annotation, value, param_name):
+    item_type = get_args(annotation)[0] if get_args(annotation) else None
+    path = file_reference(value)
+    if path is not None:
+        if not os.path.isfile(path):
+            raise ParameterError(f"Cannot read file for parameter '{param_name}': {path} not found")
+        # Dosya fonksiyon öğeleri istedikçe okunur
+        return iter_file(path, item_type)
+    try:
+        items = json.loads(value) if isinstance(value, str) else value
+    except json.JSONDecodeError as e:
+        raise ParameterError(f"Invalid JSON input for parameter '{param_name}'") from e
+    if not isinstance(items, list):
+        raise ParameterError(f"Expected a JSON array for parameter '{param_name}'")
+    convert = get_converter(item_type) if item_type is not None else None
+    return iter([convert(item) if convert is not None and isinstance(item, dict) else item for item in items])
+
+
+def convert_parameters(sig: Signature, values: dict, log: bool = True) -> dict:
+    """Builds call arguments from raw input values (text, combo data or already parsed JSON).
+
+    Batch runs pass log=False; their errors end up in the output instead of the log.
+    """
+    params = {}
+
+    for param_name, param in sig.parameters.items():
+        value = values.get(param_name)  # Eğer UI'de input yoksa None
+        annotation = param.annotation
+
+        # Pooled resources are passed in when the function is called
+        if is_resource_annotation(annotation):
+            continue
+
+        # Varsayılan değeri kontrol et; boş bırakılan parametre fonksiyonun kendi varsayılanını kullanır
+        if (value is None or (isinstance(value, str) and value.strip() == "")) and param.default is not param.empty:
+            continue
+
+        # Enum kontrolü
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            if value is None or (isinstance(value, str) and value.strip() == ""):
+                raise ParameterError(f"Empty input for parameter '{param_name}'")
+            params[param_name] = _enum_member(annotation, value, param_name)
+
+        # Iterable[T]: öğeler tek tek işlenir; "@dosya" verilirse dosyadan tembel okunur
+        elif is_lazy_annotation(annotation):
+            if value is None or (isinstance(value, str) and not value.strip()):
+                raise ParameterError(f"Empty input for parameter '{param_name}'")
+            params[param_name] = _lazy_parameter(annotation, value, param_name)
+
+        # Kompleks tipleri işle (class, dict, list vs.)
+        elif is_complex_annotation(annotation):
+            if log:
+                print(f"Converting parameter '{param_name}' to {annotation.__name__}", severity="DEBUG")
+            if value is None or (isinstance(value, str) and not value.strip()):
+                raise ParameterError(f"Empty input for parameter '{param_name}'")
+            try:
+                path = file_reference(value)
+                if path is not None:
+                    # Büyük dosyalar metin ve ara dict ağacı oluşturmadan doğrudan sınıfa okunur
+                    params[param_name] = load_file(path, annotation)
+                    continue
+                # JSON formatında parse edilmeli
+                if isinstance(value, str):
+                    value = json.loads(value)
+                params[param_name] = convert_to_class_instance(annotation, value)
+            except OSError as e:
+                raise ParameterError(f"Cannot read file for parameter '{param_name}': {e}") from e
+            except json.JSONDecodeError as e:
+                if log:
+                    print(f"JSONDecodeError: {e}", severity="ERROR")
+                raise ParameterError(f"Invalid JSON input for parameter '{param_name}'") from e
+            except Exception as e:
+                if log:
+                    print("".join(traceback.format_exception(None, e, e.__traceback__)), severity="ERROR")
+                raise ParameterError(f"Failed to convert parameter '{param_name}' to {annotation.__name__}") from e
+
+        # Temel veri tiplerini işle (int, float, str, bool)
         else:
-            kwargs[field] = field_value  # Diğer durumlarda doğrudan ata
-    
-    return cls(**kwargs)
+            if annotation in [int, float]:
+                try:
+                    value = annotation(value)
+                except (TypeError, ValueError):
+                    raise ParameterError(f"Invalid input type for parameter '{param_name}'")
+            elif annotation is bool and isinstance(value, str):
+                if value.strip().lower() not in BOOL_STRINGS:
+                    raise ParameterError(f"Invalid input type for parameter '{param_name}'")
+                value = BOOL_STRINGS[value.strip().lower()]
+            params[param_name] = value
+
+    return params
+
+
+def _enum_member(enum_type, value, param_name):
+    if isinstance(value, enum_type):
+        return value
+    try:
+        # Üye adı
+        return enum_type[value]
+    except (KeyError, TypeError):
+        pass
+    try:
+        # Combo box'lar üyenin değerini taşır
+        return enum_type(value)
+    except ValueError:
+        raise ParameterError(f"Invalid value for Enum parameter '{param_name}'")
+
 
 def convert_to_serializable(obj):
-    if isinstance(obj, (dict, list, tuple, set)):
-        return type(obj)(convert_to_serializable(item) for item in obj)
-    elif hasattr(obj, 'to_dict'):
-        return obj.to_dict()
-    else:
-        return obj
-    
+    # Tek geçişte JSON uyumlu kopya; sonucu kodlamak için iter_encode kopya oluşturmadan çalışır
+    return to_serializable(obj)
+
 
 def load_settings(key=None, default_value=None, path="settings.json", ):
-    if not os.path.exists(path):
-        default_settings = {
-            "functions_path": "examples",  # Default value
-            "css_path": "style.css",      # Default value
-            "log_folder": "logs"          # Default value
-        }
-        with open(path, "w") as file:
-            json.dump(default_settings, file, indent=4)
-        print("Settings file created with default values.")
-
-    # Load the settings from the file
-    with open(path, "r") as file:
-        settings = json.load(file)
+    # Served from the in-memory store, which re-reads the file only when it changes
+    store = get_settings_store(path)
 
     # Return the entire settings dictionary or a specific key if provided
-    return settings.get(key, default_value) if key else settings
+    return store.get(key, default_value) if key else store.all()
@@ -0,0 +1,186 @@
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+from utils import print
+from workers import receive, send, worker_main
+
+
+class WorkerError(Exception):
+    """A function raised inside a worker process."""
+
+    def __init__(self, message: str, remote_traceback: str = ""):
+        super().__init__(message)
+        self.remote_traceback = remote_traceback
+
+
+class WorkerCrashed(Exception):
+    """The worker process died while running a call."""
+
+
+class WorkerProcess:
+    def __init__(self, context, folder_path: str, module_names: List[str]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child_conn, folder_path, module_names),
+                                       name="FunctionWorker", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self):
+        # Import errors are reported once; the call itself then fails with the real error
+        if self.ready:
+            return
+        _, import_errors = receive(self.conn)
+        self.ready = True
+        for module_name, error in import_errors.items():
+            print(f"Worker {self.process.pid} could not import {module_name}: {error}", severity="WARNING")
+
+    def call(self, module_name: str, function_name: str, params: dict):
+        self.wait_ready()
+        send(self.conn, (module_name, function_name, params))
+        return receive(self.conn)
+
+    def stop(self):
+        # The worker leaves its loop on None, or on EOF once the pipe is closed
+        try:
+            send(self.conn, None)
+        except (OSError, ValueError):
+            pass
+        self.conn.close()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class WorkerCall:
+    __slots__ = ("future", "worker", "aborted")
+
+    def __init__(self):
+        self.future: Optional[Future] = None
+        self.worker: Optional[WorkerProcess] = None
+        self.aborted = False
+
+
+class WorkerPool:
+    """Warm worker processes for one functions folder; each imports the folder's modules once at startup."""
+
+    def __init__(self, folder_path: str, module_names: List[str], size: int):
+        # spawn: forking a process that runs Qt threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self.folder_path = folder_path
+        self.module_names = list(module_names)
+        self.size = size
+        self._idle: "queue.Queue[WorkerProcess]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        # Draining: the calls already submitted finish on these workers, then the workers exit
+        self._draining = False
+        # Calls submitted and not yet given a worker
+        self._waiting = 0
+        self._calls: List[WorkerCall] = []
+        for _ in range(size):
+            self._idle.put(self._spawn())
+        # One dispatcher thread per worker; each one waits on its worker's pipe
+        self._dispatcher = ThreadPoolExecutor(max_workers=size, thread_name_prefix="WorkerPool")
+        print(f"Started {size} worker processes for {folder_path}.", severity="DEBUG")
+
+    def _spawn(self) -> WorkerProcess:
+        return WorkerProcess(self._context, self.folder_path, self.module_names)
+
+    def submit(self, module_name: str, function_name: str, params: dict) -> WorkerCall:
+        call = WorkerCall()
+        with self._lock:
+            self._waiting += 1
+        call.future = self._dispatcher.submit(self._run, call, module_name, function_name, params)
+        return call
+
+    def abort(self, call: WorkerCall):
+        # Killing the worker is the only way to stop a running function; a fresh one takes its place
+        with self._lock:
+            call.aborted = True
+            worker = call.worker
+        if worker is not None:
+            # The dispatcher thread sees the pipe close and cleans up
+            worker.process.kill()
+
+    def _run(self, call: WorkerCall, module_name: str, function_name: str, params: dict):
+        worker = self._idle.get()
+        with self._lock:
+            self._waiting -= 1
+            if call.aborted or self._closed:
+                self._release(worker)
+                raise WorkerCrashed("Call aborted before it started")
+            call.worker = worker
+            self._calls.append(call)
+
+        try:
+            reply = worker.call(module_name, function_name, params)
+        except (EOFError, OSError) as e:
+            worker.kill()
+            worker.process.join(1)
+            self._replace()
+            if call.aborted:
+                raise WorkerCrashed("Call aborted")
+            print(f"Worker process {worker.process.pid} exited with code {worker.process.exitcode} while running "
+                  f"{module_name}.{function_name}.", severity="ERROR")
+            raise WorkerCrashed(f"Worker process exited with code {worker.process.exitcode}") from e
+        except Exception:
+            # Arguments or result that cannot be pickled; the pipe itself is still in step
+            with self._lock:
+                self._release(worker)
+            raise
+        finally:
+            with self._lock:
+                self._calls.remove(call)
+                call.worker = None
+
+        with self._lock:
+            self._release(worker)
+        if reply[0] == "error":
+            print(reply[2], severity="ERROR")
+            raise WorkerError(reply[1], reply[2])
+        return reply[1]
+
+    def _release(self, worker: WorkerProcess):
+        # Called with the lock held; a draining pool keeps only the workers calls are still waiting for
+        self._idle.put(worker)
+        if self._draining and self._waiting == 0:
+            self._stop_idle()
+
+    def _stop_idle(self):
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                return
+
+    def _replace(self):
+        with self._lock:
+            if self._closed or (self._draining and self._waiting == 0):
+                return
+        self._idle.put(self._spawn())
+
+    def drain(self):
+        """Retires the pool without killing anything: running and queued calls finish, then each worker exits."""
+        with self._lock:
+            self._draining = True
+            busy = len(self._calls) + self._waiting
+            if self._waiting == 0:
+                self._stop_idle()
+        self._dispatcher.shutdown(wait=False)
+        print(f"Retiring the worker processes for {self.folder_path}; {busy} call(s) still finishing.",
+              severity="DEBUG")
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            busy = [call.worker for call in self._calls]
+        self._dispatcher.shutdown(wait=False, cancel_futures=True)
+        for worker in busy:
+            worker.kill()
+        self._stop_idle()
@@ -0,0 +1,68 @@
+import importlib
+import pickle
+import sys
+import traceback
+
+from resources import call_with_resources, setup_module, teardown_all
+
+
+# Runs inside worker processes; this module must not import PyQt6
+
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def send(conn, message):
+    conn.send_bytes(pickle.dumps(message, protocol=PROTOCOL))
+
+
+def receive(conn):
+    return pickle.loads(conn.recv_bytes())
+
+
+def _report_teardown_error(module_name: str, error: BaseException):
+    sys.stderr.write(f"Error in teardown of module {module_name}: {error}\n")
+
+
+def worker_main(conn, folder_path: str, module_names: list):
+    # Parameters and results may be instances of classes from the functions folder
+    if folder_path not in sys.path:
+        sys.path.append(folder_path)
+
+    # Modules are imported once, before the first call arrives
+    import_errors = {}
+    for module_name in module_names:
+        try:
+            setup_module(importlib.import_module(module_name))
+        except Exception as e:
+            import_errors[module_name] = f"{type(e).__name__}: {e}"
+    try:
+        send(conn, ("ready", import_errors))
+    except OSError:
+        # Stopped while still importing; the modules set up above are torn down as on a normal stop
+        teardown_all(_report_teardown_error)
+        return
+
+    while True:
+        try:
+            message = receive(conn)
+        except (EOFError, OSError):
+            message = None
+        if message is None:
+            # Stopped or orphaned: the modules' teardown() runs here; a killed worker gets none
+            teardown_all(_report_teardown_error)
+            return
+
+        module_name, function_name, params = message
+        try:
+            module = importlib.import_module(module_name)
+            # No-op once set up; a module whose setup() failed at start tries again and reports why
+            setup_module(module)
+            result = call_with_resources(getattr(module, function_name), params)
+        except Exception as e:
+            send(conn, ("error", f"{type(e).__name__}: {e}", traceback.format_exc()))
+            continue
+
+        try:
+            send(conn, ("ok", result))
+        except Exception as e:
+            send(conn, ("error", f"Result could not be sent back: {e}", traceback.format_exc()))